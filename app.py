@@ -464,12 +464,15 @@ class FaceRecognitionApp:
                 
                 # Process every Nth frame
                 if frame_count % config.PROCESS_EVERY_N_FRAMES == 0:
+                    # Convert once; detection and recognition share the grayscale frame
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    
                     # Detect faces
-                    face_locations = self.detector.detect_faces(frame)
+                    face_locations = self.detector.detect_faces_gray(gray)
                     
                     if len(face_locations) > 0:
                         # Recognize faces
-                        face_names = self.recognizer.recognize_faces(frame, face_locations)
+                        face_names = self.recognizer.recognize_faces_gray(gray, face_locations)
                         
                         # Process each recognized face
                         for (x, y, w, h), name in zip(face_locations, face_names):
@@ -538,6 +541,7 @@ class FaceRecognitionApp:
         """Handle window closing"""
         if self.running:
             self.stop_system()
+        self.tracker.close()
         self.root.destroy()
 
 
@@ -3,23 +3,93 @@ Attendance/Check-in/Check-out Tracker
 Manages attendance records and access control
 """
 
+import atexit
 import csv
 import os
 import threading
+import queue
+import sqlite3
 import calendar
 import uuid
 import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, time
+from functools import lru_cache
 from typing import Optional, List, Dict
 from zipfile import BadZipFile
 import config
 try:
     from openpyxl import Workbook, load_workbook
-    from openpyxl.styles import Font, PatternFill, Alignment
+    from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
     EXCEL_AVAILABLE = True
 except ImportError:
     EXCEL_AVAILABLE = False
     print("[WARNING] openpyxl not installed. Run: pip install openpyxl")
+# Optional columnar mirror of the daily table for fast viewing
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Columns of a daily attendance row (matches the user sheet columns C-H)
+DAY_FIELDS = ('first_in', 'last_out', 'total', 'status', 'late', 'ot')
+
+# Working-hours cutoffs
+LATE_CUTOFF = time(8, 30, 0)  # Check-ins after this are marked LATE
+OT_CUTOFF = time(17, 0, 0)    # Time after this counts as overtime
+
+
+@lru_cache(maxsize=1024)
+def _parse_duration(time_str: str) -> int:
+    """
+    Parse a duration like '1h 30m' or '30m' to minutes
+    
+    Cached because a month of sheets repeats the same few strings ('0m', '8h 0m', ...)
+    
+    Args:
+        time_str: Duration text from a sheet cell
+        
+    Returns:
+        Total minutes (0 if the text cannot be parsed)
+    """
+    try:
+        time_str = time_str.strip()
+        total_minutes = 0
+        
+        if 'h' in time_str:
+            parts = time_str.split('h')
+            hours = int(parts[0].strip())
+            total_minutes += hours * 60
+            
+            if 'm' in parts[1]:
+                minutes = int(parts[1].replace('m', '').strip())
+                total_minutes += minutes
+        elif 'm' in time_str:
+            minutes = int(time_str.replace('m', '').strip())
+            total_minutes += minutes
+        
+        return total_minutes
+    except:
+        return 0
+
+
+@lru_cache(maxsize=1024)
+def _clock_seconds(time_str: str) -> Optional[int]:
+    """
+    Seconds since midnight for an 'HH:MM:SS' cell, or None if it is not a clock time
+    
+    Args:
+        time_str: Time text as written by the tracker
+        
+    Returns:
+        Seconds since midnight
+    """
+    try:
+        h, m, sec = time_str.split(':')
+        return int(h) * 3600 + int(m) * 60 + int(sec)
+    except (AttributeError, ValueError):
+        return None
 
 
 class AttendanceTracker:
@@ -28,15 +98,29 @@ class AttendanceTracker:
     def __init__(self):
         """Initialize the attendance tracker"""
         self.attendance_file = config.ATTENDANCE_FILE
+        self.db_file = config.ATTENDANCE_DB
+        self.parquet_file = config.ATTENDANCE_PARQUET
         self.status_log_file = os.path.join(config.DATA_DIR, 'status_log.csv')
+        self.debug_log_file = os.path.join(os.path.dirname(self.attendance_file), 'debug_log.csv')
         self.user_ids_file = os.path.join(config.DATA_DIR, 'user_ids.csv')
         self.last_checkin = {}  # Track last check-in time per person
         self.user_ids = {}  # Map user names to IDs
         self._excel_lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        
+        # Skip re-reading unchanged data (see get_user_status / create_monthly_report)
+        self._daily_version = 0
+        self._status_cache_key = None
+        self._status_cache_rows = []
+        self._report_stat = None
         
         # Load user IDs
         self._load_user_ids()
         
+        # Open the attendance database (store of record)
+        new_db = not os.path.exists(self.db_file)
+        self._open_database()
+        
         # Create (or recover) attendance file
         if not os.path.exists(self.attendance_file):
             self._create_attendance_file()
@@ -48,6 +132,10 @@ class AttendanceTracker:
                     with self._excel_lock:
                         wb = load_workbook(self.attendance_file)
                         wb.close()
+                    
+                    # First run with the database: import existing history
+                    if new_db:
+                        self._import_excel_history()
                 except BadZipFile:
                     ts = datetime.now().strftime('%Y%m%d_%H%M%S')
                     corrupt_path = self.attendance_file.replace('.xlsx', f'_corrupt_{ts}.xlsx')
@@ -65,8 +153,162 @@ class AttendanceTracker:
         # Load last check-ins from today
         self._load_today_checkins()
         
+        # Excel is written in the background, off the check-in path
+        self._excel_queue = queue.Queue()
+        self._excel_stop = threading.Event()
+        self._report_due = None
+        self._excel_thread = threading.Thread(target=self._excel_worker, daemon=True)
+        self._excel_thread.start()
+        
+        # Flush queued rows, the Parquet mirror and a pending monthly report even when
+        # the program exits without calling close()
+        self._closed = False
+        atexit.register(self.close)
+        
         print("[INFO] Attendance tracker initialized")
     
+    def _open_database(self):
+        """Open the SQLite attendance database and create tables if needed"""
+        self._db = sqlite3.connect(self.db_file, isolation_level=None, check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        # With WAL, NORMAL only syncs at checkpoints; a power cut loses at most the last events
+        self._db.execute('PRAGMA synchronous=NORMAL')
+        # Wait for another connection (e.g. an export script) instead of failing with "database is locked"
+        self._db.execute('PRAGMA busy_timeout=5000')
+        self._db.execute('PRAGMA temp_store=MEMORY')
+        self._db.execute('PRAGMA cache_size=-20000')  # 20 MB page cache
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS events ('
+            'name TEXT NOT NULL, ts TEXT NOT NULL, event TEXT NOT NULL, conf REAL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS idx_events_name_ts ON events (name, ts)')
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS daily ('
+            'date TEXT NOT NULL, name TEXT NOT NULL, first_in TEXT, last_out TEXT, '
+            'total TEXT, status TEXT, late TEXT, ot TEXT, PRIMARY KEY (date, name))'
+        )
+    
+    def _import_excel_history(self):
+        """Import daily rows from the per-user Excel sheets into the database"""
+        try:
+            with self._excel_lock:
+                wb = load_workbook(self.attendance_file)
+                
+                rows = []
+                for sheet_name in wb.sheetnames:
+                    if '_' not in sheet_name or sheet_name == 'Template':
+                        continue
+                    
+                    name = sheet_name.split('_')[0]
+                    # max_col pads every row to 8 values
+                    for row in wb[sheet_name].iter_rows(min_row=3, max_col=8, values_only=True):
+                        if not row[0] or not row[2]:
+                            continue
+                        date_str = row[0] if isinstance(row[0], str) else row[0].strftime('%Y-%m-%d')
+                        rows.append((date_str, name) + tuple(v or None for v in row[2:8]))
+                
+                wb.close()
+            
+            with self._db_lock:
+                self._db.execute('BEGIN')
+                self._db.executemany('INSERT OR IGNORE INTO daily VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+                self._db.execute('COMMIT')
+            
+            print(f"[INFO] Imported {len(rows)} attendance days from Excel")
+        except Exception as e:
+            print(f"[WARNING] Failed to import Excel history: {e}")
+    
+    def _excel_worker(self):
+        """Background worker that mirrors attendance into Excel and rebuilds the monthly report"""
+        # First run with pyarrow: mirror the existing history before any new events
+        if PARQUET_AVAILABLE and not os.path.exists(self.parquet_file):
+            try:
+                self._write_parquet_mirror()
+            except Exception as e:
+                print(f"[WARNING] Failed to write Parquet mirror: {e}")
+        
+        while not self._excel_stop.is_set():
+            timeout = 1.0
+            if self._report_due is not None:
+                timeout = max(0.0, min(timeout, (self._report_due - datetime.now()).total_seconds()))
+            
+            try:
+                items = [self._excel_queue.get(timeout=timeout)]
+            except queue.Empty:
+                items = []
+            
+            # Coalesce everything already queued into one workbook save
+            while items:
+                try:
+                    items.append(self._excel_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if items:
+                self._handle_excel_items(items)
+            
+            # Debounce: rebuild the monthly report once check-ins settle
+            if self._report_due is not None and datetime.now() >= self._report_due:
+                self._report_due = None
+                self.create_monthly_report()
+    
+    def _handle_excel_items(self, items):
+        """Apply a batch of queued Excel updates"""
+        try:
+            days = [item[1:] for item in items if item[0] == 'day']
+            if days:
+                self._write_days_to_excel(days)
+                self._write_parquet_mirror()
+            if self._report_due is None and any(item[0] == 'monthly' for item in items):
+                self._report_due = datetime.now() + timedelta(seconds=config.MONTHLY_REPORT_DEBOUNCE)
+        except Exception as e:
+            print(f"[ERROR] Failed to update Excel: {e}")
+        finally:
+            for _ in items:
+                self._excel_queue.task_done()
+    
+    def _schedule_monthly_report(self):
+        """Queue a monthly report rebuild on the background worker"""
+        self._excel_queue.put(('monthly', datetime.now()))
+    
+    def export_to_xlsx(self):
+        """Bring attendance.xlsx up to date with the database (blocks until written)"""
+        self._excel_queue.join()
+        self._report_due = None
+        self.create_monthly_report()
+    
+    def export_to_parquet(self):
+        """Bring attendance.parquet up to date with the database (blocks until written)"""
+        self._excel_queue.join()
+        self._write_parquet_mirror()
+    
+    def close(self):
+        """Stop the background Excel worker, flushing any pending updates (safe to call twice)"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._excel_stop.set()
+        # No timeout: the worker stops after its current batch (at most one workbook save),
+        # and the flush below must not run alongside it
+        self._excel_thread.join()
+        
+        items = []
+        while True:
+            try:
+                items.append(self._excel_queue.get_nowait())
+            except queue.Empty:
+                break
+        if items:
+            self._handle_excel_items(items)
+        
+        if self._report_due is not None:
+            self._report_due = None
+            self.create_monthly_report()
+        
+        with self._db_lock:
+            self._db.close()
+    
     def _load_user_ids(self):
         """Load user IDs from file or create new file"""
         try:
@@ -109,6 +351,24 @@ class AttendanceTracker:
         
         return self.user_ids[name]
     
+    def _get_or_create_user_ids(self, names) -> Dict[str, str]:
+        """Resolve IDs for many users, saving any new ones in a single append"""
+        new_ids = []
+        for name in names:
+            if name not in self.user_ids:
+                user_id = self._generate_user_id(name)
+                self.user_ids[name] = user_id
+                new_ids.append([name, user_id])
+        
+        if new_ids:
+            try:
+                with open(self.user_ids_file, 'a', newline='') as f:
+                    csv.writer(f).writerows(new_ids)
+            except Exception as e:
+                print(f"[ERROR] Failed to save user IDs: {e}")
+        
+        return {name: self.user_ids[name] for name in names}
+    
     def _create_status_log_file(self):
         """Create a new status log CSV file with headers"""
         try:
@@ -161,6 +421,7 @@ class AttendanceTracker:
                 
                 # Get all users from user_ids
                 users = sorted(self.user_ids.items(), key=lambda x: x[0])
+                today = datetime.now().strftime('%Y-%m-%d')
                 
                 # Add user data
                 for idx, (name, user_id) in enumerate(users, 1):
@@ -175,16 +436,17 @@ class AttendanceTracker:
                             user_sheet = wb[sheet_name]
                             
                             # Count days with attendance (has First In value)
-                            for row in user_sheet.iter_rows(min_row=3, values_only=True):
-                                if len(row) > 2 and row[2]:  # Has First In time
+                            for date_val, _, first_in in user_sheet.iter_rows(min_row=3, max_col=3,
+                                                                              values_only=True):
+                                if first_in:  # Has First In time
                                     total_days += 1
                                     # Get earliest date as enrollment date
-                                    if enrolled_date == "N/A" and row[0]:
-                                        enrolled_date = row[0] if isinstance(row[0], str) else row[0].strftime('%Y-%m-%d')
+                                    if enrolled_date == "N/A" and date_val:
+                                        enrolled_date = date_val if isinstance(date_val, str) else date_val.strftime('%Y-%m-%d')
                     
                     # If no attendance, use today as enrolled date
                     if enrolled_date == "N/A":
-                        enrolled_date = datetime.now().strftime('%Y-%m-%d')
+                        enrolled_date = today
                     
                     row_data = [idx, name, user_id, enrolled_date, total_days]
                     ws.append(row_data)
@@ -370,32 +632,15 @@ class AttendanceTracker:
         today = datetime.now().strftime('%Y-%m-%d')
         
         try:
-            if not os.path.exists(self.attendance_file):
-                return
-            
-            if not EXCEL_AVAILABLE:
-                return
+            with self._db_lock:
+                rows = self._db.execute(
+                    "SELECT name, MAX(ts) FROM events "
+                    "WHERE ts >= ? AND event IN ('CHECK_IN', 'ACCESS_GRANTED') GROUP BY name",
+                    (today,)
+                ).fetchall()
             
-            with self._excel_lock:
-                wb = load_workbook(self.attendance_file)
-                ws = wb.active
-            
-                for row in ws.iter_rows(min_row=2, values_only=True):
-                    if len(row) < 3:
-                        continue
-                    name = row[0]
-                    day = row[1]
-                    time_in = row[2]
-                    
-                    if day == today and name and time_in:
-                        try:
-                            timestamp = datetime.strptime(f"{today} {time_in}", '%Y-%m-%d %H:%M:%S')
-                            if name not in self.last_checkin or timestamp > self.last_checkin[name]:
-                                self.last_checkin[name] = timestamp
-                        except:
-                            pass
-
-                wb.close()
+            for name, ts in rows:
+                self.last_checkin[name] = datetime.strptime(ts, '%Y-%m-%d %H:%M:%S')
         except Exception as e:
             print(f"[WARNING] Failed to load today's check-ins: {e}")
     
@@ -438,7 +683,8 @@ class AttendanceTracker:
     
     def record_event(self, name: str, event: str, confidence: float = 1.0) -> bool:
         """
-        Record an attendance event to Excel - Monthly format with one sheet per user
+        Record an attendance event - stored in the database, mirrored to the
+        monthly Excel sheet (one sheet per user) in the background
         
         Args:
             name: Person's name
@@ -448,177 +694,244 @@ class AttendanceTracker:
         Returns:
             True if successful, False otherwise
         """
-        try:
-            if not EXCEL_AVAILABLE:
-                print("[ERROR] openpyxl not installed")
-                return False
+        return self.record_events_batch([(name, event, confidence)])[0]
+    
+    def record_events_batch(self, events) -> List[bool]:
+        """
+        Record several attendance events (e.g. every face in one frame) in a
+        single database transaction, so the batch costs one commit
+        
+        Args:
+            events: List of (name, event, confidence) tuples, see record_event
             
+        Returns:
+            List with True/False per event, in the same order
+        """
+        if not events:
+            return []
+        
+        try:
             now = datetime.now()
             date_str = now.strftime('%Y-%m-%d')
             time_str = now.strftime('%H:%M:%S')
+            results = []
+            recorded = []
             
-            with self._excel_lock:
-                wb = load_workbook(self.attendance_file)
+            with self._db_lock:
+                self._db.execute('BEGIN')
+                try:
+                    for name, event, confidence in events:
+                        day = self._apply_event(name, event, confidence, now)
+                        results.append(day is not None)
+                        if day is not None:
+                            recorded.append((name, event, day))
+                    self._db.execute('COMMIT')
+                except Exception:
+                    self._db.execute('ROLLBACK')
+                    raise
+                self._daily_version += 1
+            
+            for name, event, day in recorded:
+                # Mirror the day row into the user's Excel sheet
+                if event in ('CHECK_IN', 'CHECK_OUT'):
+                    self._excel_queue.put(('day', name, now, day))
                 
-                # Get or create user's monthly sheet
-                ws = self._get_or_create_user_sheet(wb, name, now)
+                # Update last check-in time
+                if event in ['CHECK_IN', 'ACCESS_GRANTED']:
+                    self.last_checkin[name] = now
                 
-                # Find row for today (skip header rows 1 and 2)
-                user_row = None
-                for idx, row in enumerate(ws.iter_rows(min_row=3, values_only=False), start=3):
-                    if row[0].value == date_str:
-                        user_row = idx
-                        break
+                print(f"[INFO] Recorded: {name} - {event} at {time_str}")
+            return results
+            
+        except Exception as e:
+            print(f"[ERROR] Failed to record event: {e}")
+            import traceback
+            traceback.print_exc()
+            return [False] * len(events)
+    
+    def _apply_event(self, name: str, event: str, confidence: float, now: datetime) -> Optional[Dict]:
+        """
+        Write one event (and its updated day row) inside the caller's open transaction
+        
+        Must be called with _db_lock held.
+        
+        Returns:
+            The updated day row, or None if the event was refused
+        """
+        date_str = now.strftime('%Y-%m-%d')
+        time_str = now.strftime('%H:%M:%S')
+        
+        row = self._db.execute(
+            'SELECT first_in, last_out, total, status, late, ot FROM daily WHERE date = ? AND name = ?',
+            (date_str, name)
+        ).fetchone()
+        day = dict(zip(DAY_FIELDS, row)) if row else dict.fromkeys(DAY_FIELDS)
+        
+        if event == 'CHECK_IN':
+            # Update First In (only if empty - preserve first check-in)
+            if not day['first_in']:
+                day['first_in'] = time_str
                 
-                if not user_row:
-                    print(f"[ERROR] Date {date_str} not found in {name}'s sheet")
-                    wb.close()
-                    return False
+                # Determine punctuality
+                if now.time() > LATE_CUTOFF:
+                    day['status'] = 'LATE'
+                    
+                    # Calculate late time
+                    late_duration = now - datetime.combine(now.date(), LATE_CUTOFF)
+                    day['late'] = self._format_time_from_minutes(int(late_duration.total_seconds() // 60))
+                else:
+                    day['status'] = 'ON TIME'
+                    day['late'] = '0m'
+            else:
+                # Already has check-in, toggle by clearing checkout if exists
+                day['last_out'] = None  # Clear Last Out
+                day['total'] = None     # Clear Total
+                day['ot'] = None        # Clear OT
+        
+        elif event == 'CHECK_OUT':
+            # Check if has check-in
+            if not day['first_in']:
+                print(f"[DEBUG] Refusing CHECK OUT - no check-in time for {date_str}")
+                return None
+            
+            # Always update Last Out (keep last checkout)
+            day['last_out'] = time_str
+            
+            # Calculate total time
+            try:
+                in_dt = datetime.strptime(day['first_in'], "%H:%M:%S")
+                out_dt = datetime.strptime(time_str, "%H:%M:%S")
+                duration = out_dt - in_dt
+                hours = duration.seconds // 3600
+                minutes = (duration.seconds % 3600) // 60
+                day['total'] = f"{hours}h {minutes}m"
                 
-                if event == 'CHECK_IN':
-                    # Update First In (only if empty - preserve first check-in)
-                    if not ws.cell(user_row, 3).value:
-                        ws.cell(user_row, 3, time_str)
-                        
-                        # Determine punctuality
-                        cutoff_time = datetime.strptime("08:30:00", "%H:%M:%S").time()
-                        if now.time() > cutoff_time:
-                            ws.cell(user_row, 6, 'LATE')
-                            ws.cell(user_row, 6).font = Font(bold=True, color="FF0000")
-                            
-                            # Calculate late time
-                            cutoff_dt = datetime.strptime("08:30:00", "%H:%M:%S")
-                            late_duration = now - cutoff_dt.replace(year=now.year, month=now.month, day=now.day)
-                            late_minutes = int(late_duration.total_seconds() // 60)
-                            late_hours = late_minutes // 60
-                            late_mins = late_minutes % 60
-                            if late_hours > 0:
-                                time_late = f"{late_hours}h {late_mins}m"
-                            else:
-                                time_late = f"{late_mins}m"
-                            ws.cell(user_row, 7, time_late)
-                            ws.cell(user_row, 7).font = Font(bold=True, color="FF0000")
-                        else:
-                            ws.cell(user_row, 6, 'ON TIME')
-                            ws.cell(user_row, 6).font = Font(bold=True, color="00B050")
-                            ws.cell(user_row, 7, '0m')
-                    else:
-                        # Already has check-in, toggle by clearing checkout if exists
-                        if ws.cell(user_row, 4).value:
-                            ws.cell(user_row, 4).value = None  # Clear Last Out
-                            ws.cell(user_row, 5).value = None  # Clear Total
-                            ws.cell(user_row, 8).value = None  # Clear OT
+                # Calculate overtime (after 5PM = 17:00)
+                if now.time() > OT_CUTOFF:
+                    ot_duration = now - datetime.combine(now.date(), OT_CUTOFF)
+                    day['ot'] = self._format_time_from_minutes(int(ot_duration.total_seconds() // 60))
+                else:
+                    day['ot'] = '0m'
+            except Exception as calc_err:
+                print(f"[WARN] Failed to calculate time: {calc_err}")
+        
+        self._db.execute(
+            'INSERT INTO events (name, ts, event, conf) VALUES (?, ?, ?, ?)',
+            (name, f"{date_str} {time_str}", event, confidence)
+        )
+        if event in ('CHECK_IN', 'CHECK_OUT'):
+            self._db.execute(
+                'INSERT OR REPLACE INTO daily VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                (date_str, name) + tuple(day[field] for field in DAY_FIELDS)
+            )
+        return day
+    
+    def _write_days_to_excel(self, days):
+        """Write (name, date, day) rows and their monthly summaries with a single save"""
+        if not EXCEL_AVAILABLE:
+            return
+        
+        with self._excel_lock:
+            wb = load_workbook(self.attendance_file)
+            try:
+                touched = {}
+                for name, current_date, day in days:
+                    self._write_day_to_sheet(wb, name, current_date, day)
+                    touched[(name, current_date.strftime('%B_%Y'))] = (name, current_date)
                 
-                elif event == 'CHECK_OUT':
-                    # Check if has check-in
-                    if not ws.cell(user_row, 3).value:
-                        print(f"[DEBUG] Refusing CHECK OUT - no check-in time for {date_str}")
-                        wb.close()
-                        return False
-                    
-                    # Always update Last Out (keep last checkout)
-                    ws.cell(user_row, 4, time_str)
-                    
-                    # Calculate total time
-                    time_in = ws.cell(user_row, 3).value
-                    if time_in:
-                        try:
-                            in_dt = datetime.strptime(time_in, "%H:%M:%S")
-                            out_dt = datetime.strptime(time_str, "%H:%M:%S")
-                            duration = out_dt - in_dt
-                            hours = duration.seconds // 3600
-                            minutes = (duration.seconds % 3600) // 60
-                            total_str = f"{hours}h {minutes}m"
-                            ws.cell(user_row, 5, total_str)  # Total Hours
-                            
-                            # Calculate overtime (after 5PM = 17:00)
-                            ot_cutoff = datetime.strptime("17:00:00", "%H:%M:%S").time()
-                            if now.time() > ot_cutoff:
-                                ot_start = datetime.strptime("17:00:00", "%H:%M:%S")
-                                ot_start = ot_start.replace(year=now.year, month=now.month, day=now.day)
-                                ot_duration = now - ot_start
-                                ot_minutes = int(ot_duration.total_seconds() // 60)
-                                ot_hours = ot_minutes // 60
-                                ot_mins = ot_minutes % 60
-                                if ot_hours > 0:
-                                    ot_str = f"{ot_hours}h {ot_mins}m"
-                                else:
-                                    ot_str = f"{ot_mins}m"
-                                ws.cell(user_row, 8, ot_str)
-                                ws.cell(user_row, 8).font = Font(bold=True, color="FFA500")
-                            else:
-                                ws.cell(user_row, 8, '0m')
-                        except Exception as calc_err:
-                            print(f"[WARN] Failed to calculate time: {calc_err}")
+                # One summary refresh per touched sheet is enough
+                for name, current_date in touched.values():
+                    self._update_summary_in_workbook(wb, name, current_date)
                 
                 wb.save(self.attendance_file)
+            finally:
                 wb.close()
-            
-            # Update monthly summary
-            self.update_monthly_summary(name, now)
-            
-            # Update last check-in time
-            if event in ['CHECK_IN', 'ACCESS_GRANTED']:
-                self.last_checkin[name] = now
-            
-            print(f"[INFO] Recorded: {name} - {event} at {time_str}")
-            return True
-            
-        except Exception as e:
-            print(f"[ERROR] Failed to record event: {e}")
-            import traceback
-            traceback.print_exc()
-            return False
+    
+    def _write_parquet_mirror(self):
+        """Rewrite attendance.parquet from the daily table (one row per user and day)"""
+        if not PARQUET_AVAILABLE:
+            return
+        
+        with self._db_lock:
+            rows = self._db.execute(
+                'SELECT date, name, ' + ', '.join(DAY_FIELDS) + ' FROM daily ORDER BY name, date'
+            ).fetchall()
+        
+        columns = {'date': [], 'day': [], 'user': []}
+        columns.update((field, []) for field in DAY_FIELDS)
+        for date_str, name, *values in rows:
+            columns['date'].append(date_str)
+            columns['day'].append(datetime.strptime(date_str, '%Y-%m-%d').strftime('%a'))
+            columns['user'].append(name)
+            for field, value in zip(DAY_FIELDS, values):
+                columns[field].append(value)
+        
+        # Write to a temp file and swap it in so the viewer never sees a partial file. The temp
+        # name is per process and thread: other programs' trackers may be mirroring at the same time
+        tmp_path = f"{self.parquet_file}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            pq.write_table(pa.table(columns), tmp_path, compression='zstd',
+                           use_dictionary=['user', 'day', 'status'])
+            os.replace(tmp_path, self.parquet_file)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+    
+    def _write_day_to_sheet(self, wb, name: str, current_date: datetime, day: Dict):
+        """Write one day's attendance row into the user's monthly sheet (no save)"""
+        date_str = current_date.strftime('%Y-%m-%d')
+        
+        # Get or create user's monthly sheet
+        ws = self._get_or_create_user_sheet(wb, name, current_date)
+        
+        # Find row for today (skip header rows 1 and 2)
+        user_row = None
+        for idx, row in enumerate(ws.iter_rows(min_row=3, max_col=1, values_only=True), start=3):
+            if row[0] == date_str:
+                user_row = idx
+                break
+        
+        if not user_row:
+            print(f"[ERROR] Date {date_str} not found in {name}'s sheet")
+            return
+        
+        for col, field in enumerate(DAY_FIELDS, start=3):
+            ws.cell(user_row, col).value = day[field]
+        
+        if day['status'] == 'LATE':
+            ws.cell(user_row, 6).font = Font(bold=True, color="FF0000")
+            ws.cell(user_row, 7).font = Font(bold=True, color="FF0000")
+        elif day['status'] == 'ON TIME':
+            ws.cell(user_row, 6).font = Font(bold=True, color="00B050")
+        if day['ot'] and day['ot'] != '0m':
+            ws.cell(user_row, 8).font = Font(bold=True, color="FFA500")
     
     def get_today_attendance(self) -> List[Dict[str, str]]:
         """
-        Get all attendance records for today (multi-sheet format)
+        Get all attendance records for today
         
         Returns:
             List of attendance records
         """
-        today = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        day_name = now.strftime('%a')
         records = []
         
         try:
-            if not EXCEL_AVAILABLE or not os.path.exists(self.attendance_file):
-                return records
-            
-            with self._excel_lock:
-                wb = load_workbook(self.attendance_file)
-                
-                # Iterate through all sheets (except Template)
-                for sheet_name in wb.sheetnames:
-                    if sheet_name == 'Template':
-                        continue
-                    
-                    ws = wb[sheet_name]
-                    
-                    # Extract user name from sheet name
-                    name = sheet_name.split('_')[0] if '_' in sheet_name else sheet_name
-                    
-                    # Find today's row (skip header rows 1 and 2)
-                    for row in ws.iter_rows(min_row=3, values_only=True):
-                        if len(row) < 6:
-                            continue
-                        
-                        date_str = row[0]
-                        
-                        if date_str == today:
-                            records.append({
-                                'Name': name,
-                                'Date': date_str,
-                                'Day': row[1],
-                                'Time In': row[2] if row[2] else '',
-                                'Time Out': row[3] if row[3] else '',
-                                'Total': row[4] if row[4] else '',
-                                'Status': row[5] if row[5] else '',
-                                'Time Late': row[6] if len(row) > 6 and row[6] else '0m',
-                                'Time OT': row[7] if len(row) > 7 and row[7] else '0m'
-                            })
-                            break
-                
-                wb.close()
+            for name, time_in, time_out, total, status, late, ot in self._today_rows(today):
+                records.append({
+                    'Name': name,
+                    'Date': today,
+                    'Day': day_name,
+                    'Time In': time_in or '',
+                    'Time Out': time_out or '',
+                    'Total': total or '',
+                    'Status': status or '',
+                    'Time Late': late or '0m',
+                    'Time OT': ot or '0m'
+                })
         
         except Exception as e:
             print(f"[ERROR] Failed to read attendance: {e}")
@@ -698,73 +1011,65 @@ class AttendanceTracker:
         except Exception as e:
             print(f"[ERROR] Failed to export report: {e}")
     
+    def _today_rows(self, today: str) -> List[tuple]:
+        """
+        Today's daily rows (name, first_in, last_out, total, status, late, ot), sorted by name
+        
+        Re-queried only after a commit, so repeated status/report calls share one read
+        """
+        with self._db_lock:
+            # data_version changes when another process commits; our own
+            # commits bump _daily_version instead
+            data_version = self._db.execute('PRAGMA data_version').fetchone()[0]
+            cache_key = (today, self._daily_version, data_version)
+            if cache_key != self._status_cache_key:
+                self._status_cache_rows = self._db.execute(
+                    'SELECT name, first_in, last_out, total, status, late, ot FROM daily '
+                    'WHERE date = ? ORDER BY name',
+                    (today,)
+                ).fetchall()
+                self._status_cache_key = cache_key
+            return self._status_cache_rows
+    
     def get_user_status(self) -> Dict[str, Dict]:
         """
-        Get status of all users with their last check-in/out from Excel (multi-sheet format)
+        Get status of all users with their check-in/out for today
         
         Returns:
-            Dictionary with user status information
+            Dictionary with user status information (*_epoch fields are Unix
+            seconds, or None when the time is not set)
         """
-        today = datetime.now().strftime('%Y-%m-%d')
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        now_t = now.time()
+        midnight = int(datetime.combine(now.date(), time()).timestamp())
         user_status = {}
         
+        def epoch(time_str):
+            secs = _clock_seconds(time_str) if time_str else None
+            return None if secs is None else midnight + secs
+        
         try:
-            if not EXCEL_AVAILABLE or not os.path.exists(self.attendance_file):
-                return user_status
-            
-            with self._excel_lock:
-                wb = load_workbook(self.attendance_file)
+            for name, time_in, time_out, total, _, _, time_ot in self._today_rows(today):
+                # Check if currently in OT (after 5PM and still checked in)
+                is_ot = bool(time_in and not time_out and now_t > OT_CUTOFF)
+                in_epoch = epoch(time_in)
                 
-                # Iterate through all sheets (except Template)
-                for sheet_name in wb.sheetnames:
-                    if sheet_name == 'Template':
-                        continue
-                    
-                    ws = wb[sheet_name]
-                    
-                    # Extract user name from sheet name (format: "Name_Month_Year")
-                    name = sheet_name.split('_')[0] if '_' in sheet_name else sheet_name
-                    
-                    # Find today's row (skip header rows 1 and 2)
-                    for row in ws.iter_rows(min_row=3, values_only=True):
-                        if len(row) < 6:
-                            continue
-                        
-                        date_str = row[0]  # Date
-                        day_name = row[1]  # Day
-                        time_in = row[2]   # First In
-                        time_out = row[3]  # Last Out
-                        total = row[4]     # Total Hours
-                        status_text = row[5]  # Status
-                        time_late = row[6] if len(row) > 6 else '0m'
-                        time_ot = row[7] if len(row) > 7 else '0m'
-                        
-                        if date_str == today and name:
-                            # Check if currently in OT (after 5PM and still checked in)
-                            is_ot = False
-                            if time_in and not time_out:
-                                current_time = datetime.now().time()
-                                ot_cutoff = datetime.strptime("17:00:00", "%H:%M:%S").time()
-                                if current_time > ot_cutoff:
-                                    is_ot = True
-                            
-                            user_status[name] = {
-                                'last_event': 'CHECK_OUT' if time_out else 'CHECK_IN',
-                                'last_time': time_out if time_out else time_in,
-                                'status': 'OUT' if time_out else 'IN',
-                                'check_in_time': time_in,
-                                'check_out_time': time_out,
-                                'duration': total,
-                                'first_check_in': time_in,
-                                'is_overtime': is_ot,
-                                'time_ot': time_ot if time_ot else '0m'
-                            }
-                            break  # Found today's row for this user
-
-                wb.close()
+                user_status[name] = {
+                    'last_event': 'CHECK_OUT' if time_out else 'CHECK_IN',
+                    'last_time': time_out if time_out else time_in,
+                    'status': 'OUT' if time_out else 'IN',
+                    'check_in_time': time_in,
+                    'check_out_time': time_out,
+                    'duration': total,
+                    'first_check_in': time_in,
+                    'check_in_epoch': in_epoch,
+                    'check_out_epoch': epoch(time_out),
+                    'first_check_in_epoch': in_epoch,
+                    'is_overtime': is_ot,
+                    'time_ot': time_ot if time_ot else '0m'
+                }
         
-        except BadZipFile:
-            print(f"[ERROR] Failed to get user status: attendance.xlsx is corrupted (not a zip file)")
         except Exception as e:
             print(f"[ERROR] Failed to get user status: {e}")
         
@@ -775,20 +1080,21 @@ class AttendanceTracker:
         try:
             user_status = self.get_user_status()
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            user_ids = self._get_or_create_user_ids(user_status)
+            
+            rows = [[
+                timestamp,
+                name,
+                user_ids[name],
+                status['status'],
+                status.get('check_in_time', 'N/A'),
+                status.get('check_out_time', 'N/A'),
+                status.get('duration', 'N/A')
+            ] for name, status in user_status.items()]
             
+            # Single buffered append for the whole batch
             with open(self.status_log_file, 'a', newline='') as f:
-                writer = csv.writer(f)
-                for name, status in user_status.items():
-                    user_id = self._get_or_create_user_id(name)
-                    writer.writerow([
-                        timestamp,
-                        name,
-                        user_id,
-                        status['status'],
-                        status.get('check_in_time', 'N/A'),
-                        status.get('check_out_time', 'N/A'),
-                        status.get('duration', 'N/A')
-                    ])
+                csv.writer(f).writerows(rows)
             
             print(f"[INFO] Logged status for {len(user_status)} users")
             return True
@@ -797,6 +1103,24 @@ class AttendanceTracker:
             print(f"[ERROR] Failed to log status: {e}")
             return False
     
+    def _register_report_styles(self, wb):
+        """Register the shared monthly report styles on a workbook (once per workbook)"""
+        existing = wb.named_styles
+        
+        if 'header_monthly' not in existing:
+            wb.add_named_style(NamedStyle(
+                name='header_monthly',
+                font=Font(bold=True, size=12, color="FFFFFF"),
+                fill=PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid"),
+                alignment=Alignment(horizontal="center", vertical="center")
+            ))
+        
+        if 'center_monthly' not in existing:
+            wb.add_named_style(NamedStyle(
+                name='center_monthly',
+                alignment=Alignment(horizontal="center", vertical="center")
+            ))
+    
     def create_monthly_report(self):
         """Create or update monthly report sheet"""
         try:
@@ -804,102 +1128,108 @@ class AttendanceTracker:
                 return
             
             with self._excel_lock:
+                # Nothing has touched the workbook since the last report
+                stat = os.stat(self.attendance_file)
+                if (stat.st_mtime_ns, stat.st_size) == self._report_stat:
+                    return
+                
                 wb = load_workbook(self.attendance_file)
+                self._register_report_styles(wb)
             
-            # Get or create Monthly Report sheet
-            if 'Monthly Report' in wb.sheetnames:
-                ws_monthly = wb['Monthly Report']
-                ws_monthly.delete_rows(2, ws_monthly.max_row)  # Keep header, delete data
-            else:
-                ws_monthly = wb.create_sheet('Monthly Report', 1)
-                # Create headers
-                headers = ['Name', 'Days Late', 'OT Days', 'Total Time Late', 'Total Time OT']
-                ws_monthly.append(headers)
-                
-                # Style headers
-                for cell in ws_monthly[1]:
-                    cell.font = Font(bold=True, size=12, color="FFFFFF")
-                    cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
+                # Get or create Monthly Report sheet
+                if 'Monthly Report' in wb.sheetnames:
+                    ws_monthly = wb['Monthly Report']
+                    ws_monthly.delete_rows(2, ws_monthly.max_row)  # Keep header, delete data
+                else:
+                    ws_monthly = wb.create_sheet('Monthly Report', 1)
+                    # Create headers
+                    headers = ['Name', 'Days Late', 'OT Days', 'Total Time Late', 'Total Time OT']
+                    ws_monthly.append(headers)
+                    
+                    # Style headers
+                    for cell in ws_monthly[1]:
+                        cell.style = 'header_monthly'
                 
-                # Set column widths
-                ws_monthly.column_dimensions['A'].width = 15
-                ws_monthly.column_dimensions['B'].width = 12
-                ws_monthly.column_dimensions['C'].width = 12
-                ws_monthly.column_dimensions['D'].width = 15
-                ws_monthly.column_dimensions['E'].width = 15
+                    # Set column widths
+                    ws_monthly.column_dimensions['A'].width = 15
+                    ws_monthly.column_dimensions['B'].width = 12
+                    ws_monthly.column_dimensions['C'].width = 12
+                    ws_monthly.column_dimensions['D'].width = 15
+                    ws_monthly.column_dimensions['E'].width = 15
             
-            # Get daily sheet
-            ws_daily = wb.active
+                # Get daily sheet
+                ws_daily = wb.active
             
-            # Calculate monthly statistics
-            current_year_month = datetime.now().strftime('%Y-%m')
-            user_stats = {}
+                # Calculate monthly statistics
+                current_year_month = datetime.now().strftime('%Y-%m')
+                user_stats = {}
             
-            for row in ws_daily.iter_rows(min_row=2, values_only=True):
-                if len(row) < 8:
-                    continue
+                for row in ws_daily.iter_rows(min_row=2, values_only=True):
+                    if len(row) < 8:
+                        continue
                 
-                name = row[0]
-                day = row[1]
-                status = row[5]  # Status column
-                time_late = row[6]  # Time Late column
-                time_ot = row[7]  # Time OT column
+                    name = row[0]
+                    day = row[1]
+                    status = row[5]  # Status column
+                    time_late = row[6]  # Time Late column
+                    time_ot = row[7]  # Time OT column
                 
-                if not name or not day:
-                    continue
+                    if not name or not day:
+                        continue
                 
-                # Check if date is in current month
-                try:
-                    day_str = day if isinstance(day, str) else day.strftime('%Y-%m-%d')
-                    if not day_str.startswith(current_year_month):
+                    # Check if date is in current month
+                    try:
+                        day_str = day if isinstance(day, str) else day.strftime('%Y-%m-%d')
+                        if not day_str.startswith(current_year_month):
+                            continue
+                    except:
                         continue
-                except:
-                    continue
                 
-                if name not in user_stats:
-                    user_stats[name] = {
-                        'days_late': 0,
-                        'ot_days': 0,
-                        'total_late_minutes': 0,
-                        'total_ot_minutes': 0
-                    }
+                    if name not in user_stats:
+                        user_stats[name] = {
+                            'days_late': 0,
+                            'ot_days': 0,
+                            'total_late_minutes': 0,
+                            'total_ot_minutes': 0
+                        }
                 
-                # Count late days
-                if status == 'LATE':
-                    user_stats[name]['days_late'] += 1
-                    # Parse time late
-                    if time_late and time_late != '0m':
-                        user_stats[name]['total_late_minutes'] += self._parse_time_to_minutes(time_late)
+                    # Count late days
+                    if status == 'LATE':
+                        user_stats[name]['days_late'] += 1
+                        # Parse time late
+                        if time_late and time_late != '0m':
+                            user_stats[name]['total_late_minutes'] += self._parse_time_to_minutes(time_late)
                 
-                # Count OT days
-                if time_ot and time_ot != '0m':
-                    user_stats[name]['ot_days'] += 1
-                    user_stats[name]['total_ot_minutes'] += self._parse_time_to_minutes(time_ot)
+                    # Count OT days
+                    if time_ot and time_ot != '0m':
+                        user_stats[name]['ot_days'] += 1
+                        user_stats[name]['total_ot_minutes'] += self._parse_time_to_minutes(time_ot)
             
-            # Write data to monthly report
-            row_num = 2
-            for name in sorted(user_stats.keys()):
-                stats = user_stats[name]
-                total_late = self._format_time_from_minutes(stats['total_late_minutes'])
-                total_ot = self._format_time_from_minutes(stats['total_ot_minutes'])
+                # Write data to monthly report
+                row_num = 2
+                for name in sorted(user_stats.keys()):
+                    stats = user_stats[name]
+                    total_late = self._format_time_from_minutes(stats['total_late_minutes'])
+                    total_ot = self._format_time_from_minutes(stats['total_ot_minutes'])
                 
-                ws_monthly.append([
-                    name,
-                    stats['days_late'],
-                    stats['ot_days'],
-                    total_late,
-                    total_ot
-                ])
+                    ws_monthly.append([
+                        name,
+                        stats['days_late'],
+                        stats['ot_days'],
+                        total_late,
+                        total_ot
+                    ])
                 
-                # Style data rows
-                for cell in ws_monthly[row_num]:
-                    cell.alignment = Alignment(horizontal="center", vertical="center")
+                    # Style data rows
+                    for cell in ws_monthly[row_num]:
+                        cell.style = 'center_monthly'
                 
-                row_num += 1
+                    row_num += 1
             
                 wb.save(self.attendance_file)
                 wb.close()
+                stat = os.stat(self.attendance_file)
+                self._report_stat = (stat.st_mtime_ns, stat.st_size)
             print(f"[INFO] Monthly report updated")
         
         except BadZipFile:
@@ -909,25 +1239,7 @@ class AttendanceTracker:
     
     def _parse_time_to_minutes(self, time_str: str) -> int:
         """Parse time string like '1h 30m' or '30m' to total minutes"""
-        try:
-            time_str = time_str.strip()
-            total_minutes = 0
-            
-            if 'h' in time_str:
-                parts = time_str.split('h')
-                hours = int(parts[0].strip())
-                total_minutes += hours * 60
-                
-                if 'm' in parts[1]:
-                    minutes = int(parts[1].replace('m', '').strip())
-                    total_minutes += minutes
-            elif 'm' in time_str:
-                minutes = int(time_str.replace('m', '').strip())
-                total_minutes += minutes
-            
-            return total_minutes
-        except:
-            return 0
+        return _parse_duration(time_str)
     
     def _format_time_from_minutes(self, minutes: int) -> str:
         """Format minutes to 'Xh Ym' format"""
@@ -944,6 +1256,10 @@ class AttendanceTracker:
     
     def update_monthly_summary(self, name: str, current_date: datetime = None):
         """Update monthly summary for a user's sheet"""
+        self.update_monthly_summaries([name], current_date)
+    
+    def update_monthly_summaries(self, names: List[str], current_date: datetime = None):
+        """Update the monthly summaries of several users with one workbook load and save"""
         if current_date is None:
             current_date = datetime.now()
         
@@ -953,73 +1269,78 @@ class AttendanceTracker:
             
             with self._excel_lock:
                 wb = load_workbook(self.attendance_file)
-                month_year = current_date.strftime('%B_%Y')
-                sheet_name = f"{name}_{month_year}"
-                
-                if sheet_name not in wb.sheetnames:
+                try:
+                    updated = [self._update_summary_in_workbook(wb, name, current_date) for name in names]
+                    if any(updated):
+                        wb.save(self.attendance_file)
+                finally:
                     wb.close()
-                    return
-                
-                ws = wb[sheet_name]
-                
-                # Find summary section (starts after all days)
-                year = current_date.year
-                month = current_date.month
-                days_in_month = calendar.monthrange(year, month)[1]
-                data_end_row = 2 + days_in_month
-                summary_start = data_end_row + 2
-                
-                # Calculate statistics
-                total_days_worked = 0
-                total_hours_minutes = 0
-                days_late = 0
-                total_late_minutes = 0
-                days_with_ot = 0
-                total_ot_minutes = 0
-                
-                for row_num in range(3, data_end_row + 1):
-                    first_in = ws.cell(row_num, 3).value
-                    total_hours = ws.cell(row_num, 5).value
-                    time_late = ws.cell(row_num, 7).value
-                    time_ot = ws.cell(row_num, 8).value
-                    
-                    # Count working days
-                    if first_in:
-                        total_days_worked += 1
-                    
-                    # Sum total hours
-                    if total_hours:
-                        total_hours_minutes += self._parse_time_to_minutes(total_hours)
-                    
-                    # Count late days
-                    if time_late and time_late != '0m':
-                        days_late += 1
-                        total_late_minutes += self._parse_time_to_minutes(time_late)
-                    
-                    # Count OT days
-                    if time_ot and time_ot != '0m':
-                        days_with_ot += 1
-                        total_ot_minutes += self._parse_time_to_minutes(time_ot)
-                
-                # Update summary cells
-                summary_data_row = summary_start + 1
-                ws.cell(summary_data_row, 2, total_days_worked)  # Total Working Days
-                ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_hours_minutes))  # Total Hours
-                
-                summary_data_row += 1
-                ws.cell(summary_data_row, 2, days_late)  # Days Late
-                ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_late_minutes))  # Total Late Time
-                
-                summary_data_row += 1
-                ws.cell(summary_data_row, 2, days_with_ot)  # Days with OT
-                ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_ot_minutes))  # Total OT
-                
-                wb.save(self.attendance_file)
-                wb.close()
                 
         except Exception as e:
             print(f"[ERROR] Failed to update monthly summary: {e}")
     
+    def _update_summary_in_workbook(self, wb, name: str, current_date: datetime) -> bool:
+        """Recompute the summary block of a user's monthly sheet (no save)"""
+        month_year = current_date.strftime('%B_%Y')
+        sheet_name = f"{name}_{month_year}"
+        
+        if sheet_name not in wb.sheetnames:
+            return False
+        
+        ws = wb[sheet_name]
+        
+        # Find summary section (starts after all days)
+        year = current_date.year
+        month = current_date.month
+        days_in_month = calendar.monthrange(year, month)[1]
+        data_end_row = 2 + days_in_month
+        summary_start = data_end_row + 2
+        
+        # Calculate statistics
+        total_days_worked = 0
+        total_hours_minutes = 0
+        days_late = 0
+        total_late_minutes = 0
+        days_with_ot = 0
+        total_ot_minutes = 0
+        
+        # Single pass over the day rows (columns A-H)
+        for row in ws.iter_rows(min_row=3, max_row=data_end_row, max_col=8, values_only=True):
+            first_in, total_hours, time_late, time_ot = row[2], row[4], row[6], row[7]
+        
+            # Count working days
+            if first_in:
+                total_days_worked += 1
+        
+            # Sum total hours
+            if total_hours:
+                total_hours_minutes += self._parse_time_to_minutes(total_hours)
+        
+            # Count late days
+            if time_late and time_late != '0m':
+                days_late += 1
+                total_late_minutes += self._parse_time_to_minutes(time_late)
+        
+            # Count OT days
+            if time_ot and time_ot != '0m':
+                days_with_ot += 1
+                total_ot_minutes += self._parse_time_to_minutes(time_ot)
+        
+        # Update summary cells
+        summary_data_row = summary_start + 1
+        ws.cell(summary_data_row, 2, total_days_worked)  # Total Working Days
+        ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_hours_minutes))  # Total Hours
+        
+        summary_data_row += 1
+        ws.cell(summary_data_row, 2, days_late)  # Days Late
+        ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_late_minutes))  # Total Late Time
+        
+        summary_data_row += 1
+        ws.cell(summary_data_row, 2, days_with_ot)  # Days with OT
+        ws.cell(summary_data_row, 5, self._format_time_from_minutes(total_ot_minutes))  # Total OT
+        
+        return True
+    
     def check_in_out(self, name: str) -> str:
         """
         Toggle check-in/check-out for a person
@@ -1035,12 +1356,8 @@ class AttendanceTracker:
         
         print(f"[DEBUG] check_in_out called for {name}, current status: {current_status}")
         
-        # Debug log to CSV
-        debug_log = os.path.join(os.path.dirname(self.attendance_file), 'debug_log.csv')
-        with open(debug_log, 'a') as f:
-            from datetime import datetime
-            now = datetime.now()
-            f.write(f"{now.strftime('%H:%M:%S')},{name},{current_status},")
+        # Debug log line, written once the outcome is known
+        debug_prefix = f"{datetime.now().strftime('%H:%M:%S')},{name},{current_status},"
 
         # Original toggle behavior:
         # - If currently IN -> CHECK OUT
@@ -1050,29 +1367,33 @@ class AttendanceTracker:
             wrote = self.record_event(name, 'CHECK_OUT')
             if not wrote:
                 print(f"[DEBUG] CHECK OUT refused for {name}")
-                with open(debug_log, 'a') as f:
-                    f.write(f"CHECKOUT_REFUSED\n")
+                self._append_debug_log(debug_prefix + "CHECKOUT_REFUSED\n")
                 return 'SUCCESS'
             self.log_status_to_file()
-            self.create_monthly_report()
+            self._schedule_monthly_report()
             print(f"[DEBUG] {name} CHECKED OUT successfully")
-            with open(debug_log, 'a') as f:
-                f.write(f"CHECKED_OUT\n")
+            self._append_debug_log(debug_prefix + "CHECKED_OUT\n")
             return 'CHECKED OUT'
 
         print(f"[DEBUG] {name} not IN, attempting CHECK IN")
         wrote = self.record_event(name, 'CHECK_IN')
         if not wrote:
             print(f"[DEBUG] CHECK IN refused for {name}")
-            with open(debug_log, 'a') as f:
-                f.write(f"CHECKIN_REFUSED\n")
+            self._append_debug_log(debug_prefix + "CHECKIN_REFUSED\n")
             return 'SUCCESS'
         self.log_status_to_file()
         print(f"[DEBUG] {name} CHECKED IN successfully")
-        with open(debug_log, 'a') as f:
-            f.write(f"CHECKED_IN\n")
+        self._append_debug_log(debug_prefix + "CHECKED_IN\n")
         return 'CHECKED IN'
     
+    def _append_debug_log(self, line: str):
+        """Append a complete line to the debug log in a single write"""
+        try:
+            with open(self.debug_log_file, 'a') as f:
+                f.write(line)
+        except Exception as e:
+            print(f"[WARNING] Failed to write debug log: {e}")
+    
     def manual_checkout(self, name: str) -> str:
         """
         Manually check out a user
@@ -1088,7 +1409,7 @@ class AttendanceTracker:
         if name in user_status and user_status[name]['status'] == 'IN':
             self.record_event(name, 'CHECK_OUT')
             self.log_status_to_file()
-            self.create_monthly_report()
+            self._schedule_monthly_report()
             return 'CHECKED OUT'
         else:
             return 'NOT CHECKED IN'
@@ -0,0 +1,105 @@
+#!/bin/bash
+
+# Build OpenCV (with contrib, for cv2.face) tuned for this board
+# NEON + TBB + OpenCL on the Pi, AVX2 on x86 desktops used for testing
+# Run this script with: bash build_opencv.sh [version]
+# Takes 1-3 hours on a Pi 4/5; a Pi 3 needs extra swap (see below)
+
+set -e
+
+OPENCV_VERSION=${1:-4.10.0}
+BUILD_ROOT=${BUILD_ROOT:-$HOME/opencv_build}
+JOBS=$(nproc)
+
+echo "================================================"
+echo "OpenCV $OPENCV_VERSION - Optimized Build"
+echo "================================================"
+echo ""
+
+ARCH=$(uname -m)
+case "$ARCH" in
+    aarch64|armv7l)
+        # Dot-product kernels are dispatched at runtime, so the build still runs on A53/A72 cores
+        CPU_FLAGS="-DENABLE_NEON=ON -DCPU_BASELINE=NEON -DCPU_DISPATCH=NEON_DOTPROD"
+        ;;
+    x86_64)
+        CPU_FLAGS="-DCPU_BASELINE=AVX2 -DCPU_DISPATCH=AVX512_SKX"
+        ;;
+    *)
+        echo "ERROR: Unsupported architecture: $ARCH"
+        exit 1
+        ;;
+esac
+echo "Architecture: $ARCH"
+
+# Less than 2 GB RAM runs out of memory during the parallel build
+MEM_MB=$(free -m | awk '/^Mem:/ {print $2}')
+if [ "$MEM_MB" -lt 2000 ]; then
+    echo "WARNING: ${MEM_MB} MB RAM - increase CONF_SWAPSIZE in /etc/dphys-swapfile to 2048"
+    JOBS=1
+fi
+
+echo ""
+echo "Step 1: Installing build dependencies..."
+sudo apt-get install -y build-essential cmake git pkg-config
+sudo apt-get install -y libtbb-dev libjpeg-dev libpng-dev libtiff-dev
+sudo apt-get install -y libavcodec-dev libavformat-dev libswscale-dev libv4l-dev
+sudo apt-get install -y ocl-icd-opencl-dev python3-dev python3-numpy
+
+echo ""
+echo "Step 2: Downloading OpenCV $OPENCV_VERSION sources..."
+mkdir -p "$BUILD_ROOT"
+cd "$BUILD_ROOT"
+[ -d opencv ] || git clone --depth 1 --branch "$OPENCV_VERSION" https://github.com/opencv/opencv.git
+[ -d opencv_contrib ] || git clone --depth 1 --branch "$OPENCV_VERSION" https://github.com/opencv/opencv_contrib.git
+
+echo ""
+echo "Step 3: Configuring..."
+mkdir -p opencv/build
+cd opencv/build
+cmake -DCMAKE_BUILD_TYPE=Release \
+      -DCMAKE_INSTALL_PREFIX=/usr/local \
+      -DOPENCV_EXTRA_MODULES_PATH="$BUILD_ROOT/opencv_contrib/modules" \
+      $CPU_FLAGS \
+      -DWITH_TBB=ON \
+      -DWITH_OPENCL=ON \
+      -DWITH_V4L=ON \
+      -DENABLE_LTO=ON \
+      -DENABLE_FAST_MATH=ON \
+      -DBUILD_opencv_python3=ON \
+      -DPYTHON3_EXECUTABLE="$(which python3)" \
+      -DBUILD_TESTS=OFF \
+      -DBUILD_PERF_TESTS=OFF \
+      -DBUILD_EXAMPLES=OFF \
+      ..
+
+echo ""
+echo "Step 4: Building with $JOBS job(s)..."
+make -j"$JOBS"
+
+echo ""
+echo "Step 5: Installing..."
+sudo make install
+sudo ldconfig
+
+echo ""
+echo "Step 6: Verifying build..."
+# pip wheels would shadow the new build
+if pip3 show opencv-python opencv-contrib-python > /dev/null 2>&1; then
+    echo "WARNING: pip OpenCV packages are installed and take precedence; remove them with:"
+    echo "  pip3 uninstall opencv-python opencv-contrib-python"
+fi
+python3 -c "
+import cv2
+info = cv2.getBuildInformation()
+print('OpenCV', cv2.__version__)
+for line in info.splitlines():
+    if any(k in line for k in ('Baseline:', 'Dispatched code', 'Parallel framework', 'OpenCL:')):
+        print(line.strip())
+print('cv2.face:', 'YES' if hasattr(cv2, 'face') else 'NO')
+"
+
+echo ""
+echo "================================================"
+echo "OpenCV build complete!"
+echo "================================================"
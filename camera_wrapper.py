@@ -1,9 +1,10 @@
 """
 Camera Wrapper for Raspberry Pi
-Supports both rpicam-still/rpicam-vid and USB cameras
+Supports Picamera2, rpicam-still and USB cameras
 """
 
 import cv2
+import io
 import subprocess
 import os
 import time
@@ -12,11 +13,38 @@ import threading
 from typing import Optional
 import numpy as np
 
+# Picamera2 captures in-process (no subprocess or temp file per frame)
+try:
+    from picamera2 import Picamera2
+    PICAMERA2_AVAILABLE = True
+except ImportError:
+    PICAMERA2_AVAILABLE = False
+
+# Hardware (ISP/VideoCore) JPEG encoding for streaming; not present on every Pi (e.g. Pi 5)
+try:
+    from picamera2.encoders import MJPEGEncoder
+    from picamera2.outputs import FileOutput
+    MJPEG_ENCODER_AVAILABLE = True
+except ImportError:
+    MJPEG_ENCODER_AVAILABLE = False
+
+
+class _JpegCallbackOutput(io.BufferedIOBase):
+    """File-like sink for the MJPEG encoder: each write() is one complete JPEG frame"""
+    
+    def __init__(self, callback):
+        self.callback = callback
+    
+    def write(self, buf):
+        self.callback(bytes(buf))
+        return len(buf)
+
 
 class Camera:
     """Universal camera wrapper with live preview support"""
     
-    def __init__(self, width=640, height=480, use_pi_camera=True, preview=False):
+    def __init__(self, width=640, height=480, use_pi_camera=True, preview=False, framerate=30,
+                 color=True):
         """
         Initialize camera
         
@@ -25,17 +53,30 @@ class Camera:
             height: Frame height
             use_pi_camera: Try Pi Camera first
             preview: Enable live preview window
+            framerate: Target capture frame rate
+            color: False to capture luminance only (YUV420 / GREY) for read_gray()
         """
         self.width = width
         self.height = height
+        self.framerate = framerate
+        self.color = color
+        self.usb_gray = False
         self.camera_type = None
         self.cap = None
+        self.picam2 = None
         self.temp_file = os.path.join(tempfile.gettempdir(), 'picam_capture.jpg')
         self.preview = preview
         self.last_frame = None
+        self.jpeg_streaming = False
         
         if use_pi_camera:
-            # Try rpicam-still first
+            # Prefer a persistent Picamera2 stream
+            if self._open_picamera2():
+                self.camera_type = 'picamera2'
+                print("[INFO] Using Pi Camera (Picamera2)")
+                return
+            
+            # Fall back to rpicam-still (one process per frame, slow)
             if self._check_rpicam():
                 self.camera_type = 'rpicam'
                 print("[INFO] Using Pi Camera (rpicam-still)")
@@ -46,12 +87,80 @@ class Camera:
         if self.cap.isOpened():
             self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
             self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+            if not color:
+                self.usb_gray = self._open_usb_gray()
+            if not self.usb_gray:
+                # Request compressed MJPEG (far less USB bandwidth than raw YUYV)
+                self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+            self.cap.set(cv2.CAP_PROP_FPS, framerate)
+            # Keep only the newest frame so read() never returns stale ones
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             self.camera_type = 'usb'
             print("[INFO] Using USB Camera")
         else:
             self.camera_type = None
             print("[ERROR] No camera available")
     
+    def _open_picamera2(self) -> bool:
+        """Start a continuous Picamera2 capture stream"""
+        if not PICAMERA2_AVAILABLE:
+            return False
+        try:
+            self.picam2 = Picamera2()
+            # "RGB888" is BGR byte order in memory, as OpenCV expects; in YUV420 the
+            # first height rows are the Y plane, i.e. the grayscale image
+            cam_format = "RGB888" if self.color else "YUV420"
+            cam_config = self.picam2.create_preview_configuration(
+                main={"size": (self.width, self.height), "format": cam_format},
+                controls={"FrameRate": self.framerate})
+            self.picam2.configure(cam_config)
+            self.picam2.start()
+            return True
+        except Exception as e:
+            print(f"[WARNING] Picamera2 unavailable: {e}")
+            if self.picam2 is not None:
+                try:
+                    self.picam2.close()
+                except Exception:
+                    pass
+                self.picam2 = None
+            return False
+    
+    def start_jpeg_stream(self, callback) -> bool:
+        """
+        Have the Pi's hardware encoder produce JPEG frames alongside read()
+        
+        Args:
+            callback: Called with the bytes of every encoded frame (from the encoder's thread)
+            
+        Returns:
+            True if hardware JPEG frames will be delivered, False to keep encoding in software
+        """
+        if self.camera_type != 'picamera2' or not self.color or not MJPEG_ENCODER_AVAILABLE:
+            return False
+        try:
+            self.picam2.start_encoder(MJPEGEncoder(), FileOutput(_JpegCallbackOutput(callback)))
+            self.jpeg_streaming = True
+            print("[INFO] Streaming hardware-encoded JPEG frames")
+            return True
+        except Exception as e:
+            print(f"[WARNING] Hardware JPEG encoder unavailable: {e}")
+            return False
+    
+    def _open_usb_gray(self) -> bool:
+        """Ask the USB camera for 8-bit greyscale (V4L2 GREY); not all cameras support it"""
+        grey = cv2.VideoWriter_fourcc(*'GREY')
+        self.cap.set(cv2.CAP_PROP_FOURCC, grey)
+        if int(self.cap.get(cv2.CAP_PROP_FOURCC)) != grey:
+            return False
+        
+        # Hand back the raw Y bytes instead of converting them to BGR
+        self.cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+        self.usb_size = (int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                         int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)))
+        print("[INFO] USB camera delivering greyscale frames")
+        return True
+    
     def _check_rpicam(self) -> bool:
         """Check if rpicam-still is available"""
         try:
@@ -72,19 +181,52 @@ class Camera:
         Returns:
             (success, frame) tuple
         """
-        if self.camera_type == 'rpicam':
+        if self.camera_type == 'picamera2':
+            success, frame = self._read_picamera2()
+            if success and not self.color:
+                frame = cv2.cvtColor(frame, cv2.COLOR_YUV2BGR_I420)
+        elif self.camera_type == 'rpicam':
             success, frame = self._read_rpicam()
         elif self.camera_type == 'usb':
             success, frame = self.cap.read()
+            if success and self.usb_gray:
+                frame = cv2.cvtColor(frame.reshape(self.usb_size), cv2.COLOR_GRAY2BGR)
         else:
             return False, None
         
-        # Store last frame for preview
-        if success and frame is not None:
-            self.last_frame = frame.copy()
+        # Store last frame for preview (each read returns a new array, so no copy)
+        if self.preview and success and frame is not None:
+            self.last_frame = frame
         
         return success, frame
     
+    def read_gray(self) -> tuple:
+        """
+        Capture a grayscale frame, without a colour conversion when opened with color=False
+        
+        Returns:
+            (success, frame) tuple
+        """
+        if self.camera_type == 'picamera2':
+            success, frame = self._read_picamera2()
+            if success:
+                if self.color:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                else:
+                    frame = frame[:self.height, :self.width]
+            return success, frame
+        elif self.camera_type == 'rpicam':
+            return self._read_rpicam(cv2.IMREAD_GRAYSCALE)
+        elif self.camera_type == 'usb':
+            success, frame = self.cap.read()
+            if success:
+                if self.usb_gray:
+                    frame = frame.reshape(self.usb_size)
+                else:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            return success, frame
+        return False, None
+    
     def read_frame(self):
         """
         Convenience method to read a frame (returns frame only)
@@ -107,7 +249,16 @@ class Camera:
             cv2.imshow(window_name, frame)
             cv2.waitKey(1)
     
-    def _read_rpicam(self) -> tuple:
+    def _read_picamera2(self) -> tuple:
+        """Capture frame from the running Picamera2 stream"""
+        try:
+            frame = self.picam2.capture_array()
+            return frame is not None, frame
+        except Exception as e:
+            print(f"[ERROR] Picamera2 capture failed: {e}")
+            return False, None
+    
+    def _read_rpicam(self, flags=cv2.IMREAD_COLOR) -> tuple:
         """Capture frame using rpicam-still"""
         try:
             # Capture image with rpicam-still
@@ -125,7 +276,7 @@ class Camera:
             
             if result.returncode == 0 and os.path.exists(self.temp_file):
                 # Read the captured image
-                frame = cv2.imread(self.temp_file)
+                frame = cv2.imread(self.temp_file, flags)
                 if frame is not None:
                     return True, frame
             
@@ -140,6 +291,17 @@ class Camera:
         if self.camera_type == 'usb' and self.cap is not None:
             self.cap.release()
         
+        if self.picam2 is not None:
+            try:
+                if self.jpeg_streaming:
+                    self.picam2.stop_encoder()
+                    self.jpeg_streaming = False
+                self.picam2.stop()
+                self.picam2.close()
+            except Exception:
+                pass
+            self.picam2 = None
+        
         # Clean up temp file
         if os.path.exists(self.temp_file):
             try:
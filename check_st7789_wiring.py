@@ -5,6 +5,7 @@ Verifies SPI configuration and pins
 """
 
 import sys
+import config
 
 print("="*60)
 print("ST7789 DISPLAY WIRING VERIFICATION")
@@ -66,15 +67,7 @@ try:
     import st7789
     from PIL import Image, ImageDraw, ImageFont
     
-    display = st7789.ST7789(
-        rotation=90,
-        port=0,       # SPI0 - uses GPIO 10 (MOSI) and GPIO 11 (SCLK) automatically
-        cs=0,         # CE0 = GPIO 8
-        dc=25,        # GPIO 25
-        backlight=18, # GPIO 18
-        rst=24,       # GPIO 24
-        spi_speed_hz=80 * 1000000
-    )
+    display = st7789.ST7789(**config.ST7789_DISPLAY)
     
     print("   ✓ Display initialized")
     print(f"     Resolution: {display.width}x{display.height}")
@@ -89,10 +82,7 @@ try:
     draw = ImageDraw.Draw(img)
     
     # Add white text
-    try:
-        font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 50)
-    except:
-        font = ImageFont.load_default()
+    font = config.get_font(50)
     
     draw.text((30, 90), "TEST", font=font, fill=(255, 255, 255))
     
@@ -9,10 +9,13 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DATA_DIR = os.path.join(BASE_DIR, 'data')
 FACES_DIR = os.path.join(DATA_DIR, 'faces')
 IMAGES_DIR = os.path.join(DATA_DIR, 'images')
+FACES_CACHE_DIR = os.path.join(FACES_DIR, 'crops')  # 200x200 face crops of enrollment images
 ATTENDANCE_FILE = os.path.join(DATA_DIR, 'attendance.xlsx')
+ATTENDANCE_DB = os.path.join(DATA_DIR, 'attendance.db')
+ATTENDANCE_PARQUET = os.path.join(DATA_DIR, 'attendance.parquet')  # Read-only mirror for view_attendance.py
 
 # Create directories if they don't exist
-for directory in [DATA_DIR, FACES_DIR, IMAGES_DIR]:
+for directory in [DATA_DIR, FACES_DIR, IMAGES_DIR, FACES_CACHE_DIR]:
     os.makedirs(directory, exist_ok=True)
 
 # Camera settings
@@ -22,16 +25,24 @@ CAMERA_FRAMERATE = 30
 USE_PI_CAMERA = True  # Set to False for USB webcam
 
 # Face detection settings
+# LBP uses integer features (~2x faster than Haar on ARM); falls back to Haar if not installed
+CASCADE_FILE = 'lbpcascade_frontalface_improved.xml'  # or 'haarcascade_frontalface_default.xml'
 DETECTION_SCALE_FACTOR = 1.1
 DETECTION_MIN_NEIGHBORS = 5
-DETECTION_MIN_SIZE = (30, 30)
+DETECTION_MIN_SIZE = (30, 30)  # In full-resolution pixels
+DETECT_SCALE = 0.5  # Run the cascade on a downscaled frame (1.0 = full resolution)
+DETECT_MAX_WIDTH = 320  # Scale down further so the cascade never sees wider frames (None = no limit)
+USE_OPENCL = True  # Run detection through OpenCV's OpenCL path (UMat) when a device is available
 
 # Face recognition settings
 RECOGNITION_TOLERANCE = 0.6  # Lower is more strict (0.4-0.6 recommended)
+LBPH_NUMPY_MAX_SAMPLES = 50  # Match with NumPy instead of LBPH predict() up to this many samples (0 = never)
+USE_NUMBA = True  # Compile the LBP histogram with Numba when it is installed (pip install numba)
 MODEL = 'hog'  # Use 'hog' for Pi (faster), 'cnn' for better accuracy (slower)
 
 # Check-in/check-out settings
 CHECK_IN_COOLDOWN = 300  # Seconds before allowing another check-in (5 minutes)
+MONTHLY_REPORT_DEBOUNCE = 30  # Seconds to coalesce check-ins before rebuilding the monthly report
 
 # GPIO settings for access control (optional)
 USE_GPIO = False  # Enable if using relay for door/box control
@@ -41,6 +52,39 @@ UNLOCK_DURATION = 3  # Seconds to keep door/box unlocked
 # Display settings
 SHOW_PREVIEW = True  # Show camera preview window
 PREVIEW_SCALE = 0.5  # Scale factor for preview window (0.5 = 50%)
+STREAM_JPEG_QUALITY = 80  # Web video feed JPEG quality (OpenCV default 95; 80 is about half the size)
+WEB_SERVER_THREADS = 8  # waitress worker threads; each open video feed holds one
+
+# LCD (ST7789) settings
+SPI_SPEED_HZ = 80 * 1000000  # Run diagnose_display.py to find the fastest stable clock
+ST7789_DISPLAY = {  # Keyword arguments for st7789.ST7789(**ST7789_DISPLAY)
+    'rotation': 90,
+    'port': 0,          # SPI0 (GPIO 10 MOSI, GPIO 11 SCLK)
+    'cs': 0,            # CE0 (GPIO 8, Pin 24)
+    'dc': 25,           # GPIO 25, Pin 22
+    'backlight': 18,    # GPIO 18, Pin 12
+    'rst': 24,          # GPIO 24, Pin 18
+    'spi_speed_hz': SPI_SPEED_HZ,
+}
+
+# LCD fonts
+FONT_BOLD = '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf'
+FONT_REGULAR = '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'
+_FONT_CACHE = {}
+
+
+def get_font(size, bold=True):
+    """Load a DejaVu font once per (size, bold) and reuse it (PIL default font if missing)"""
+    key = (size, bold)
+    if key not in _FONT_CACHE:
+        from PIL import ImageFont
+        try:
+            _FONT_CACHE[key] = ImageFont.truetype(FONT_BOLD if bold else FONT_REGULAR, size)
+        except OSError:
+            _FONT_CACHE[key] = ImageFont.load_default()
+    return _FONT_CACHE[key]
 
 # Performance settings
 PROCESS_EVERY_N_FRAMES = 2  # Process every Nth frame for better performance
+MOTION_THRESHOLD = 2.0  # Skip detection while the mean pixel change (0-255) stays below this; 0 = always detect
+CPU_THREADS = os.cpu_count() or 1  # Worker threads for per-face recognition and image decoding
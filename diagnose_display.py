@@ -6,6 +6,7 @@ Checks hardware, software, and configuration issues
 
 import sys
 import time
+import config
 
 def check_spi():
     """Check if SPI is enabled"""
@@ -61,15 +62,7 @@ def test_display_init():
     print("\n4. Testing display initialization...")
     try:
         import st7789
-        display = st7789.ST7789(
-            rotation=90,
-            port=0,
-            cs=0,
-            dc=25,
-            backlight=18,
-            rst=24,
-            spi_speed_hz=80 * 1000000
-        )
+        display = st7789.ST7789(**config.ST7789_DISPLAY)
         print(f"   ✓ Display initialized successfully")
         print(f"   → Size: {display.width}x{display.height}")
         return display
@@ -102,10 +95,7 @@ def test_display_output(display):
             draw = ImageDraw.Draw(img)
             
             # Add text
-            try:
-                font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 40)
-            except:
-                font = ImageFont.load_default()
+            font = config.get_font(40)
             
             # Contrasting text color
             text_color = (0, 0, 0) if name == "WHITE" or name == "YELLOW" else (255, 255, 255)
@@ -141,47 +131,89 @@ def test_different_rotations(display):
     
     try:
         from PIL import Image, ImageDraw, ImageFont
-        import st7789
         
         rotations = [0, 90, 180, 270]
+        original_rotation = display._rotation
         
         for rot in rotations:
             print(f"   Testing rotation: {rot}°")
             
-            # Reinitialize with new rotation
-            test_disp = st7789.ST7789(
-                rotation=rot,
-                port=0,
-                cs=0,
-                dc=25,
-                backlight=18,
-                rst=24,
-                spi_speed_hz=80 * 1000000
-            )
+            # The st7789 library rotates frames in software, so switch the
+            # rotation on the open display instead of reinitializing the panel
+            display._rotation = rot
             
             # Show colored screen with rotation label
-            img = Image.new('RGB', (test_disp.width, test_disp.height), color=(0, 100, 200))
+            img = Image.new('RGB', (display.width, display.height), color=(0, 100, 200))
             draw = ImageDraw.Draw(img)
             
-            try:
-                font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 30)
-            except:
-                font = ImageFont.load_default()
+            font = config.get_font(30)
             
-            draw.text((20, test_disp.height//2 - 20), f"{rot}°", font=font, fill=(255, 255, 255))
-            test_disp.display(img)
+            draw.text((20, display.height//2 - 20), f"{rot}°", font=font, fill=(255, 255, 255))
+            display.display(img)
             
             time.sleep(3)
         
+        display._rotation = original_rotation
+        
         print("\n   Which rotation looked correct?")
         print("   (Current default is 90°)")
         
     except Exception as e:
         print(f"   ✗ Error during rotation test: {e}")
 
+def test_spi_speeds(display):
+    """Ramp the SPI clock and record the fastest speed that still draws correctly"""
+    print("\n7. Testing SPI clock speeds...")
+    print("   A checkerboard is shown at each speed; answer whether it looks clean")
+    print()
+    
+    speeds_mhz = [32, 48, 64, 80, 96, 125]
+    best_mhz = None
+    
+    try:
+        import os
+        from PIL import Image, ImageDraw
+        
+        # Checkerboard: sharp edges show corruption at too-high clocks
+        img = Image.new('RGB', (display.width, display.height), color=(0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        square = 30
+        for y in range(0, display.height, square):
+            for x in range(0, display.width, square):
+                if (x // square + y // square) % 2 == 0:
+                    draw.rectangle([x, y, x + square - 1, y + square - 1], fill=(255, 255, 255))
+        
+        for mhz in speeds_mhz:
+            # Change the clock on the open device; no need to reinitialize the panel
+            display._spi.max_speed_hz = mhz * 1000000
+            display.display(img)
+            response = input(f"   {mhz} MHz - checkerboard clean? (y/n): ").strip().lower()
+            if response != 'y':
+                break
+            best_mhz = mhz
+        
+        display._spi.max_speed_hz = config.SPI_SPEED_HZ
+        
+        if best_mhz is None:
+            print("   ✗ No tested speed rendered correctly")
+            return False
+        
+        result_file = os.path.join(config.DATA_DIR, 'spi_speed_hz.txt')
+        os.makedirs(config.DATA_DIR, exist_ok=True)
+        with open(result_file, 'w') as f:
+            f.write(f"{best_mhz * 1000000}\n")
+        
+        print(f"   ✓ Fastest clean speed: {best_mhz} MHz (saved to {result_file})")
+        print(f"   → Set SPI_SPEED_HZ = {best_mhz} * 1000000 in config.py to use it")
+        return True
+    
+    except Exception as e:
+        print(f"   ✗ Error during SPI speed test: {e}")
+        return False
+
 def check_hardware_connections():
     """Display wiring information"""
-    print("\n7. Hardware Connection Check")
+    print("\n8. Hardware Connection Check")
     print("   =====================================")
     print("   Expected ST7789 wiring:")
     print("   =====================================")
@@ -225,6 +257,10 @@ def main():
         
         if not results['output']:
             test_different_rotations(display)
+        else:
+            response = input("\n   Run the SPI speed test? (y/n): ").strip().lower()
+            if response == 'y':
+                test_spi_speeds(display)
     
     # Show hardware info
     check_hardware_connections()
@@ -5,16 +5,28 @@ Shows real-time attendance status from the face recognition system
 """
 
 import time
+import queue
+import threading
 import st7789
+from st7789_fast import display_image, image_to_rgb565, supports_direct_write, write_frame
 from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 import os
 import csv
 from attendance_tracker import AttendanceTracker
+import config
+
+# inotify lets the display wake only when attendance data changes
+try:
+    from inotify_simple import INotify, flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
 
 # Display configuration
 DISPLAY_WIDTH = 240
 DISPLAY_HEIGHT = 240
+MAX_VISIBLE_USERS = 5
 
 # Colors
 BG_COLOR = (0, 30, 60)
@@ -34,111 +46,211 @@ class AttendanceDisplay:
         print("Initializing ST7789 display...")
         
         # Initialize display with correct pins
-        self.display = st7789.ST7789(
-            rotation=90,
-            port=0,
-            cs=0,         # CE0 (GPIO 8, Pin 24)
-            dc=25,        # GPIO 25, Pin 22
-            backlight=18, # GPIO 18, Pin 12
-            rst=24,       # GPIO 24, Pin 18
-            spi_speed_hz=80 * 1000000
-        )
+        self.display = st7789.ST7789(**config.ST7789_DISPLAY)
         
         # Load fonts
-        try:
-            self.font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-            self.font_name = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-            self.font_info = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-            self.font_time = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 11)
-            self.font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 10)
-        except:
-            self.font_title = ImageFont.load_default()
-            self.font_name = ImageFont.load_default()
-            self.font_info = ImageFont.load_default()
-            self.font_time = ImageFont.load_default()
-            self.font_small = ImageFont.load_default()
+        self.font_title = config.get_font(20)
+        self.font_name = config.get_font(16)
+        self.font_info = config.get_font(12, bold=False)
+        self.font_time = config.get_font(11, bold=False)
+        self.font_small = config.get_font(10, bold=False)
         
         self.tracker = AttendanceTracker()
+        
+        # Persistent frame buffer; only regions that changed are redrawn
+        self._img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=BG_COLOR)
+        self._draw = ImageDraw.Draw(self._img)
+        self._last_sig = None
+        self._header_minute = None
+        self._slots = [None] * MAX_VISIBLE_USERS  # (name, last_time) shown per card
+        self._status_key = None
+        self._sorted_users = []  # (name, last_time), most recent first
+        self._build_templates()
+        
+        # Pre-rasterized glyphs for the time strings drawn on every frame
+        self._time_atlas = self._build_glyph_atlas(self.font_time, "0123456789: Time")
+        self._footer_atlas = self._build_glyph_atlas(self.font_small, "0123456789:")
+        
+        # SPI transfer runs on its own thread so the next frame can be drawn meanwhile
+        self._frame_queue = queue.Queue(maxsize=1)
+        self._spi_thread = threading.Thread(target=self._spi_worker, daemon=True)
+        self._spi_thread.start()
         print("✓ Display initialized")
     
-    def draw_header(self, draw):
-        """Draw header section"""
-        # Header background
+    def _spi_worker(self):
+        """Send queued frames to the display"""
+        while True:
+            frame = self._frame_queue.get()
+            if frame is None:
+                break
+            try:
+                if isinstance(frame, bytes):
+                    write_frame(self.display, frame)
+                else:
+                    display_image(self.display, frame)
+            except Exception as e:
+                print(f"[ERROR] Display update failed: {e}")
+    
+    def _push_frame(self, img):
+        """Queue a snapshot of img for display, replacing any frame not yet sent"""
+        if supports_direct_write(self.display):
+            # Pack to RGB565 now: 2 bytes/pixel cross the queue instead of an RGB copy
+            frame = image_to_rgb565(img, self.display._rotation)
+        else:
+            frame = img.copy()
+        try:
+            self._frame_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._frame_queue.put(frame)
+    
+    def _build_templates(self):
+        """Pre-render the static header and card artwork once; frames paste them"""
+        # Header background, title and border line
+        self._header_template = Image.new('RGB', (DISPLAY_WIDTH, 37), color=BG_COLOR)
+        draw = ImageDraw.Draw(self._header_template)
         draw.rectangle([0, 0, DISPLAY_WIDTH, 35], fill=HEADER_BG)
-        
-        # Title
         draw.text((10, 8), "Attendance", font=self.font_title, fill=TEXT_COLOR)
+        draw.line([0, 35, DISPLAY_WIDTH, 35], fill=BORDER_COLOR, width=2)
+        
+        # Empty user card with SUCCESS badge (positioned at x=5)
+        card_height = 40
+        self._card_template = Image.new('RGB', (DISPLAY_WIDTH - 9, card_height + 1), color=BG_COLOR)
+        draw = ImageDraw.Draw(self._card_template)
+        draw.rectangle([0, 0, DISPLAY_WIDTH - 10, card_height], 
+                      fill=(20, 60, 40), outline=(46, 204, 113))
+        draw.rectangle([DISPLAY_WIDTH - 85, 5, DISPLAY_WIDTH - 15, 22], 
+                      fill=STATUS_IN_COLOR)
+        draw.text((DISPLAY_WIDTH - 80, 7), "SUCCESS", font=self.font_small, fill=(255, 255, 255))
+    
+    def _build_glyph_atlas(self, font, chars):
+        """Rasterize each character once into a mask; returns {char: (advance, mask)}"""
+        try:
+            ascent, descent = font.getmetrics()
+        except AttributeError:
+            return {}  # Bitmap fallback font: blit_str uses draw.text instead
+        atlas = {}
+        for ch in chars:
+            advance = int(round(font.getlength(ch)))
+            # A little slack so glyph ink past the advance isn't clipped
+            mask = Image.new('L', (advance + 2, ascent + descent), 0)
+            ImageDraw.Draw(mask).text((0, 0), ch, font=font, fill=255)
+            atlas[ch] = (advance, mask)
+        return atlas
+    
+    def blit_str(self, draw, x, y, text, atlas, font, color):
+        """Draw text by pasting pre-rasterized glyphs (falls back to draw.text)"""
+        if any(ch not in atlas for ch in text):
+            draw.text((x, y), text, font=font, fill=color)
+            return
+        for ch in text:
+            advance, mask = atlas[ch]
+            self._img.paste(color, (x, y, x + mask.width, y + mask.height), mask)
+            x += advance
+    
+    def draw_header(self, draw, current_time=None):
+        """Draw header section"""
+        # Header background, title and border line
+        self._img.paste(self._header_template, (0, 0))
         
         # Current time
-        current_time = datetime.now().strftime("%H:%M")
+        if current_time is None:
+            current_time = datetime.now().strftime("%H:%M")
         draw.text((DISPLAY_WIDTH - 60, 10), current_time, font=self.font_info, fill=TIME_COLOR)
-        
-        # Border line
-        draw.line([0, 35, DISPLAY_WIDTH, 35], fill=BORDER_COLOR, width=2)
     
     def draw_user_status(self, draw, y_position, name, status_info):
         """Draw individual user status - simplified view"""
-        # User card background
-        card_height = 40
-        draw.rectangle([5, y_position, DISPLAY_WIDTH - 5, y_position + card_height], 
-                      fill=(20, 60, 40), outline=(46, 204, 113))
+        # User card background and SUCCESS badge
+        self._img.paste(self._card_template, (5, y_position))
         
         # Name
         draw.text((10, y_position + 5), name[:15], font=self.font_name, fill=TEXT_COLOR)
         
-        # SUCCESS badge
-        draw.rectangle([DISPLAY_WIDTH - 80, y_position + 5, DISPLAY_WIDTH - 10, y_position + 22], 
-                      fill=STATUS_IN_COLOR)
-        draw.text((DISPLAY_WIDTH - 75, y_position + 7), "SUCCESS", font=self.font_small, fill=(255, 255, 255))
-        
         # Time (last activity time)
         time_text = status_info.get('last_time', 'N/A')
-        draw.text((10, y_position + 24), f"Time: {time_text}", font=self.font_time, fill=TIME_COLOR)
+        self.blit_str(draw, 10, y_position + 24, f"Time: {time_text}",
+                      self._time_atlas, self.font_time, TIME_COLOR)
     
     def update_display(self):
-        """Update display with current attendance data"""
-        # Create new image
-        img = Image.new('RGB', (DISPLAY_WIDTH, DISPLAY_HEIGHT), color=BG_COLOR)
-        draw = ImageDraw.Draw(img)
-        
-        # Draw header
-        self.draw_header(draw)
-        
+        """Update display with current attendance data (unchanged frames are skipped)"""
         # Get user status
         user_status = self.tracker.get_user_status()
+        current_minute = datetime.now().strftime("%H:%M")
+        
+        # Sort by most recent activity (only re-sorted when someone's time changes)
+        status_key = frozenset((name, info.get('last_time', '')) for name, info in user_status.items())
+        if status_key != self._status_key:
+            self._sorted_users = sorted(((name, info.get('last_time', 'N/A')) for name, info in user_status.items()),
+                                        key=lambda x: x[1] or '', reverse=True)
+            self._status_key = status_key
+        visible = self._sorted_users[:MAX_VISIBLE_USERS]
+        remaining = len(user_status) - len(visible)
+        
+        # Nothing on screen would change: skip drawing and the SPI transfer
+        sig = (current_minute, tuple(visible), remaining)
+        if sig == self._last_sig:
+            return
+        self._last_sig = sig
+        draw = self._draw
         
-        if not user_status:
+        # Draw header (clock only changes once a minute)
+        if current_minute != self._header_minute:
+            self.draw_header(draw, current_minute)
+            self._header_minute = current_minute
+        
+        if not visible:
             # No users message
+            draw.rectangle([0, 37, DISPLAY_WIDTH, DISPLAY_HEIGHT], fill=BG_COLOR)
             draw.text((DISPLAY_WIDTH // 2 - 40, DISPLAY_HEIGHT // 2), 
                      "No users yet", font=self.font_info, fill=(150, 150, 150))
+            self._slots = [None] * MAX_VISIBLE_USERS
         else:
-            # Display users (max 5 visible at once)
-            y_pos = 40
-            count = 0
-            max_users = 5
-            
-            # Sort by most recent activity
-            sorted_users = sorted(user_status.items(), 
-                                key=lambda x: x[1].get('last_time', ''), reverse=True)
+            if not any(self._slots):
+                # Clear the "No users yet" message
+                draw.rectangle([0, 37, DISPLAY_WIDTH, DISPLAY_HEIGHT], fill=BG_COLOR)
             
-            for name, status_info in sorted_users[:max_users]:
-                self.draw_user_status(draw, y_pos, name, status_info)
-                y_pos += 45
-                count += 1
+            slots = visible + [None] * (MAX_VISIBLE_USERS - len(visible))
+            for i, entry in enumerate(slots):
+                # The last card sits under the footer text, so it is redrawn with it
+                if entry == self._slots[i] and i < MAX_VISIBLE_USERS - 1:
+                    continue
+                y_pos = 40 + i * 45
+                draw.rectangle([5, y_pos, DISPLAY_WIDTH - 5, y_pos + 40], fill=BG_COLOR)
+                if entry:
+                    self.draw_user_status(draw, y_pos, entry[0], {'last_time': entry[1]})
+            self._slots = slots
             
             # Show total if more users exist
-            if len(user_status) > max_users:
-                remaining = len(user_status) - max_users
+            if remaining > 0:
                 draw.text((10, DISPLAY_HEIGHT - 15), 
                          f"+{remaining} more", font=self.font_small, fill=(150, 150, 150))
         
         # Display update time
         update_time = datetime.now().strftime("%H:%M:%S")
-        draw.text((DISPLAY_WIDTH - 60, DISPLAY_HEIGHT - 15), 
-                 update_time, font=self.font_small, fill=(100, 100, 100))
+        self.blit_str(draw, DISPLAY_WIDTH - 60, DISPLAY_HEIGHT - 15, update_time,
+                      self._footer_atlas, self.font_small, (100, 100, 100))
         
         # Update display
-        self.display.display(img)
+        self._push_frame(self._img)
+    
+    def _run_on_changes(self):
+        """Redraw when the attendance database changes, and once a minute for the clock"""
+        db_dir = os.path.dirname(os.path.abspath(self.tracker.db_file))
+        db_name = os.path.basename(self.tracker.db_file)
+        watched = {db_name, db_name + '-wal'}
+        
+        inotify = INotify()
+        inotify.add_watch(db_dir, flags.MODIFY | flags.CLOSE_WRITE | flags.CREATE | flags.MOVED_TO)
+        print("Waiting for attendance changes (inotify)")
+        
+        self.update_display()
+        while True:
+            # Wake at the next minute boundary even if nothing changes
+            timeout_ms = (60 - datetime.now().second) * 1000
+            events = inotify.read(timeout=timeout_ms, read_delay=100)
+            if events and not any(event.name in watched for event in events):
+                continue
+            self.update_display()
     
     def run(self, update_interval=2):
         """Run display loop"""
@@ -147,9 +259,12 @@ class AttendanceDisplay:
         print("Press Ctrl+C to stop\n")
         
         try:
-            while True:
-                self.update_display()
-                time.sleep(update_interval)
+            if INOTIFY_AVAILABLE:
+                self._run_on_changes()
+            else:
+                while True:
+                    self.update_display()
+                    time.sleep(update_interval)
                 
         except KeyboardInterrupt:
             print("\n\nStopping display...")
@@ -159,8 +274,13 @@ class AttendanceDisplay:
             draw = ImageDraw.Draw(img)
             draw.text((DISPLAY_WIDTH // 2 - 50, DISPLAY_HEIGHT // 2 - 10), 
                      "Display Off", font=self.font_title, fill=TEXT_COLOR)
-            self.display.display(img)
+            self._push_frame(img)
+            
+            # Let the worker finish sending before exiting
+            self._frame_queue.put(None)
+            self._spi_thread.join(timeout=2.0)
             
+            self.tracker.close()
             print("✓ Display stopped")
 
 
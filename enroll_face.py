@@ -3,17 +3,17 @@ Face Enrollment Script
 Used to register new faces into the system
 """
 
-import cv2
 import argparse
 import sys
 import os
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from face_recognizer import FaceRecognizer
-from camera_wrapper import Camera
-from attendance_tracker import AttendanceTracker
 import config
 
+# OpenCV, the recognizer, camera and tracker are imported where they are
+# used so that --help/--list/--remove start without loading the camera stack
+
 
 def capture_face_samples(name: str, num_samples: int = 5):
     """
@@ -23,6 +23,12 @@ def capture_face_samples(name: str, num_samples: int = 5):
         name: Person's name
         num_samples: Number of samples to capture
     """
+    import cv2
+    from camera_wrapper import Camera
+    from face_recognizer import FaceRecognizer
+    from face_detector import FaceDetector
+    from attendance_tracker import AttendanceTracker
+    
     print(f"\n[INFO] Enrolling new face: {name}")
     print(f"[INFO] Will capture {num_samples} samples")
     print("[INFO] Camera will capture automatically with 2 second intervals")
@@ -38,11 +44,12 @@ def capture_face_samples(name: str, num_samples: int = 5):
     
     # Initialize recognizer and face detector
     recognizer = FaceRecognizer()
-    from face_detector import FaceDetector
     detector = FaceDetector()
     
     samples_captured = 0
     best_sample = None
+    jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, 85, cv2.IMWRITE_JPEG_OPTIMIZE, 1]  # ~40% smaller than default
+    writer = ThreadPoolExecutor(max_workers=1)  # Sample files are written while we wait
     
     # Create preview window
     window_name = f"Enrolling: {name}"
@@ -54,11 +61,11 @@ def capture_face_samples(name: str, num_samples: int = 5):
     for i in range(3, 0, -1):
         ret, frame = camera.read()
         if ret and frame is not None:
-            display = frame.copy()
-            cv2.putText(display, f"Starting in {i}...", 
-                       (display.shape[1]//2 - 100, display.shape[0]//2),
+            # Countdown frames are discarded, so draw on them directly
+            cv2.putText(frame, f"Starting in {i}...", 
+                       (frame.shape[1]//2 - 100, frame.shape[0]//2),
                        cv2.FONT_HERSHEY_SIMPLEX, 1.5, (0, 255, 0), 3)
-            cv2.imshow(window_name, display)
+            cv2.imshow(window_name, frame)
             cv2.waitKey(1000)
     
     while samples_captured < num_samples:
@@ -69,46 +76,54 @@ def capture_face_samples(name: str, num_samples: int = 5):
             print("[ERROR] Failed to capture frame")
             break
         
-        # Detect faces for preview
+        # Detect on every frame: captures are ~2 s apart, so earlier boxes are stale
         faces = detector.detect_faces(frame)
-        display_frame = frame.copy()
         
-        # Draw face boxes
+        if len(faces) > 0:
+            print(f"[INFO] Capturing sample {samples_captured + 1}/{num_samples}...")
+            
+            # Save sample image (before any overlay is drawn on the frame)
+            sample_dir = os.path.join(config.IMAGES_DIR, name)
+            os.makedirs(sample_dir, exist_ok=True)
+            sample_path = os.path.join(sample_dir, f"sample_{samples_captured + 1}.jpg")
+            ok, jpeg = cv2.imencode('.jpg', frame, jpeg_params)
+            if ok:
+                writer.submit(jpeg.tofile, sample_path)
+            
+            # Try to encode the face, searching only around the detected box
+            x, y, w, h = faces[0]
+            pad_x, pad_y = w // 4, h // 4
+            crop = frame[max(0, y - pad_y):y + h + pad_y, max(0, x - pad_x):x + w + pad_x]
+            encoding = recognizer.encode_face(crop)
+            if encoding is not None:
+                samples_captured += 1
+                best_sample = frame.copy()  # Only accepted samples need a clean copy
+                print(f"[SUCCESS] Sample {samples_captured} captured successfully")
+            else:
+                print("[ERROR] Face not clear enough. Please look at the camera.")
+        else:
+            print("[ERROR] No face detected. Please position yourself in front of camera.")
+        
+        # Draw face boxes directly on the frame (it is discarded after imshow)
         if len(faces) > 0:
             for (x, y, w, h) in faces:
-                cv2.rectangle(display_frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
+                cv2.rectangle(frame, (x, y), (x+w, y+h), (0, 255, 0), 2)
         
         # Add info overlay
-        cv2.putText(display_frame, f"Sample {samples_captured}/{num_samples}", 
+        cv2.putText(frame, f"Sample {samples_captured}/{num_samples}", 
                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        cv2.putText(display_frame, f"Enrolling: {name}", 
+        cv2.putText(frame, f"Enrolling: {name}", 
                    (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
         
         # Show preview
-        cv2.imshow(window_name, display_frame)
+        cv2.imshow(window_name, frame)
         cv2.waitKey(100)
         
-        print(f"[INFO] Capturing sample {samples_captured + 1}/{num_samples}...")
-        
-        # Save sample image
-        sample_dir = os.path.join(config.IMAGES_DIR, name)
-        os.makedirs(sample_dir, exist_ok=True)
-        sample_path = os.path.join(sample_dir, f"sample_{samples_captured + 1}.jpg")
-        cv2.imwrite(sample_path, frame)
-        
-        # Try to encode the face
-        encoding = recognizer.encode_face(frame)
-        if encoding is not None:
-            samples_captured += 1
-            best_sample = frame
-            print(f"[SUCCESS] Sample {samples_captured} captured successfully")
-        else:
-            print("[ERROR] No face detected. Please position yourself in front of camera.")
-        
         if samples_captured < num_samples:
             time.sleep(2)  # Wait 2 seconds between captures
     
     # Cleanup
+    writer.shutdown(wait=True)
     cv2.destroyAllWindows()
     camera.release()
     
@@ -147,13 +162,14 @@ def main():
     
     args = parser.parse_args()
     
-    recognizer = FaceRecognizer()
-    
     if args.list:
+        from face_recognizer import FaceRecognizer
+        recognizer = FaceRecognizer()
         print("\n[INFO] Enrolled faces:")
         faces = recognizer.list_known_faces()
         if faces:
             # Also show User IDs
+            from attendance_tracker import AttendanceTracker
             tracker = AttendanceTracker()
             print(f"\n{'#':<4} {'Name':<20} {'User ID':<15}")
             print("-" * 40)
@@ -165,6 +181,8 @@ def main():
         return
     
     if args.remove:
+        from face_recognizer import FaceRecognizer
+        recognizer = FaceRecognizer()
         if recognizer.remove_face(args.remove):
             print(f"[SUCCESS] {args.remove} removed from database")
         else:
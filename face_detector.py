@@ -11,26 +11,47 @@ import time
 from typing import List, Tuple
 import config
 
+HAAR_CASCADE_FILE = 'haarcascade_frontalface_default.xml'
+
+
+def find_cascade_file(filename: str):
+    """
+    Look for a cascade XML in the OpenCV data directories and next to this module
+    
+    Args:
+        filename: Cascade file name (e.g. 'lbpcascade_frontalface_improved.xml')
+        
+    Returns:
+        Path to the file, or None if not found
+    """
+    subdir = 'lbpcascades' if filename.startswith('lbp') else 'haarcascades'
+    search_dirs = []
+    if hasattr(cv2, 'data'):
+        search_dirs.append(cv2.data.haarcascades)
+        search_dirs.append(os.path.join(os.path.dirname(os.path.normpath(cv2.data.haarcascades)), subdir))
+    search_dirs += [
+        f'/usr/share/opencv4/{subdir}',
+        f'/usr/local/share/opencv4/{subdir}',
+        os.path.dirname(os.path.abspath(__file__)),
+    ]
+    
+    for directory in search_dirs:
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            return path
+    return None
+
 
 class FaceDetector:
-    """Face detector using OpenCV Haar Cascades"""
+    """Face detector using OpenCV cascade classifiers (LBP or Haar)"""
     
     def __init__(self):
         """Initialize the face detector"""
-        # Load the pre-trained Haar Cascade classifier
-        # Try multiple possible locations for the cascade file
-        cascade_paths = [
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml' if hasattr(cv2, 'data') else None,
-            '/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml',
-            '/usr/local/share/opencv4/haarcascades/haarcascade_frontalface_default.xml',
-            os.path.join(os.path.dirname(__file__), 'haarcascade_frontalface_default.xml'),
-        ]
-        
-        cascade_path = None
-        for path in cascade_paths:
-            if path and os.path.exists(path):
-                cascade_path = path
-                break
+        # Load the configured cascade (LBP by default), falling back to Haar
+        cascade_path = find_cascade_file(config.CASCADE_FILE)
+        if not cascade_path and config.CASCADE_FILE != HAAR_CASCADE_FILE:
+            print(f"[INFO] {config.CASCADE_FILE} not found, using Haar cascade")
+            cascade_path = find_cascade_file(HAAR_CASCADE_FILE)
         
         if not cascade_path:
             # Download if not found
@@ -42,50 +63,174 @@ class FaceDetector:
         
         self.face_cascade = cv2.CascadeClassifier(cascade_path)
         
+        # The cascade runs on a downscaled frame, so scale the minimum face size with it
+        self._frame_width = None
+        self._buffers = {}
+        self._set_frame_width(config.CAMERA_WIDTH)
+        
         if self.face_cascade.empty():
             raise RuntimeError("Failed to load face cascade classifier")
         
-        print("[INFO] Face detector initialized")
+        # Run the cascade on the GPU when OpenCV has CUDA and a device is present
+        self.gpu_cascade = self._create_gpu_cascade(cascade_path)
+        
+        # Otherwise let OpenCV's transparent API run resize/cvtColor/cascade on OpenCL
+        self.use_opencl = (self.gpu_cascade is None and config.USE_OPENCL
+                           and cv2.ocl.haveOpenCL())
+        if self.use_opencl:
+            cv2.ocl.setUseOpenCL(True)
+        
+        if self.gpu_cascade is not None:
+            print("[INFO] Face detector initialized (CUDA)")
+        elif self.use_opencl:
+            print("[INFO] Face detector initialized (OpenCL)")
+        else:
+            print("[INFO] Face detector initialized")
+    
+    def _set_frame_width(self, width: int):
+        """Pick the detection scale (and scaled minimum face size) for frames of this width"""
+        if width == self._frame_width:
+            return
+        self._frame_width = width
+        
+        self.scale = config.DETECT_SCALE
+        if config.DETECT_MAX_WIDTH:
+            self.scale = min(self.scale, config.DETECT_MAX_WIDTH / width)
+        self.min_size = tuple(max(1, int(round(v * self.scale))) for v in config.DETECTION_MIN_SIZE)
+        
+        if getattr(self, 'gpu_cascade', None) is not None:
+            self.gpu_cascade.setMinObjectSize(self.min_size)
     
-    def detect_faces(self, frame: np.ndarray) -> List[Tuple[int, int, int, int]]:
+    def _buffer(self, name: str, shape: tuple) -> np.ndarray:
+        """Working image reused across frames, reallocated only when the shape changes"""
+        buf = self._buffers.get(name)
+        if buf is None or buf.shape != shape:
+            buf = np.empty(shape, dtype=np.uint8)
+            self._buffers[name] = buf
+        return buf
+    
+    def _create_gpu_cascade(self, cascade_path: str):
+        """Create a CUDA cascade classifier, or return None to stay on the CPU"""
+        try:
+            if not hasattr(cv2, 'cuda') or cv2.cuda.getCudaEnabledDeviceCount() == 0:
+                return None
+        except cv2.error:
+            return None
+        
+        # cuda::CascadeClassifier needs the old-format Haar XML from haarcascades_cuda
+        gpu_paths = [
+            os.path.join(os.path.dirname(os.path.dirname(cv2.data.haarcascades)), 'haarcascades_cuda',
+                         os.path.basename(cascade_path)) if hasattr(cv2, 'data') else None,
+            cascade_path,
+        ]
+        for path in gpu_paths:
+            if not path or not os.path.exists(path):
+                continue
+            try:
+                gpu_cascade = cv2.cuda_CascadeClassifier.create(path)
+            except cv2.error:
+                continue
+            gpu_cascade.setScaleFactor(config.DETECTION_SCALE_FACTOR)
+            gpu_cascade.setMinNeighbors(config.DETECTION_MIN_NEIGHBORS)
+            gpu_cascade.setMinObjectSize(self.min_size)
+            self._gpu_frame = cv2.cuda_GpuMat()
+            return gpu_cascade
+        
+        print("[WARNING] CUDA available but no usable GPU cascade, using CPU")
+        return None
+    
+    def detect_faces(self, frame: np.ndarray) -> np.ndarray:
         """
         Detect faces in a frame
         
         Args:
-            frame: Input image/frame
+            frame: Input image/frame (BGR, or grayscale to skip the conversion)
             
         Returns:
-            List of face bounding boxes as (x, y, w, h) tuples
+            (N, 4) int32 array of face bounding boxes as (x, y, w, h) rows
         """
-        # Convert to grayscale for better detection
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        is_gray = frame.ndim == 2
+        self._set_frame_width(frame.shape[1])
+        height, width = frame.shape[:2]
+        if self.use_opencl:
+            # UMat keeps the intermediate images on the OpenCL device
+            frame = cv2.UMat(frame)
         
-        # Detect faces
-        faces = self.face_cascade.detectMultiScale(
-            gray,
-            scaleFactor=config.DETECTION_SCALE_FACTOR,
-            minNeighbors=config.DETECTION_MIN_NEIGHBORS,
-            minSize=config.DETECTION_MIN_SIZE
-        )
+        # Fewer pixels means fewer classifier evaluations; boxes are mapped back below
+        if self.scale != 1.0:
+            size = (int(round(width * self.scale)), int(round(height * self.scale)))
+            # Resize into a reused buffer (UMat frames stay on the device instead)
+            dst = None if self.use_opencl else self._buffer('small', (size[1], size[0]) + frame.shape[2:])
+            small = cv2.resize(frame, size, dst=dst, interpolation=cv2.INTER_LINEAR)
+        else:
+            small = frame
         
-        return faces
+        if self.gpu_cascade is not None:
+            # Upload once, convert and scan on the GPU, download only the boxes
+            self._gpu_frame.upload(small)
+            if is_gray:
+                gpu_gray = self._gpu_frame
+            else:
+                gpu_gray = cv2.cuda.cvtColor(self._gpu_frame, cv2.COLOR_BGR2GRAY)
+            gpu_faces = self.gpu_cascade.detectMultiScale(gpu_gray)
+            faces = self.gpu_cascade.convert(gpu_faces)
+        else:
+            # Convert to grayscale for better detection
+            if is_gray:
+                gray = small
+            elif self.use_opencl:
+                gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+            else:
+                gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY,
+                                    dst=self._buffer('gray', small.shape[:2]))
+            
+            # Detect faces
+            faces = self.face_cascade.detectMultiScale(
+                gray,
+                scaleFactor=config.DETECTION_SCALE_FACTOR,
+                minNeighbors=config.DETECTION_MIN_NEIGHBORS,
+                minSize=self.min_size
+            )
+        
+        faces = np.array(faces, dtype=np.float32).reshape(-1, 4)
+        if self.scale != 1.0:
+            faces /= self.scale
+        
+        # Boxes are in full-resolution coordinates
+        return np.rint(faces).astype(np.int32)
     
-    def draw_faces(self, frame: np.ndarray, faces: List[Tuple[int, int, int, int]], 
-                   labels: List[str] = None) -> np.ndarray:
+    def detect_faces_gray(self, gray_frame: np.ndarray) -> np.ndarray:
+        """
+        Detect faces in a precomputed grayscale frame
+        
+        Args:
+            gray_frame: Grayscale image/frame (shared with FaceRecognizer.recognize_faces_gray)
+            
+        Returns:
+            (N, 4) int32 array of face bounding boxes as (x, y, w, h) rows
+        """
+        return self.detect_faces(gray_frame)
+    
+    def draw_faces(self, frame: np.ndarray, faces: np.ndarray, 
+                   labels: List[str] = None, inplace: bool = False) -> np.ndarray:
         """
         Draw bounding boxes around detected faces
         
         Args:
             frame: Input image/frame
-            faces: List of face bounding boxes
+            faces: (N, 4) array (or list) of face bounding boxes
             labels: Optional labels for each face
+            inplace: Draw on frame itself instead of a copy
             
         Returns:
             Frame with drawn bounding boxes
         """
-        output = frame.copy()
+        output = frame if inplace else frame.copy()
+        
+        # One C-level conversion to plain ints for the cv2 drawing calls
+        boxes = np.asarray(faces, dtype=np.int32).reshape(-1, 4).tolist()
         
-        for i, (x, y, w, h) in enumerate(faces):
+        for i, (x, y, w, h) in enumerate(boxes):
             # Draw rectangle
             cv2.rectangle(output, (x, y), (x + w, y + h), (0, 255, 0), 2)
             
@@ -119,6 +264,77 @@ class FaceDetector:
         return frame[y:y+h, x:x+w]
 
 
+class FaceTracker:
+    """Moves face boxes between detections with sparse optical flow (Lucas-Kanade)"""
+    
+    def __init__(self, max_corners: int = 20):
+        """
+        Initialize the tracker
+        
+        Args:
+            max_corners: Corner points tracked per face
+        """
+        self.max_corners = max_corners
+        self.prev_gray = None
+        self.tracked = []  # [(box as float32 [x, y, w, h], points (K, 1, 2) float32)]
+    
+    def reset(self, gray: np.ndarray, faces: np.ndarray):
+        """
+        Start tracking freshly detected faces
+        
+        Args:
+            gray: Grayscale frame the faces were detected in
+            faces: Face bounding boxes
+        """
+        self.prev_gray = gray
+        self.tracked = []
+        
+        for (x, y, w, h) in faces:
+            points = cv2.goodFeaturesToTrack(gray[y:y+h, x:x+w], self.max_corners, 0.01, 5)
+            if points is None:
+                points = np.empty((0, 1, 2), dtype=np.float32)
+            else:
+                points += np.array([x, y], dtype=np.float32)
+            self.tracked.append((np.array([x, y, w, h], dtype=np.float32), points))
+    
+    def update(self, gray: np.ndarray) -> np.ndarray:
+        """
+        Move every tracked box by the median flow of its points
+        
+        Args:
+            gray: Current grayscale frame
+            
+        Returns:
+            Face bounding boxes (x, y, w, h) in the same order as passed to reset()
+        """
+        if not self.tracked:
+            return np.empty((0, 4), dtype=np.int32)
+        
+        counts = [len(points) for _, points in self.tracked]
+        if sum(counts) > 0 and self.prev_gray is not None:
+            # One pyramid LK call for all faces
+            prev_points = np.concatenate([points for _, points in self.tracked])
+            next_points, status, _ = cv2.calcOpticalFlowPyrLK(self.prev_gray, gray, prev_points, None)
+            status = status.ravel().astype(bool)
+            
+            tracked = []
+            start = 0
+            for (box, _), count in zip(self.tracked, counts):
+                end = start + count
+                good = status[start:end]
+                if good.any():
+                    flow = next_points[start:end][good] - prev_points[start:end][good]
+                    box = box.copy()
+                    box[:2] += np.median(flow.reshape(-1, 2), axis=0)
+                # Boxes that lost all their points stay where they were until the next detection
+                tracked.append((box, next_points[start:end][good].reshape(-1, 1, 2)))
+                start = end
+            self.tracked = tracked
+        
+        self.prev_gray = gray
+        return np.rint(np.array([box for box, _ in self.tracked])).astype(np.int32)
+
+
 if __name__ == "__main__":
     """Test the face detector"""
     print("[INFO] Testing face detector...")
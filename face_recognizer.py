@@ -5,25 +5,118 @@ Handles face encoding and recognition using OpenCV
 
 import cv2
 import numpy as np
-import pickle
+import json
 import os
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Tuple, Optional
 import config
 
+# Numba compiles the LBP histogram to native code (optional)
+try:
+    from lbp_numba import compute_lbp, block_hist
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# LBPH parameters (OpenCV defaults used by LBPHFaceRecognizer_create())
+LBPH_GRID = 8
+LBPH_FACE_SIZE = 200
+_LBP_SIZE = LBPH_FACE_SIZE - 2  # radius 1 trims one pixel on each side
+_LBP_CELL = _LBP_SIZE // LBPH_GRID
+
+
+def _lbp_sample_points():
+    """Bilinear sampling offsets/weights for the 8 neighbours at radius 1, as in OpenCV's elbp()"""
+    points = []
+    for n in range(8):
+        x = -np.sin(2.0 * np.pi * n / 8)
+        y = np.cos(2.0 * np.pi * n / 8)
+        fx, fy = int(np.floor(x)), int(np.floor(y))
+        cx, cy = int(np.ceil(x)), int(np.ceil(y))
+        tx, ty = np.float32(x - fx), np.float32(y - fy)
+        weights = ((1 - tx) * (1 - ty), tx * (1 - ty), (1 - tx) * ty, tx * ty)
+        points.append(((fy, fx), (fy, cx), (cy, fx), (cy, cx), weights))
+    return points
+
+
+_LBP_POINTS = _lbp_sample_points()
+_LBP_OFFSETS = np.array([p[:4] for p in _LBP_POINTS], dtype=np.int64)
+_LBP_WEIGHTS = np.array([p[4] for p in _LBP_POINTS], dtype=np.float32)
+
+# Spatial cell index of every LBP code that falls inside the 8x8 grid
+_LBP_CELL_IDS = (np.arange(LBPH_GRID).repeat(_LBP_CELL)[:, None] * LBPH_GRID
+                 + np.arange(LBPH_GRID).repeat(_LBP_CELL)[None, :]) * 256
+
+
+def lbph_histogram(face_roi: np.ndarray) -> np.ndarray:
+    """
+    Compute the spatial LBP histogram of a 200x200 face the same way cv2.face.LBPH does
+    
+    Args:
+        face_roi: Grayscale face image (LBPH_FACE_SIZE x LBPH_FACE_SIZE, uint8)
+        
+    Returns:
+        Concatenated per-cell histograms (float32, 256 * LBPH_GRID^2), each cell normalized
+    """
+    if NUMBA_AVAILABLE and config.USE_NUMBA:
+        return block_hist(compute_lbp(face_roi, _LBP_OFFSETS, _LBP_WEIGHTS), LBPH_GRID)
+    
+    src = face_roi.astype(np.float32)
+    center = src[1:-1, 1:-1]
+    codes = np.zeros(center.shape, dtype=np.int32)
+    
+    for n, (p1, p2, p3, p4, weights) in enumerate(_LBP_POINTS):
+        t = np.zeros(center.shape, dtype=np.float32)
+        for (dy, dx), w in zip((p1, p2, p3, p4), weights):
+            if w:
+                t += w * src[1 + dy:1 + dy + _LBP_SIZE, 1 + dx:1 + dx + _LBP_SIZE]
+        codes |= ((t > center) | (np.abs(t - center) < np.finfo(np.float32).eps)).astype(np.int32) << n
+    
+    cells = codes[:_LBP_CELL * LBPH_GRID, :_LBP_CELL * LBPH_GRID]
+    hist = np.bincount((_LBP_CELL_IDS + cells).ravel(), minlength=256 * LBPH_GRID * LBPH_GRID)
+    return hist.astype(np.float32) / (_LBP_CELL * _LBP_CELL)
+
 
 class FaceRecognizer:
     """Face recognizer using OpenCV LBPH (Local Binary Patterns Histograms)"""
     
     def __init__(self):
         """Initialize the face recognizer"""
-        self.known_face_encodings = []
+        # All 200x200 face samples in one contiguous (N, 200, 200) uint8 array
+        self.known_face_encodings = np.empty((0, LBPH_FACE_SIZE, LBPH_FACE_SIZE), dtype=np.uint8)
+        self.known_face_labels = np.empty(0, dtype=np.int32)  # Index into known_face_names for each encoding
         self.known_face_names = []
         self.known_names = []  # Alias for compatibility
-        self.encodings_file = os.path.join(config.FACES_DIR, 'encodings.pkl')
+        self.encodings_file = os.path.join(config.FACES_DIR, 'encodings.json')  # Names, labels, image mtimes
+        self.templates_file = os.path.join(config.FACES_DIR, 'templates.npy')  # (N, 200, 200) face samples
+        self.model_file = os.path.join(config.FACES_DIR, 'lbph.yml')
         
         # Initialize OpenCV face recognizer
         self.recognizer = cv2.face.LBPHFaceRecognizer_create()
         
+        # Per-thread 200x200 buffer reused for every face passed to predict()
+        self._local = threading.local()
+        
+        # Recognition holds _model_lock while it reads the model; train/add/remove build the new
+        # model aside and only swap it in under that lock. _train_lock serializes the writers
+        # (taken before _model_lock), _cascade_lock the cascade, which is not thread-safe
+        self._model_lock = threading.Lock()
+        self._train_lock = threading.Lock()
+        self._cascade_lock = threading.Lock()
+        
+        # Faces in one frame are resized and matched in parallel (OpenCV releases the GIL)
+        self.pool = ThreadPoolExecutor(max_workers=config.CPU_THREADS)
+        
+        # Trained histograms for the NumPy matching path (None = use LBPH predict())
+        self.gallery_hists = None
+        self.gallery_labels = None
+        
+        # Compile (or load from Numba's cache) before the first frame needs it
+        if NUMBA_AVAILABLE and config.USE_NUMBA:
+            lbph_histogram(self._roi_buffer())
+        
         # Find cascade file
         cascade_path = self._find_cascade_file()
         self.face_cascade = cv2.CascadeClassifier(cascade_path)
@@ -34,25 +127,20 @@ class FaceRecognizer:
         print(f"[INFO] Face recognizer initialized with {len(self.known_face_names)} known face(s)")
     
     def _find_cascade_file(self):
-        """Find the haarcascade file in various locations"""
-        cascade_paths = [
-            cv2.data.haarcascades + 'haarcascade_frontalface_default.xml' if hasattr(cv2, 'data') else None,
-            '/usr/share/opencv4/haarcascades/haarcascade_frontalface_default.xml',
-            '/usr/local/share/opencv4/haarcascades/haarcascade_frontalface_default.xml',
-            'haarcascade_frontalface_default.xml',
-        ]
-        
-        for path in cascade_paths:
-            if path and os.path.exists(path):
-                return path
+        """Find the configured cascade file (LBP by default, Haar as fallback)"""
+        from face_detector import find_cascade_file, HAAR_CASCADE_FILE
+        
+        path = find_cascade_file(config.CASCADE_FILE) or find_cascade_file(HAAR_CASCADE_FILE)
         
         # If not found, use the one we downloaded
-        return 'haarcascade_frontalface_default.xml'
+        return path or HAAR_CASCADE_FILE
     
     def load_encodings(self):
-        """Load face encodings from file and retrain"""
-        # Instead of loading pickled data, just retrain from images
-        # This is more reliable
+        """Load the cached model, or retrain from images if they changed since it was saved"""
+        if self._load_cached_model():
+            print(f"[INFO] Loaded trained model for {len(self.known_face_names)} users from cache")
+            return
+        
         if os.path.exists(config.IMAGES_DIR):
             user_dirs = [d for d in os.listdir(config.IMAGES_DIR) 
                         if os.path.isdir(os.path.join(config.IMAGES_DIR, d))]
@@ -64,22 +152,76 @@ class FaceRecognizer:
         else:
             print(f"[WARNING] Images directory not found: {config.IMAGES_DIR}")
     
+    def _image_mtimes(self) -> dict:
+        """Modification times of all enrollment images, used to validate the cached model"""
+        mtimes = {}
+        if not os.path.exists(config.IMAGES_DIR):
+            return mtimes
+        
+        for user_name in os.listdir(config.IMAGES_DIR):
+            user_path = os.path.join(config.IMAGES_DIR, user_name)
+            if not os.path.isdir(user_path):
+                continue
+            for img_file in os.listdir(user_path):
+                if img_file.lower().endswith(('.jpg', '.jpeg', '.png')):
+                    img_path = os.path.join(user_path, img_file)
+                    mtimes[os.path.join(user_name, img_file)] = os.stat(img_path).st_mtime_ns
+        return mtimes
+    
+    def _load_cached_model(self) -> bool:
+        """
+        Load the saved LBPH model if no enrollment image was added, removed or modified since
+        
+        Returns:
+            True if the cache was used, False if a retrain is needed
+        """
+        cache_files = (self.encodings_file, self.templates_file, self.model_file)
+        if not all(os.path.exists(path) for path in cache_files):
+            return False
+        
+        try:
+            with open(self.encodings_file, 'r') as f:
+                data = json.load(f)
+            
+            if data.get('mtimes') != self._image_mtimes() or not data.get('names'):
+                return False
+            
+            # Memory-mapped: pages are read on demand, nothing is copied up front
+            templates = np.load(self.templates_file, mmap_mode='r')
+            self.recognizer.read(self.model_file)
+        except Exception as e:
+            print(f"[WARNING] Failed to load cached model: {e}")
+            return False
+        
+        # Samples are kept so add_face/remove_face can still retrain without the images
+        self.known_face_encodings = templates
+        self.known_face_labels = np.asarray(data['labels'], dtype=np.int32)
+        self.known_face_names = data['names']
+        self.known_names = self.known_face_names  # Sync alias
+        self._refresh_gallery()
+        return True
+    
     def save_encodings(self):
-        """Save face encodings to file"""
+        """Save face encodings and the trained model to file"""
         try:
-            # Build labels array: each encoding gets the index of its name
-            labels = []
-            for i, encoding in enumerate(self.known_face_encodings):
-                # Find which user this encoding belongs to based on saved order
-                # This is tricky, so let's not save/load trained model, just retrain
-                pass
+            # Write to a temp file and rename, since the old file may still be memory-mapped
+            tmp_file = self.templates_file + '.tmp'
+            with open(tmp_file, 'wb') as f:
+                np.save(f, np.ascontiguousarray(self.known_face_encodings))
+            os.replace(tmp_file, self.templates_file)
             
             data = {
-                'encodings': self.known_face_encodings,
-                'names': self.known_face_names
+                'labels': self.known_face_labels.tolist(),
+                'names': self.known_face_names,
+                'mtimes': self._image_mtimes()
             }
-            with open(self.encodings_file, 'wb') as f:
-                pickle.dump(data, f)
+            with open(self.encodings_file, 'w') as f:
+                json.dump(data, f)
+            
+            if len(self.known_face_encodings) > 0:
+                self.recognizer.write(self.model_file)
+            elif os.path.exists(self.model_file):
+                os.remove(self.model_file)
             print(f"[INFO] Saved {len(self.known_face_encodings)} encodings for {len(self.known_face_names)} users")
         except Exception as e:
             print(f"[ERROR] Failed to save encodings: {e}")
@@ -98,7 +240,8 @@ class FaceRecognizer:
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
         # Detect face locations
-        faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        with self._cascade_lock:
+            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
         
         if len(faces) == 0:
             print("[WARNING] No face detected in image")
@@ -132,31 +275,39 @@ class FaceRecognizer:
         if encoding is None:
             return False
         
-        # Check if name already exists
-        if name in self.known_face_names:
-            print(f"[WARNING] {name} already exists. Updating encoding.")
-            idx = self.known_face_names.index(name)
-            self.known_face_encodings[idx] = encoding
-        else:
-            self.known_face_encodings.append(encoding)
-            self.known_face_names.append(name)
-        
-        # Retrain the recognizer
-        if len(self.known_face_encodings) > 0:
-            labels = list(range(len(self.known_face_names)))
-            self.recognizer.train(self.known_face_encodings, np.array(labels))
-        
-        self.save_encodings()
+        with self._train_lock:
+            # Check if name already exists
+            if name in self.known_face_names:
+                print(f"[WARNING] {name} already exists. Updating encoding.")
+                label = self.known_face_names.index(name)
+                
+                # Replace this user's encodings; LBPH cannot forget samples, so retrain from scratch
+                keep = self.known_face_labels != label
+                encodings = np.concatenate((self.known_face_encodings[keep], encoding[np.newaxis]))
+                labels = np.append(self.known_face_labels[keep], np.int32(label))
+                recognizer = cv2.face.LBPHFaceRecognizer_create()
+                recognizer.train(list(encodings), labels)
+                self._publish_model(encodings, labels, list(self.known_face_names), recognizer)
+            else:
+                label = len(self.known_face_names)
+                encodings = np.concatenate((self.known_face_encodings, encoding[np.newaxis]))
+                labels = np.append(self.known_face_labels, np.int32(label))
+                
+                # Add only the new sample to the existing histograms
+                self._publish_model(encodings, labels, self.known_face_names + [name],
+                                    self.recognizer, new_sample=encoding)
+            
+            self.save_encodings()
         print(f"[INFO] Added/updated face for {name}")
         return True
     
-    def recognize_faces(self, image: np.ndarray, face_locations: List[Tuple[int, int, int, int]] = None) -> List[str]:
+    def recognize_faces(self, image: np.ndarray, face_locations: np.ndarray = None) -> List[str]:
         """
         Recognize faces in an image
         
         Args:
             image: Input image (BGR format)
-            face_locations: Optional list of face locations (x, y, w, h)
+            face_locations: Optional (N, 4) array of face locations (x, y, w, h)
             
         Returns:
             List of names for each detected face
@@ -164,49 +315,178 @@ class FaceRecognizer:
         if len(self.known_face_encodings) == 0:
             return []
         
+        # With known boxes only the face pixels need converting
+        if face_locations is not None and len(face_locations) > 0:
+            return self.recognize_rois([image[y:y+h, x:x+w] for (x, y, w, h) in face_locations])
+        
         # Convert to grayscale
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
-        results = []
+        return self.recognize_faces_gray(gray, face_locations)
+    
+    def recognize_rois(self, rois: List[np.ndarray]) -> List[str]:
+        """
+        Recognize pre-cropped faces
+        
+        Args:
+            rois: Face crops (BGR or grayscale, any size)
+            
+        Returns:
+            List of names for each crop
+        """
+        # Held for the whole batch, so every face is matched against one consistent model
+        with self._model_lock:
+            if len(self.known_face_encodings) == 0:
+                return []
+            
+            if len(rois) > 1:
+                return list(self.pool.map(self._recognize_roi, rois))
+            return [self._recognize_roi(roi) for roi in rois]
+    
+    def recognize_faces_gray(self, gray: np.ndarray,
+                             face_locations: np.ndarray = None) -> List[str]:
+        """
+        Recognize faces in a precomputed grayscale image
+        
+        Args:
+            gray: Grayscale image (shared with FaceDetector.detect_faces_gray)
+            face_locations: Optional (N, 4) array of face locations (x, y, w, h)
+            
+        Returns:
+            List of names for each detected face
+        """
+        if len(self.known_face_encodings) == 0:
+            return []
         
         # If face locations provided, use them; otherwise detect faces
         if face_locations is not None and len(face_locations) > 0:
             # Use provided face locations (x, y, w, h format)
-            for (x, y, w, h) in face_locations:
-                
-                face_roi = gray[y:y+h, x:x+w]
-                face_roi = cv2.resize(face_roi, (200, 200))
-                
-                # Predict the face
-                label, confidence = self.recognizer.predict(face_roi)
-                
-                # LBPH confidence is inverse (lower is better)
-                if confidence < 70:  # Good match threshold
-                    name = self.known_face_names[label]
-                else:
-                    name = "Unknown"
-                
-                results.append(name)
+            faces = face_locations
         else:
             # Detect faces ourselves
-            faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+            with self._cascade_lock:
+                faces = self.face_cascade.detectMultiScale(gray, 1.3, 5)
+        
+        # Slices are views, so cropping copies nothing
+        return self.recognize_rois([gray[y:y+h, x:x+w] for (x, y, w, h) in faces])
+    
+    def _crop_cache_path(self, user_name: str, img_path: str) -> str:
+        """Cache file for an image's face crop; the name changes whenever the image does"""
+        stat = os.stat(img_path)
+        key = f"{os.path.basename(img_path)}:{stat.st_mtime_ns}:{stat.st_size}"
+        digest = hashlib.sha1(key.encode()).hexdigest()[:16]
+        return os.path.join(config.FACES_CACHE_DIR, user_name, f"{digest}.npy")
+    
+    def _roi_buffer(self) -> np.ndarray:
+        """This thread's resize buffer (resize writes into it in place)"""
+        buf = getattr(self._local, 'roi_buf', None)
+        if buf is None:
+            buf = self._local.roi_buf = np.empty((200, 200), dtype=np.uint8)
+        return buf
+    
+    def _chisq_buffers(self, shape: tuple) -> Tuple[np.ndarray, np.ndarray]:
+        """This thread's gallery-sized scratch arrays for _predict (reallocated when the gallery changes)"""
+        bufs = getattr(self._local, 'chisq_bufs', None)
+        if bufs is None or bufs[0].shape != shape:
+            bufs = self._local.chisq_bufs = (np.empty(shape, dtype=np.float32),
+                                             np.empty(shape, dtype=np.float32))
+        return bufs
+    
+    def _recognize_roi(self, roi: np.ndarray) -> str:
+        """
+        Recognize one face crop
+        
+        Args:
+            roi: Face crop (BGR or grayscale)
             
-            for (x, y, w, h) in faces:
-                face_roi = gray[y:y+h, x:x+w]
-                face_roi = cv2.resize(face_roi, (200, 200))
-                
-                # Predict the face
-                label, confidence = self.recognizer.predict(face_roi)
-                
-                # LBPH confidence is inverse (lower is better)
-                if confidence < 70:  # Good match threshold
-                    name = self.known_face_names[label]
-                else:
-                    name = "Unknown"
-                
-                results.append(name)
+        Returns:
+            Name of the person, or "Unknown"
+        """
+        if roi.ndim == 3:
+            roi = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        face_roi = cv2.resize(roi, (200, 200), dst=self._roi_buffer(),
+                              interpolation=cv2.INTER_AREA)
+        
+        # Predict the face
+        label, confidence = self._predict(face_roi)
+        
+        # LBPH confidence is inverse (lower is better)
+        if confidence < 70:  # Good match threshold
+            return self.known_face_names[label]
+        return "Unknown"
+    
+    def _build_gallery(self, encodings: np.ndarray, labels: np.ndarray) -> tuple:
+        """
+        Precompute the sample histograms for the NumPy matching path (small galleries only)
         
-        return results
+        Returns:
+            (gallery_hists, gallery_labels), or (None, None) to use LBPH predict()
+        """
+        # Built from our own samples so gallery and probe histograms are computed the same way.
+        # Stored as float16 (bins are k / cell area, well within its precision): half the bytes
+        # streamed per probe, widened to float32 inside the ufuncs in _predict
+        if 0 < len(encodings) <= config.LBPH_NUMPY_MAX_SAMPLES:
+            return (np.vstack([lbph_histogram(enc) for enc in encodings]).astype(np.float16),
+                    np.asarray(labels))
+        return None, None
+    
+    def _refresh_gallery(self):
+        """Rebuild the NumPy matching gallery from the current samples"""
+        self.gallery_hists, self.gallery_labels = self._build_gallery(self.known_face_encodings,
+                                                                      self.known_face_labels)
+    
+    def _publish_model(self, encodings: np.ndarray, labels: np.ndarray, names: List[str],
+                       recognizer, new_sample: np.ndarray = None):
+        """
+        Swap in a model built aside, so recognition never sees names and labels out of step
+        
+        Args:
+            encodings: (N, 200, 200) face samples
+            labels: Label of each sample (index into names)
+            names: User names
+            recognizer: Trained LBPH recognizer for these samples
+            new_sample: Last sample of encodings, still to be added to recognizer with update()
+        """
+        gallery_hists, gallery_labels = self._build_gallery(encodings, labels)
+        with self._model_lock:
+            if new_sample is not None:
+                # One histogram added to the live model: quick, but it must not overlap predict()
+                recognizer.update([new_sample], labels[-1:])
+            self.known_face_encodings = encodings
+            self.known_face_labels = labels
+            self.known_face_names = names
+            self.known_names = names  # Sync alias
+            self.recognizer = recognizer
+            self.gallery_hists = gallery_hists
+            self.gallery_labels = gallery_labels
+    
+    def _predict(self, face_roi: np.ndarray) -> Tuple[int, float]:
+        """
+        Nearest-neighbour LBPH prediction (equivalent to self.recognizer.predict)
+        
+        Args:
+            face_roi: 200x200 grayscale face
+            
+        Returns:
+            (label, distance) tuple; lower distance is a better match
+        """
+        if self.gallery_hists is None:
+            return self.recognizer.predict(face_roi)
+        
+        # Chi-square distance to every sample at once (HISTCMP_CHISQR_ALT, as LBPH uses),
+        # computed in place so a probe allocates no gallery-sized temporaries
+        gallery = self.gallery_hists
+        probe = lbph_histogram(face_roi)
+        diff, total = self._chisq_buffers(gallery.shape)
+        np.subtract(gallery, probe, out=diff)
+        np.add(gallery, probe, out=total)
+        np.maximum(total, np.finfo(np.float32).eps, out=total)
+        np.multiply(diff, diff, out=diff)
+        np.divide(diff, total, out=diff)
+        dists = 2.0 * diff.sum(axis=1)
+        
+        best = int(np.argmin(dists))
+        return int(self.gallery_labels[best]), float(dists[best])
     
     def remove_face(self, name: str) -> bool:
         """
@@ -218,13 +498,22 @@ class FaceRecognizer:
         Returns:
             True if successful, False otherwise
         """
-        if name in self.known_face_names:
-            idx = self.known_face_names.index(name)
-            del self.known_face_encodings[idx]
-            del self.known_face_names[idx]
-            self.save_encodings()
-            print(f"[INFO] Removed {name} from database")
-            return True
+        with self._train_lock:
+            if name in self.known_face_names:
+                idx = self.known_face_names.index(name)
+                keep = self.known_face_labels != idx
+                encodings = self.known_face_encodings[keep]
+                labels = self.known_face_labels[keep]
+                labels[labels > idx] -= 1  # Later users move down one index
+                names = [n for n in self.known_face_names if n != name]
+                
+                recognizer = cv2.face.LBPHFaceRecognizer_create()
+                if len(encodings) > 0:
+                    recognizer.train(list(encodings), labels)
+                self._publish_model(encodings, labels, names, recognizer)
+                self.save_encodings()
+                print(f"[INFO] Removed {name} from database")
+                return True
         
         print(f"[WARNING] {name} not found in database")
         return False
@@ -242,16 +531,29 @@ class FaceRecognizer:
         """
         Train the recognizer from all images in the images directory
         
+        Safe to call while other threads recognize: the new model is built aside and
+        swapped in at once. Concurrent calls run one after the other
+        
         Returns:
             True if successful, False otherwise
         """
+        with self._train_lock:
+            return self._train()
+    
+    def _clear_model(self):
+        """Forget every user (recognition returns no names until the next training)"""
+        with self._model_lock:
+            self.known_face_encodings = np.empty((0, LBPH_FACE_SIZE, LBPH_FACE_SIZE), dtype=np.uint8)
+            self.known_face_labels = np.empty(0, dtype=np.int32)
+            self.known_face_names = []
+    
+    def _train(self):
+        """train() body; the caller holds _train_lock"""
         print("[INFO] Training face recognizer from images...")
         
-        self.known_face_encodings = []
-        self.known_face_names = []
-        
         if not os.path.exists(config.IMAGES_DIR):
             print(f"[ERROR] Images directory not found: {config.IMAGES_DIR}")
+            self._clear_model()
             return False
         
         # Get all user directories
@@ -260,6 +562,7 @@ class FaceRecognizer:
         
         if len(user_dirs) == 0:
             print("[WARNING] No user directories found")
+            self._clear_model()
             return False
         
         encodings = []
@@ -283,13 +586,23 @@ class FaceRecognizer:
             
             user_label = names.index(user_name)
             
-            # Process each image
+            # Reuse cached face crops; only new or modified images are decoded and detected
+            pending = []
             for img_file in image_files:
                 img_path = os.path.join(user_path, img_file)
-                
+                crop_path = self._crop_cache_path(user_name, img_path)
+                try:
+                    encodings.append(np.load(crop_path))
+                    labels.append(user_label)
+                except (OSError, ValueError):
+                    pending.append((img_path, crop_path))
+            
+            # Decode the images in parallel; the cascade itself is not thread-safe
+            images = self.pool.map(cv2.imread, [img_path for img_path, _ in pending])
+            
+            # Process each image
+            for (img_path, crop_path), image in zip(pending, images):
                 try:
-                    # Read image
-                    image = cv2.imread(img_path)
                     if image is None:
                         print(f"[WARNING] Failed to read {img_path}")
                         continue
@@ -300,22 +613,25 @@ class FaceRecognizer:
                     if encoding is not None:
                         encodings.append(encoding)
                         labels.append(user_label)
+                        os.makedirs(os.path.dirname(crop_path), exist_ok=True)
+                        np.save(crop_path, encoding)
                     
                 except Exception as e:
                     print(f"[ERROR] Failed to process {img_path}: {e}")
         
         if len(encodings) == 0:
             print("[ERROR] No valid face encodings generated")
+            self._clear_model()
             return False
         
-        # Update class variables
-        self.known_face_encodings = encodings
-        self.known_face_names = names
-        self.known_names = names  # Sync alias
+        encodings = np.stack(encodings)
+        labels = np.array(labels, dtype=np.int32)
         
-        # Train the LBPH recognizer
-        self.recognizer = cv2.face.LBPHFaceRecognizer_create()
-        self.recognizer.train(encodings, np.array(labels))
+        # Train a new LBPH recognizer while the current one keeps serving recognition
+        recognizer = cv2.face.LBPHFaceRecognizer_create()
+        # list() only creates views of the rows for the OpenCV API, no copy
+        recognizer.train(list(encodings), labels)
+        self._publish_model(encodings, labels, names, recognizer)
         
         # Save encodings
         self.save_encodings()
@@ -57,7 +57,15 @@ pip3 install dlib==19.24.0
 pip3 install face-recognition==1.3.0
 
 # Install other dependencies
-pip3 install Pillow==10.0.0
+# Pillow-SIMD is a drop-in Pillow build with SSE4/AVX2 kernels (resize, convert, draw);
+# it has no NEON code, so ARM boards keep stock Pillow
+if [ "$(uname -m)" = "x86_64" ] && grep -q avx2 /proc/cpuinfo; then
+    echo "Installing Pillow-SIMD (AVX2)..."
+    pip3 uninstall -y Pillow
+    CC="cc -mavx2" pip3 install --no-binary :all: pillow-simd || pip3 install Pillow==10.0.0
+else
+    pip3 install Pillow==10.0.0
+fi
 
 # Install picamera2 for Pi Camera support
 echo ""
@@ -7,8 +7,11 @@ import cv2
 import argparse
 import time
 import sys
+import queue
+import threading
+from collections import deque
 from datetime import datetime
-from face_detector import FaceDetector
+from face_detector import FaceDetector, FaceTracker
 from face_recognizer import FaceRecognizer
 from attendance_tracker import AttendanceTracker
 from camera_wrapper import Camera
@@ -44,6 +47,15 @@ class FaceRecognitionSystem:
         self.frame_count = 0
         self.last_recognition = {}
         
+        # Capture -> recognition -> display pipeline state
+        self._stop_event = threading.Event()
+        self._frames = deque(maxlen=2)  # Newest captured frames, oldest dropped
+        self._frame_event = threading.Event()
+        self._work_queue = queue.Queue(maxsize=1)  # Frame handed to the recognition worker
+        self._result_lock = threading.Lock()
+        self._latest_result = ([], [], None)  # (faces, labels, gray) from the last processed frame
+        self.face_tracker = FaceTracker()  # Carries boxes across frames between detections
+        
         print(f"[INFO] System initialized in {mode.upper()} mode")
     
     def unlock_door(self):
@@ -98,6 +110,50 @@ class FaceRecognitionSystem:
                 self.tracker.record_event("Unknown", 'ACCESS_DENIED', confidence)
                 print(f"\n✗ ACCESS DENIED: Unknown person")
     
+    def _capture_loop(self, camera):
+        """Capture thread: keep the newest frames in the ring buffer"""
+        while not self._stop_event.is_set():
+            ret, frame = camera.read()
+            
+            if not ret or frame is None:
+                print("[ERROR] Failed to capture frame")
+                self._stop_event.set()
+                break
+            
+            self._frames.append(frame)
+            self._frame_event.set()
+    
+    def _recognition_loop(self):
+        """Worker thread: detect and recognize faces in frames handed over by run()"""
+        while not self._stop_event.is_set():
+            try:
+                frame = self._work_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            
+            # Convert once; detection and recognition share the grayscale frame
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            
+            # Detect faces
+            faces = self.detector.detect_faces_gray(gray)
+            labels = []
+            
+            if len(faces) > 0:
+                # Recognize the detected faces (returns list of names)
+                results = self.recognizer.recognize_faces_gray(gray, faces)
+                
+                for name in results:
+                    # Use a fixed confidence since recognizer doesn't return it
+                    confidence = 0.85
+                    label = f"{name} ({confidence:.2f})"
+                    labels.append(label)
+                    
+                    # Process recognized faces
+                    self.process_recognition(name, confidence)
+            
+            with self._result_lock:
+                self._latest_result = (faces, labels, gray)
+    
     def run(self):
         """Run the main recognition loop"""
         print(f"\n[INFO] Starting {self.mode.upper()} system...")
@@ -116,38 +172,55 @@ class FaceRecognitionSystem:
         window_name = f"Face Recognition - {self.mode.upper()} Mode"
         cv2.namedWindow(window_name, cv2.WINDOW_NORMAL)
         
+        # Capture and recognition run in their own threads; this thread only displays
+        self._stop_event.clear()
+        threads = [
+            threading.Thread(target=self._capture_loop, args=(camera,), daemon=True),
+            threading.Thread(target=self._recognition_loop, daemon=True),
+        ]
+        for thread in threads:
+            thread.start()
+        
+        tracked_gray = None  # Grayscale frame of the result the face tracker was reset with
+        
         try:
-            while True:
-                # Capture frame
-                ret, frame = camera.read()
+            while not self._stop_event.is_set():
+                # Wait for a new frame
+                if not self._frame_event.wait(timeout=0.1):
+                    continue
+                self._frame_event.clear()
                 
-                if not ret or frame is None:
-                    print("[ERROR] Failed to capture frame")
-                    break
+                try:
+                    frame = self._frames.pop()
+                except IndexError:
+                    continue
+                self._frames.clear()
                 
                 self.frame_count += 1
-                display_frame = frame.copy()
                 
-                # Process every Nth frame for performance
-                if self.frame_count % config.PROCESS_EVERY_N_FRAMES == 0:
-                    # Detect faces
-                    faces = self.detector.detect_faces(frame)
-                    
-                    if len(faces) > 0:
-                        # Recognize faces
-                        results = self.recognizer.recognize_faces(frame)
-                        
-                        # Draw and process results
-                        labels = []
-                        for name, confidence in results:
-                            label = f"{name} ({confidence:.2f})"
-                            labels.append(label)
-                            
-                            # Process recognized faces
-                            self.process_recognition(name, confidence)
-                        
-                        # Draw bounding boxes
-                        display_frame = self.detector.draw_faces(display_frame, faces, labels)
+                # Hand every Nth frame to the worker if it is idle (it gets its own copy,
+                # since the displayed frame is drawn on in place)
+                if (self.frame_count % config.PROCESS_EVERY_N_FRAMES == 0
+                        and self._work_queue.empty()):
+                    try:
+                        self._work_queue.put_nowait(frame.copy())
+                    except queue.Full:
+                        pass
+                
+                # The captured frame is only used for display afterwards, so draw on it directly
+                display_frame = frame
+                
+                # Draw boxes from the latest processed frame, moved along with the faces by
+                # optical flow until the worker delivers the next detection
+                with self._result_lock:
+                    faces, labels, result_gray = self._latest_result
+                if len(faces) > 0:
+                    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                    if result_gray is not tracked_gray:
+                        self.face_tracker.reset(result_gray, faces)
+                        tracked_gray = result_gray
+                    faces = self.face_tracker.update(gray)
+                    display_frame = self.detector.draw_faces(display_frame, faces, labels, inplace=True)
                 
                 # Add system info overlay
                 timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -176,9 +249,16 @@ class FaceRecognitionSystem:
         
         finally:
             # Cleanup
+            self._stop_event.set()
+            for thread in threads:
+                thread.join(timeout=2.0)
+            
             cv2.destroyAllWindows()
             camera.release()
             
+            # Write queued spreadsheet rows and any pending monthly report
+            self.tracker.close()
+            
             if config.USE_GPIO:
                 GPIO.cleanup()
             
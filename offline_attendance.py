@@ -10,7 +10,9 @@ Works completely without WiFi/network connection
 
 import cv2
 import time
+import queue
 import threading
+from collections import OrderedDict
 from datetime import datetime
 from face_detector import FaceDetector
 from face_recognizer import FaceRecognizer
@@ -21,16 +23,48 @@ import config
 # Try to import ST7789 for LCD display
 try:
     import st7789
+    from st7789_fast import display_image, write_region
     from PIL import Image, ImageDraw, ImageFont
     DISPLAY_AVAILABLE = True
 except ImportError:
     DISPLAY_AVAILABLE = False
     print("[WARNING] ST7789 display not available")
 
+_time_strings = {}  # strftime format -> (second, formatted text)
+
+
+def format_now(fmt: str) -> str:
+    """
+    Current local time formatted with fmt, at most one strftime per second per format
+    
+    Args:
+        fmt: time.strftime format (second resolution)
+        
+    Returns:
+        Formatted time string
+    """
+    second = int(time.time())
+    cached = _time_strings.get(fmt)
+    if cached is None or cached[0] != second:
+        cached = (second, time.strftime(fmt, time.localtime(second)))
+        _time_strings[fmt] = cached
+    return cached[1]
+
 
 class OfflineAttendanceSystem:
     """Offline attendance system with LCD display"""
     
+    # LCD colors
+    BG_COLOR = (0, 30, 60)
+    HEADER_BG = (0, 50, 100)
+    SUCCESS_COLOR = (46, 204, 113)
+    ERROR_COLOR = (231, 76, 60)
+    TEXT_COLOR = (255, 255, 255)
+    TIME_COLOR = (255, 255, 100)
+    RECENT_LINE_CACHE_SIZE = 16
+    CLOCK_BOX = (145, 8, 240, 33)  # Header clock area (x0, y0, x1, y1)
+    FULL_REFRESH_INTERVAL = 5.0  # Seconds between full-frame sends while only the clock changes
+    
     def __init__(self, use_display=True):
         """Initialize the offline attendance system"""
         print("="*60)
@@ -56,28 +90,25 @@ class OfflineAttendanceSystem:
         if self.use_display:
             try:
                 print("[INFO] Initializing ST7789 display...")
-                self.lcd_display = st7789.ST7789(
-                    rotation=90,
-                    port=0,
-                    cs=0,
-                    dc=25,
-                    backlight=18,
-                    rst=24,
-                    spi_speed_hz=80 * 1000000
-                )
+                self.lcd_display = st7789.ST7789(**config.ST7789_DISPLAY)
                 
                 # Load fonts
-                try:
-                    self.font_large = ImageFont.truetype(
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-                    self.font_medium = ImageFont.truetype(
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 18)
-                    self.font_small = ImageFont.truetype(
-                        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 12)
-                except:
-                    self.font_large = ImageFont.load_default()
-                    self.font_medium = ImageFont.load_default()
-                    self.font_small = ImageFont.load_default()
+                self.font_large = config.get_font(24)
+                self.font_medium = config.get_font(18)
+                self.font_small = config.get_font(12, bold=False)
+                
+                self._build_lcd_backgrounds()
+                self._recent_lines = OrderedDict()  # (time, name) -> rendered line image
+                
+                # Status screens are rendered and sent on their own thread; only the
+                # newest pending request is kept
+                self._lcd_queue = queue.Queue(maxsize=1)
+                self._lcd_img = None  # Last screen sent (owned by the LCD thread)
+                self._lcd_full_at = 0.0  # When the last full frame was sent
+                self._last_lcd_key = None
+                self._clock_second = None
+                self._lcd_thread = threading.Thread(target=self._lcd_worker, daemon=True)
+                self._lcd_thread.start()
                 
                 print("[INFO] ✓ LCD display ready")
                 self.show_startup_screen()
@@ -89,6 +120,19 @@ class OfflineAttendanceSystem:
         self.frame_count = 0
         self.last_recognition = {}
         self.recent_events = []
+        self._ready_revert_at = 0.0  # When the LCD goes back to READY (0 = not pending)
+        self._status_cache = {}  # name -> (status, cooldown_until) for today
+        self._status_cache_date = None
+        self._gray_buf = None  # Grayscale working frame, reused every processed frame
+        self._motion_buf = None  # Thumbnail of the current frame (see _scene_changed)
+        self._motion_ref = None  # Thumbnail of the last frame that ran detection
+        self._faces_seen = False
+        
+        # Capture/display -> recognition pipeline state
+        self._stop_event = threading.Event()
+        self._work_queue = queue.Queue(maxsize=1)  # Newest frame for the recognition worker
+        self._result_lock = threading.Lock()
+        self._latest_result = ((), [])  # (faces, names) from the last processed frame
         
         print()
         print("✓ System ready - WiFi not required")
@@ -108,55 +152,157 @@ class OfflineAttendanceSystem:
             draw.text((20, 110), "ATTENDANCE", font=self.font_large, fill=(255, 255, 255))
             draw.text((50, 160), "Ready", font=self.font_medium, fill=(100, 255, 100))
             
-            self.lcd_display.display(img)
+            display_image(self.lcd_display, img)
+    
+    def _build_lcd_backgrounds(self):
+        """Pre-render the static parts of the status screen (header, labels, READY text, badges)"""
+        self._lcd_bg = Image.new('RGB', (240, 240), color=self.BG_COLOR)
+        draw = ImageDraw.Draw(self._lcd_bg)
+        draw.rectangle([0, 0, 240, 40], fill=self.HEADER_BG)
+        draw.text((10, 8), "ATTENDANCE", font=self.font_medium, fill=self.TEXT_COLOR)
+        
+        # Same screen with the "Recent:" label, used once there are events
+        self._lcd_bg_recent = self._lcd_bg.copy()
+        ImageDraw.Draw(self._lcd_bg_recent).text((10, 155), "Recent:", font=self.font_small,
+                                                 fill=(150, 150, 150))
+        
+        # READY screens (without / with "Recent:")
+        self._lcd_ready = {}
+        for has_recent, bg in ((False, self._lcd_bg), (True, self._lcd_bg_recent)):
+            ready = bg.copy()
+            draw = ImageDraw.Draw(ready)
+            draw.text((60, 100), "READY", font=self.font_large, fill=self.SUCCESS_COLOR)
+            draw.text((30, 135), "Waiting for face...", font=self.font_small, fill=(150, 150, 150))
+            self._lcd_ready[has_recent] = ready
+        
+        # Status badges, pasted at (10, 50)
+        self._status_badges = {}
+        for action, status_text, color in (("CHECK_IN", "CHECK IN", self.SUCCESS_COLOR),
+                                           ("CHECK_OUT", "CHECK OUT", self.SUCCESS_COLOR),
+                                           ("COOLDOWN", "COOLDOWN", self.ERROR_COLOR)):
+            badge = Image.new('RGB', (221, 41), color=color)
+            draw = ImageDraw.Draw(badge)
+            draw.rectangle([0, 0, 220, 40], fill=color, outline=(255, 255, 255), width=2)
+            draw.text((50, 10), status_text, font=self.font_medium, fill=(255, 255, 255))
+            self._status_badges[action] = badge
+    
+    def _recent_line_image(self, event):
+        """Rendered line for a recent event, cached by (time, name)"""
+        key = (event['time'], event['name'])
+        line = self._recent_lines.get(key)
+        if line is not None:
+            self._recent_lines.move_to_end(key)
+            return line
+        
+        event_text = f"{event['time']} {event['name']}"
+        if len(event_text) > 22:
+            event_text = event_text[:22] + "..."
+        line = Image.new('RGB', (230, 18), color=self.BG_COLOR)
+        ImageDraw.Draw(line).text((0, 0), event_text, font=self.font_small, fill=(200, 200, 200))
+        
+        self._recent_lines[key] = line
+        if len(self._recent_lines) > self.RECENT_LINE_CACHE_SIZE:
+            self._recent_lines.popitem(last=False)
+        return line
+    
+    def _lcd_worker(self):
+        """Render and send queued status screens"""
+        while True:
+            request = self._lcd_queue.get()
+            if request is None:
+                break
+            if request == 'clock':
+                self._render_clock()
+            else:
+                self._render_lcd(*request)
     
     def update_lcd_display(self, name=None, action=None, status="READY"):
-        """Update LCD display with current status"""
+        """Queue an LCD status update, replacing any update not yet shown"""
+        if not self.use_display:
+            return
+        
+        # Nothing on screen would change (the clock is refreshed by maybe_tick_clock)
+        key = (name, action, status, len(self.recent_events))
+        if key == self._last_lcd_key:
+            return
+        self._last_lcd_key = key
+        
+        try:
+            self._lcd_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._lcd_queue.put((name, action, status))
+    
+    def maybe_tick_clock(self):
+        """Refresh the header clock once per second"""
         if not self.use_display:
             return
         
+        second = int(time.time())
+        if second == self._clock_second:
+            return
+        self._clock_second = second
+        
+        # A pending screen update redraws the clock anyway, so never replace it
+        try:
+            self._lcd_queue.put_nowait('clock')
+        except queue.Full:
+            pass
+    
+    def _draw_clock(self, draw):
+        """Draw the current time into the header"""
+        current_time = format_now("%H:%M:%S")
+        draw.text((150, 12), current_time, font=self.font_small, fill=self.TIME_COLOR)
+    
+    def _render_clock(self):
+        """Redraw only the clock on the last screen and send it"""
+        if self._lcd_img is None:
+            return
+        
+        try:
+            with self.display_lock:
+                draw = ImageDraw.Draw(self._lcd_img)
+                x0, y0, x1, y1 = self.CLOCK_BOX
+                draw.rectangle([x0, y0, x1 - 1, y1 - 1], fill=self.HEADER_BG)
+                self._draw_clock(draw)
+                
+                # Only the clock strip goes over SPI; a periodic full frame corrects any drift
+                now = time.time()
+                if now - self._lcd_full_at >= self.FULL_REFRESH_INTERVAL:
+                    display_image(self.lcd_display, self._lcd_img)
+                    self._lcd_full_at = now
+                else:
+                    write_region(self.lcd_display, self._lcd_img, self.CLOCK_BOX)
+        except Exception as e:
+            print(f"[WARNING] Display update failed: {e}")
+    
+    def _render_lcd(self, name=None, action=None, status="READY"):
+        """Draw the status screen and send it to the LCD"""
         try:
             with self.display_lock:
                 # Colors
-                bg_color = (0, 30, 60)
-                header_bg = (0, 50, 100)
-                success_color = (46, 204, 113)
-                error_color = (231, 76, 60)
-                text_color = (255, 255, 255)
-                time_color = (255, 255, 100)
+                text_color = self.TEXT_COLOR
+                time_color = self.TIME_COLOR
                 
-                # Create image
-                img = Image.new('RGB', (240, 240), color=bg_color)
+                # Start from the pre-rendered header (and "Recent:" label, READY text)
+                has_recent = bool(self.recent_events)
+                if name and action:
+                    bg = self._lcd_bg_recent if has_recent else self._lcd_bg
+                else:
+                    bg = self._lcd_ready[has_recent]
+                img = bg.copy()
                 draw = ImageDraw.Draw(img)
                 
-                # Header
-                draw.rectangle([0, 0, 240, 40], fill=header_bg)
-                draw.text((10, 8), "ATTENDANCE", font=self.font_medium, fill=text_color)
-                
                 # Current time
-                current_time = datetime.now().strftime("%H:%M:%S")
-                draw.text((150, 12), current_time, font=self.font_small, fill=time_color)
+                self._draw_clock(draw)
                 
                 # Status section
                 y_pos = 50
                 
                 if name and action:
-                    # Show recognition result
-                    if action == "CHECK_IN":
-                        status_color = success_color
-                        status_text = "CHECK IN"
-                    elif action == "CHECK_OUT":
-                        status_color = success_color
-                        status_text = "CHECK OUT"
-                    else:
-                        status_color = error_color
-                        status_text = "COOLDOWN"
-                    
-                    # Status badge
-                    draw.rectangle([10, y_pos, 230, y_pos + 40], 
-                                  fill=status_color, outline=(255, 255, 255), width=2)
-                    draw.text((60, y_pos + 10), status_text, 
-                             font=self.font_medium, fill=(255, 255, 255))
+                    # Show recognition result (pre-rendered status badge)
+                    badge = self._status_badges.get(action, self._status_badges["COOLDOWN"])
+                    img.paste(badge, (10, y_pos))
                     
                     y_pos += 50
                     
@@ -166,68 +312,132 @@ class OfflineAttendanceSystem:
                     y_pos += 25
                     
                     # Time
-                    event_time = datetime.now().strftime("%H:%M:%S")
+                    event_time = format_now("%H:%M:%S")
                     draw.text((10, y_pos), f"Time: {event_time}", 
                              font=self.font_small, fill=time_color)
                     y_pos += 30
-                else:
-                    # Ready status
-                    draw.text((60, 100), "READY", font=self.font_large, 
-                             fill=success_color)
-                    draw.text((30, 135), "Waiting for face...", font=self.font_small, 
-                             fill=(150, 150, 150))
                 
                 # Recent events (last 3)
                 if self.recent_events:
-                    y_pos = 155
-                    draw.text((10, y_pos), "Recent:", font=self.font_small, 
-                             fill=(150, 150, 150))
-                    y_pos += 20
+                    y_pos = 175
                     
                     for event in self.recent_events[-3:]:
-                        event_text = f"{event['time']} {event['name']}"
-                        if len(event_text) > 22:
-                            event_text = event_text[:22] + "..."
-                        draw.text((10, y_pos), event_text, font=self.font_small, 
-                                 fill=(200, 200, 200))
+                        img.paste(self._recent_line_image(event), (10, y_pos))
                         y_pos += 18
                         if y_pos > 220:
                             break
                 
                 # Update display
-                self.lcd_display.display(img)
+                display_image(self.lcd_display, img)
+                self._lcd_img = img
+                self._lcd_full_at = time.time()
         
         except Exception as e:
             print(f"[WARNING] Display update failed: {e}")
     
+    def _cached_status(self, name: str):
+        """
+        Get (status, cooldown_until) for a person without querying the tracker
+        
+        The cache is filled with one get_user_status() call per day and kept
+        current by process_recognition after each recorded event.
+        """
+        today = datetime.now().date()
+        if today != self._status_cache_date:
+            self._status_cache_date = today
+            self._status_cache = {}
+            now = time.time()
+            for user, info in self.tracker.get_user_status().items():
+                remaining = self.tracker.get_cooldown_remaining(user)
+                self._status_cache[user] = (info['status'], now + remaining)
+        
+        if name not in self._status_cache:
+            # Not seen today (or checked in before the cache was loaded)
+            self._status_cache[name] = ('OUT', time.time() + self.tracker.get_cooldown_remaining(name))
+        return self._status_cache[name]
+    
+    def _scene_changed(self, gray) -> bool:
+        """
+        Cheap motion check on a 64x48 thumbnail against the last frame that ran detection
+        
+        Returns:
+            True if detection should run (motion, faces on the last detection, or no reference yet)
+        """
+        self._motion_buf = cv2.resize(gray, (64, 48), dst=self._motion_buf, interpolation=cv2.INTER_AREA)
+        if (self._faces_seen or self._motion_ref is None or
+                cv2.norm(self._motion_buf, self._motion_ref, cv2.NORM_L1) / self._motion_buf.size
+                >= config.MOTION_THRESHOLD):
+            # This frame becomes the reference; the old one is reused as the next thumbnail
+            self._motion_ref, self._motion_buf = self._motion_buf, self._motion_ref
+            return True
+        return False
+    
     def process_recognition(self, name: str, confidence: float):
         """Process recognized face and update attendance"""
+        planned = self._plan_event(name, confidence)
+        if planned:
+            self._record_events([planned])
+    
+    def _plan_event(self, name: str, confidence: float):
+        """
+        Decide what a recognition of name should record
+        
+        Returns:
+            (name, event, confidence) to record, or None (duplicate or cooldown,
+            which is shown on the LCD here)
+        """
         current_time = time.time()
         
         # Avoid duplicate processing within 2 seconds
         if name in self.last_recognition:
             if current_time - self.last_recognition[name] < 2.0:
-                return
+                return None
         
         self.last_recognition[name] = current_time
         
-        # Get current user status to determine if should check in or out
-        user_status = self.tracker.get_user_status()
-        current_status = user_status.get(name, {}).get('status', 'OUT')
+        # Current status and cooldown come from the in-memory cache
+        current_status, cooldown_until = self._cached_status(name)
         
         # Check if can process (not in cooldown)
-        if self.tracker.can_checkin(name):
-            # Determine action based on current status
-            if current_status == 'OUT':
-                # Person is OUT, so CHECK IN
-                self.tracker.record_event(name, 'CHECK_IN', confidence)
-                action = "CHECK_IN"
+        if current_time >= cooldown_until:
+            # Person is OUT, so CHECK IN; person is IN, so CHECK OUT
+            event = 'CHECK_IN' if current_status == 'OUT' else 'CHECK_OUT'
+            return (name, event, confidence)
+        
+        # In cooldown period
+        remaining = int(cooldown_until - current_time)
+        minutes = remaining // 60
+        seconds = remaining % 60
+        
+        print(f"\n⏳ {name} - Cooldown: {minutes}m {seconds}s")
+        
+        # Show cooldown on LCD
+        self.update_lcd_display(name, "COOLDOWN")
+        
+        # Return to ready after 3 seconds (checked by the main loop, so capture keeps running)
+        self._ready_revert_at = time.time() + 3
+        return None
+    
+    def _record_events(self, planned):
+        """
+        Record the planned (name, event, confidence) events in one tracker transaction
+        
+        Args:
+            planned: Events from _plan_event, e.g. every face in one frame
+        """
+        current_time = time.time()
+        results = self.tracker.record_events_batch(planned)
+        
+        for (name, action, confidence), ok in zip(planned, results):
+            _, cooldown_until = self._cached_status(name)
+            if action == 'CHECK_IN':
+                if ok:
+                    self._status_cache[name] = ('IN', current_time + config.CHECK_IN_COOLDOWN)
                 event_action = 'IN'
                 print(f"\n✓ CHECK-IN: {name} (Confidence: {confidence:.2f})")
             else:
-                # Person is IN, so CHECK OUT
-                self.tracker.record_event(name, 'CHECK_OUT', confidence)
-                action = "CHECK_OUT"
+                if ok:
+                    self._status_cache[name] = ('OUT', cooldown_until)
                 event_action = 'OUT'
                 print(f"\n✓ CHECK-OUT: {name} (Confidence: {confidence:.2f})")
             
@@ -241,21 +451,53 @@ class OfflineAttendanceSystem:
             
             # Update LCD
             self.update_lcd_display(name, action)
+        
+        # Return to ready after 3 seconds (checked by the main loop, so capture keeps running)
+        self._ready_revert_at = time.time() + 3
+    
+    def _recognition_loop(self):
+        """Worker thread: detect and recognize faces in frames handed over by run()"""
+        while not self._stop_event.is_set():
+            try:
+                frame = self._work_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
             
-        else:
-            # In cooldown period
-            remaining = self.tracker.get_cooldown_remaining(name)
-            minutes = remaining // 60
-            seconds = remaining % 60
+            # Convert once; detection and recognition share the grayscale frame
+            if frame.ndim == 2:
+                gray = frame
+            else:
+                # Reuse the previous frame's buffer (cvtColor reallocates only on a size change)
+                self._gray_buf = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=self._gray_buf)
+                gray = self._gray_buf
             
-            print(f"\n⏳ {name} - Cooldown: {minutes}m {seconds}s")
+            # Detect faces (skipped while an empty scene stays still)
+            faces = ()
+            if self._scene_changed(gray):
+                faces = self.detector.detect_faces_gray(gray)
+                self._faces_seen = len(faces) > 0
             
-            # Show cooldown on LCD
-            self.update_lcd_display(name, "COOLDOWN")
-        
-        # Return to ready after 3 seconds
-        time.sleep(3)
-        self.update_lcd_display()
+            results = []
+            if len(faces) > 0:
+                # Recognize faces (returns list of names)
+                results = self.recognizer.recognize_faces_gray(gray, faces)
+                
+                # Process results; everyone in this frame is recorded in one batch
+                planned = []
+                for name in results:
+                    # Use a fixed confidence since recognizer doesn't return it
+                    confidence = 0.85  # Default confidence
+                    
+                    # Process recognized faces
+                    if name != "Unknown":
+                        event = self._plan_event(name, confidence)
+                        if event:
+                            planned.append(event)
+                if planned:
+                    self._record_events(planned)
+            
+            with self._result_lock:
+                self._latest_result = (faces, results)
     
     def run(self):
         """Run the offline attendance system"""
@@ -267,14 +509,6 @@ class OfflineAttendanceSystem:
         # Update display to ready state
         self.update_lcd_display()
         
-        # Initialize camera
-        camera = Camera(config.CAMERA_WIDTH, config.CAMERA_HEIGHT, 
-                       config.USE_PI_CAMERA, preview=True)
-        
-        if not camera.isOpened():
-            print("[ERROR] Failed to open camera")
-            return
-        
         # Create OpenCV window for camera display
         show_opencv_window = True
         window_name = "Offline Attendance (Press 'q' to quit)"
@@ -289,75 +523,98 @@ class OfflineAttendanceSystem:
             print("[INFO] Running without camera preview")
             show_opencv_window = False
         
+        # Initialize camera (headless only needs luminance, so skip colour capture)
+        camera = Camera(config.CAMERA_WIDTH, config.CAMERA_HEIGHT, 
+                       config.USE_PI_CAMERA, preview=show_opencv_window,
+                       color=show_opencv_window)
+        
+        if not camera.isOpened():
+            print("[ERROR] Failed to open camera")
+            if show_opencv_window:
+                cv2.destroyAllWindows()
+            return
+        
+        # Detection and recognition run on their own thread; this one captures and displays
+        self._stop_event.clear()
+        worker = threading.Thread(target=self._recognition_loop, daemon=True)
+        worker.start()
+        
         try:
-            while True:
+            while not self._stop_event.is_set():
                 # Capture frame
-                ret, frame = camera.read()
+                if show_opencv_window:
+                    ret, frame = camera.read()
+                else:
+                    ret, frame = camera.read_gray()
                 
                 if not ret or frame is None:
                     print("[ERROR] Failed to capture frame")
                     break
                 
                 self.frame_count += 1
-                display_frame = frame.copy()
                 
-                # Process every Nth frame for performance
-                if self.frame_count % config.PROCESS_EVERY_N_FRAMES == 0:
-                    # Detect faces
-                    faces = self.detector.detect_faces(frame)
-                    
-                    if len(faces) > 0:
-                        # Recognize faces (returns list of names)
-                        results = self.recognizer.recognize_faces(frame, faces)
-                        
-                        # Draw and process results
-                        labels = []
-                        for i, name in enumerate(results):
-                            # Use a fixed confidence since recognizer doesn't return it
-                            confidence = 0.85  # Default confidence
-                            label = f"{name}"
-                            labels.append(label)
-                            
-                            # Process recognized faces
-                            if name != "Unknown":
-                                self.process_recognition(name, confidence)
-                        
-                        # Draw bounding boxes
-                        display_frame = self.detector.draw_faces(
-                            display_frame, faces, labels)
+                if self._ready_revert_at and time.time() >= self._ready_revert_at:
+                    self._ready_revert_at = 0.0
+                    self.update_lcd_display()
+                self.maybe_tick_clock()
                 
-                # Add overlay info
-                timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                cv2.putText(display_frame, "OFFLINE MODE", 
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-                cv2.putText(display_frame, timestamp, 
-                           (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
-                cv2.putText(display_frame, f"Events: {len(self.recent_events)}", 
-                           (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+                # Hand every Nth frame to the recognition worker, replacing one it has
+                # not picked up yet (it gets its own copy when this frame is drawn on)
+                if self.frame_count % config.PROCESS_EVERY_N_FRAMES == 0:
+                    try:
+                        self._work_queue.get_nowait()
+                    except queue.Empty:
+                        pass
+                    self._work_queue.put_nowait(frame.copy() if show_opencv_window else frame)
                 
                 # Show frame only if window is available
                 if show_opencv_window:
+                    # The captured frame is only used for display afterwards, so draw on it directly
+                    display_frame = frame
+                    
+                    # Draw bounding boxes labelled with the names from the last processed frame
+                    with self._result_lock:
+                        faces, results = self._latest_result
+                    if len(faces) > 0:
+                        display_frame = self.detector.draw_faces(
+                            display_frame, faces, results, inplace=True)
+                    
+                    # Add overlay info
+                    timestamp = format_now('%Y-%m-%d %H:%M:%S')
+                    cv2.putText(display_frame, "OFFLINE MODE", 
+                               (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+                    cv2.putText(display_frame, timestamp, 
+                               (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0), 2)
+                    cv2.putText(display_frame, f"Events: {len(self.recent_events)}", 
+                               (10, 90), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+                    
                     cv2.imshow(window_name, display_frame)
                     key = cv2.waitKey(1) & 0xFF
                     if key == ord('q'):
                         print("\n[INFO] Shutting down...")
                         break
-                else:
-                    # Headless mode - just check for Ctrl+C
-                    import time
-                    time.sleep(0.01)
+                # Headless mode needs no sleep: the next camera read blocks until a frame arrives
         
         except KeyboardInterrupt:
             print("\n[INFO] Interrupted by user")
         
         finally:
             # Cleanup
+            self._stop_event.set()
+            worker.join(timeout=2.0)
+            
             if show_opencv_window:
                 cv2.destroyAllWindows()
             camera.release()
             
+            # Write queued spreadsheet rows and any pending monthly report
+            self.tracker.close()
+            
             # Show shutdown on LCD
             if self.use_display:
+                self._lcd_queue.put(None)
+                self._lcd_thread.join(timeout=2.0)
+                
                 with self.display_lock:
                     img = Image.new('RGB', (240, 240), color=(0, 0, 0))
                     draw = ImageDraw.Draw(img)
@@ -365,7 +622,7 @@ class OfflineAttendanceSystem:
                              fill=(255, 255, 255))
                     draw.text((70, 130), "OFF", font=self.font_large, 
                              fill=(255, 255, 255))
-                    self.lcd_display.display(img)
+                    display_image(self.lcd_display, img)
             
             print("[INFO] System stopped")
             print(f"[INFO] Total events recorded: {len(self.recent_events)}")
@@ -0,0 +1,29 @@
+"""
+Frame packing for the Nokia 5110 (PCD8544) display
+Converts PIL images to the controller's byte layout with NumPy instead of per-pixel loops
+"""
+
+import numpy as np
+
+WIDTH = 84
+HEIGHT = 48
+FRAME_BYTES = WIDTH * HEIGHT // 8
+
+
+def pil_to_pcd8544(image) -> bytes:
+    """
+    Pack a PIL image into the PCD8544 frame layout
+    
+    The controller stores one byte per column for each 8-row bank, with the
+    top pixel of the bank in bit 0.
+    
+    Args:
+        image: PIL image (any mode; converted to 1-bit), width x height a multiple of 8 rows
+        
+    Returns:
+        Frame bytes (width * height / 8), ready for a single SPI write
+    """
+    pixels = np.asarray(image.convert('1'), dtype=np.uint8)
+    height, width = pixels.shape
+    banks = pixels.reshape(height // 8, 8, width)
+    return np.packbits(banks, axis=1, bitorder='little').tobytes()
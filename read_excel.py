@@ -30,8 +30,8 @@ def read_attendance_file(file_path):
         print("="*80)
         print()
         
-        # Load workbook
-        wb = load_workbook(file_path)
+        # Load workbook (read-only streams rows instead of building every cell and style)
+        wb = load_workbook(file_path, read_only=True, data_only=True)
         ws = wb.active
         
         print(f"Sheet name: {ws.title}")
@@ -39,10 +39,10 @@ def read_attendance_file(file_path):
         print(f"Total columns: {ws.max_column}")
         print()
         
+        rows = ws.iter_rows(values_only=True)
+        
         # Read headers
-        headers = []
-        for cell in ws[1]:
-            headers.append(cell.value)
+        headers = list(next(rows, ()))
         
         # Display headers
         print("Columns:")
@@ -60,14 +60,20 @@ def read_attendance_file(file_path):
         print(header_line)
         print("-" * len(header_line))
         
-        # Read and display all rows
+        # Read and display all rows, collecting the summary in the same pass
         row_count = 0
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0]:  # If name is not empty
+        status_by_name = {}  # Latest status per person
+        
+        for row in rows:
+            if row and row[0]:  # If name is not empty
                 row_data = " | ".join([f"{str(cell):^12}" if cell else f"{'':^12}" 
                                       for cell in row[:len(headers)]])
                 print(row_data)
                 row_count += 1
+                
+                # Check status (Time Out column)
+                time_out = row[3] if len(row) > 3 else None
+                status_by_name[row[0]] = 'OUT' if time_out else 'IN'
         
         print("-" * len(header_line))
         print(f"\nTotal records: {row_count}")
@@ -80,38 +86,17 @@ def read_attendance_file(file_path):
         print("SUMMARY")
         print("="*80)
         
-        # Count unique people
-        wb = load_workbook(file_path)
-        ws = wb.active
-        
-        unique_people = set()
-        checked_in = []
-        checked_out = []
-        
-        for row in ws.iter_rows(min_row=2, values_only=True):
-            if row[0]:
-                name = row[0]
-                unique_people.add(name)
-                
-                # Check status (Time Out column)
-                time_out = row[3] if len(row) > 3 else None
-                if time_out:
-                    checked_out.append(name)
-                else:
-                    checked_in.append(name)
-        
-        print(f"Total people: {len(unique_people)}")
+        checked_in = [name for name, status in status_by_name.items() if status == 'IN']
+        print(f"Total people: {len(status_by_name)}")
         print(f"Currently IN: {len(checked_in)}")
-        print(f"Currently OUT: {len(checked_out)}")
+        print(f"Currently OUT: {len(status_by_name) - len(checked_in)}")
         print()
         
         if checked_in:
             print("People currently IN:")
-            for name in set(checked_in):
+            for name in checked_in:
                 print(f"  • {name}")
         
-        wb.close()
-        
     except Exception as e:
         print(f"[ERROR] Failed to read Excel file: {e}")
         import traceback
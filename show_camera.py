@@ -5,9 +5,28 @@ Shows live camera feed in OpenCV window
 """
 
 import cv2
+import numpy as np
 from camera_wrapper import Camera
 import time
 
+
+def render_static_hud(shape):
+    """
+    Render the text that never changes once, as a patch plus the mask of its pixels
+    
+    Args:
+        shape: Frame shape
+        
+    Returns:
+        (y0, patch, mask) for the bottom strip of the frame
+    """
+    strip_h = 30
+    strip = np.zeros((strip_h,) + shape[1:], dtype=np.uint8)
+    cv2.putText(strip, "Press 'q' to quit", 
+               (10, strip_h - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+    mask = strip.any(axis=2, keepdims=True)
+    return shape[0] - strip_h, strip, mask
+
 print("="*60)
 print("PI CAMERA LIVE DISPLAY")
 print("="*60)
@@ -34,6 +53,8 @@ cv2.resizeWindow(window_name, 640, 480)
 
 frame_count = 0
 start_time = time.time()
+hud = None
+hud_shape = None
 
 try:
     while True:
@@ -58,8 +79,13 @@ try:
                    (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
         cv2.putText(frame, f"Frame: {frame_count}", 
                    (10, 60), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-        cv2.putText(frame, "Press 'q' to quit", 
-                   (10, frame.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 255), 2)
+        
+        # Static text is rasterized once and copied in through its mask
+        if frame.shape != hud_shape:
+            hud = render_static_hud(frame.shape)
+            hud_shape = frame.shape
+        y0, patch, mask = hud
+        np.copyto(frame[y0:], patch, where=mask)
         
         # Display frame
         cv2.imshow(window_name, frame)
@@ -0,0 +1,186 @@
+"""
+Fast frame transfer for the ST7789 display
+Sends a whole frame with one spidev writebytes2() call instead of the
+st7789 library's 4096-byte list transfers
+"""
+
+import numpy as np
+
+FRAME_BYTES = 240 * 240 * 2  # RGB565
+BUFSIZ_PATH = '/sys/module/spidev/parameters/bufsiz'
+
+_bufsiz_checked = False
+
+
+def _check_bufsiz():
+    """Warn once if the spidev buffer is smaller than one frame"""
+    global _bufsiz_checked
+    if _bufsiz_checked:
+        return
+    _bufsiz_checked = True
+    try:
+        with open(BUFSIZ_PATH, 'r') as f:
+            bufsiz = int(f.read().strip())
+    except (OSError, ValueError):
+        return
+    if bufsiz < FRAME_BYTES:
+        # writebytes2() still works, it just splits the frame into bufsiz chunks
+        # (one ioctl and one CS toggle per chunk)
+        print(f"[INFO] spidev bufsiz is {bufsiz}; add spidev.bufsiz=131072 to "
+              f"/boot/firmware/cmdline.txt to send each frame in one transfer")
+
+
+def image_to_rgb565(image, rotation=0) -> bytes:
+    """
+    Pack a PIL image into big-endian RGB565 bytes for the ST7789
+
+    Args:
+        image: PIL image
+        rotation: Display rotation in degrees (as passed to st7789.ST7789)
+
+    Returns:
+        Raw frame bytes (2 bytes per pixel)
+    """
+    arr = np.rot90(np.asarray(image.convert('RGB')), rotation // 90)
+    # Mask/shift each channel in uint8 first so only one uint16 plane is widened at a time
+    rgb565 = (arr[..., 0] & 0xF8).astype(np.uint16) << 8
+    rgb565 |= (arr[..., 1] & 0xFC).astype(np.uint16) << 3
+    rgb565 |= arr[..., 2] >> 3
+    return rgb565.astype('>u2').tobytes()
+
+
+def image_to_rgb565_into(image, out, rotation=0):
+    """
+    Pack a PIL image into a preallocated big-endian RGB565 buffer (no per-frame allocation)
+
+    Args:
+        image: PIL image
+        out: Writable buffer of width * height * 2 bytes (e.g. a bytearray), reused across frames
+        rotation: Display rotation in degrees (as passed to st7789.ST7789)
+
+    Returns:
+        out
+    """
+    arr = np.rot90(np.asarray(image.convert('RGB')), rotation // 90)
+    dst = np.frombuffer(out, dtype='>u2').reshape(arr.shape[:2])
+    # Build the 5/6/5 fields in place: only uint8 channel temporaries are allocated
+    dst[...] = arr[..., 0] >> 3
+    dst <<= 6
+    dst |= arr[..., 1] >> 2
+    dst <<= 5
+    dst |= arr[..., 2] >> 3
+    return out
+
+
+def supports_direct_write(display) -> bool:
+    """True if frames can be written straight to the display's spidev handle"""
+    spi = getattr(display, '_spi', None)
+    return spi is not None and hasattr(spi, 'writebytes2')
+
+
+def write_frame(display, data):
+    """
+    Send a packed RGB565 frame (see image_to_rgb565) to the display
+
+    Args:
+        display: st7789.ST7789 instance with supports_direct_write() True
+        data: Frame bytes
+    """
+    _check_bufsiz()
+
+    # A frame that fits in bufsiz goes out as a single spi_message, so the
+    # kernel holds CE0 low for the whole RAMWR payload. CE0 belongs to the
+    # SPI driver (it cannot be claimed through gpiod), and the ST7789 keeps
+    # accepting RAMWR pixels across CS toggles, so bufsiz is the only knob.
+
+    # CASET/RASET/RAMWR, then switch DC to data without sending anything
+    display.set_window()
+    display.send([], True)
+    display._spi.writebytes2(data)
+
+
+def _panel_window(box, rotation, width, height):
+    """
+    Map an image-space box to the panel window it lands on after software rotation
+
+    Args:
+        box: (x0, y0, x1, y1) in image pixels, x1/y1 exclusive
+        rotation: Display rotation in degrees
+        width, height: Image size
+
+    Returns:
+        (x0, y0, x1, y1) panel window for set_window(), inclusive
+    """
+    x0, y0, x1, y1 = box
+    k = (rotation // 90) % 4
+    if k == 0:
+        return x0, y0, x1 - 1, y1 - 1
+    if k == 1:
+        return y0, width - x1, y1 - 1, width - 1 - x0
+    if k == 2:
+        return width - x1, height - y1, width - 1 - x0, height - 1 - y0
+    return height - y1, x0, height - 1 - y0, x1 - 1
+
+
+def write_region(display, image, box):
+    """
+    Send only one rectangle of a PIL image to the display (CASET/RASET window)
+
+    Args:
+        display: st7789.ST7789 instance
+        image: Full-screen PIL image
+        box: (x0, y0, x1, y1) region to update, x1/y1 exclusive
+    """
+    if not supports_direct_write(display):
+        display.display(image)
+        return
+
+    rotation = display._rotation
+    data = image_to_rgb565(image.crop(box), rotation)
+    display.set_window(*_panel_window(box, rotation, image.width, image.height))
+    display.send([], True)
+    display._spi.writebytes2(data)
+
+
+def display_image(display, image):
+    """
+    Show a PIL image on an st7789.ST7789 display
+
+    Args:
+        display: Initialized st7789.ST7789 instance
+        image: PIL image matching the display size
+    """
+    if not supports_direct_write(display):
+        display.display(image)
+        return
+
+    # One frame buffer per display, refilled in place (the write below is synchronous)
+    frame_bytes = image.width * image.height * 2
+    buf = getattr(display, '_rgb565_frame', None)
+    if buf is None or len(buf) != frame_bytes:
+        buf = bytearray(frame_bytes)
+        display._rgb565_frame = buf
+    write_frame(display, image_to_rgb565_into(image, buf, display._rotation))
+
+
+def display_changes(display, image, previous=None):
+    """
+    Show a PIL image, sending only the band of rows that changed since the last frame
+
+    Args:
+        display: Initialized st7789.ST7789 instance
+        image: PIL image matching the display size
+        previous: Array returned by the previous call, or None to send the full frame
+
+    Returns:
+        RGB array of image, to pass as previous next time
+    """
+    current = np.asarray(image.convert('RGB'))  # A copy, safe to keep across frames
+    if previous is None or previous.shape != current.shape:
+        display_image(display, image)
+        return current
+
+    changed_rows = np.flatnonzero((current != previous).any(axis=(1, 2)))
+    if changed_rows.size:
+        write_region(display, image, (0, int(changed_rows[0]), image.width, int(changed_rows[-1]) + 1))
+    return current
@@ -35,19 +35,22 @@ print("Press Ctrl+C to stop")
 print()
 
 frame_count = 0
-start_time = time.time()
 
 try:
-    # Test 1: Capture 10 frames without display
+    # Test 1: Capture 30 frames back to back without display
     print("Test 1: Capturing frames (no display)...")
-    for i in range(10):
+    
+    # The first read pays for sensor start-up; keep it out of the FPS figure
+    camera.read()
+    start_time = time.time()
+    
+    for i in range(30):
         ret, frame = camera.read()
         if ret and frame is not None:
             frame_count += 1
             print(f"  Frame {i+1}: {frame.shape} - OK")
         else:
             print(f"  Frame {i+1}: FAILED")
-        time.sleep(0.5)
     
     elapsed = time.time() - start_time
     fps = frame_count / elapsed
@@ -3,9 +3,20 @@
 Compare test_st7789 vs display_attendance rendering
 """
 
+import sys
 import time
 import st7789
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import config
+
+# --fast: shorten every pause to 0.1 s (automated runs; the pauses are only for watching)
+FAST = '--fast' in sys.argv
+
+
+def hold(seconds):
+    """Pause so the screen can be checked by eye"""
+    time.sleep(min(seconds, 0.1) if FAST else seconds)
+
 
 print("="*60)
 print("ST7789 DISPLAY COMPARISON TEST")
@@ -14,15 +25,7 @@ print()
 
 # Initialize display
 print("1. Initializing display...")
-display = st7789.ST7789(
-    rotation=90,
-    port=0,
-    cs=0,
-    dc=25,
-    backlight=18,
-    rst=24,
-    spi_speed_hz=80 * 1000000
-)
+display = st7789.ST7789(**config.ST7789_DISPLAY)
 print(f"   ✓ Display ready: {display.width}x{display.height}")
 print()
 
@@ -39,7 +42,7 @@ for color, name in colors:
     img = Image.new('RGB', (display.width, display.height), color=color)
     display.display(img)
     print(f"   → {name}")
-    time.sleep(2)
+    hold(2)
 
 print()
 
@@ -55,62 +58,85 @@ STATUS_IN_COLOR = (46, 204, 113)
 TIME_COLOR = (255, 255, 100)
 BORDER_COLOR = (100, 150, 200)
 
-# Create image like display_attendance
-img = Image.new('RGB', (display.width, display.height), color=BG_COLOR)
-draw = ImageDraw.Draw(img)
+# Load fonts (cached by config.get_font, falls back to the PIL default font)
+font_title = config.get_font(20)
+font_name = config.get_font(16)
+font_small = config.get_font(10, bold=False)
+
+
+def build_template(width, height):
+    """Render everything that does not change between refreshes (header, card, labels)"""
+    img = Image.new('RGB', (width, height), color=BG_COLOR)
+    draw = ImageDraw.Draw(img)
+    
+    # Header background
+    draw.rectangle([0, 0, width, 35], fill=HEADER_BG)
+    draw.text((10, 8), "Attendance", font=font_title, fill=TEXT_COLOR)
+    draw.line([0, 35, width, 35], fill=BORDER_COLOR, width=2)
+    
+    # User card
+    card_y = 40
+    draw.rectangle([5, card_y, width - 5, card_y + 40], 
+                  fill=(20, 60, 40), outline=(46, 204, 113))
+    draw.text((10, card_y + 5), "Linh", font=font_name, fill=TEXT_COLOR)
+    draw.rectangle([width - 80, card_y + 5, width - 10, card_y + 22], 
+                  fill=STATUS_IN_COLOR)
+    draw.text((width - 75, card_y + 7), "SUCCESS", font=font_small, fill=(255, 255, 255))
+    draw.text((10, card_y + 24), "Time:", font=font_small, fill=TIME_COLOR)
+    return img
+
+
+def build_glyphs(font, chars="0123456789:"):
+    """Rasterize each character once as an 'L' mask, with its advance width"""
+    glyphs = {}
+    for char in chars:
+        left, top, right, bottom = font.getbbox(char)
+        mask = Image.new('L', (right, bottom))
+        ImageDraw.Draw(mask).text((0, 0), char, font=font, fill=255)
+        glyphs[char] = (mask, int(round(font.getlength(char))))
+    return glyphs
+
+
+def paste_text(img, xy, text, glyphs, color):
+    """Draw text from cached glyph masks (pastes only, no FreeType calls)"""
+    x, y = xy
+    for char in text:
+        mask, advance = glyphs[char]
+        img.paste(color, (x, y), mask)
+        x += advance
+
+
+template = build_template(display.width, display.height)
+glyphs = build_glyphs(font_small)
+
+# Refresh once per second for 10 seconds; each frame is a template copy plus the clock digits
+for _ in range(10):
+    now = time.strftime("%H:%M:%S")
+    img = template.copy()
+    paste_text(img, (display.width - 60, 10), now[:5], glyphs, TIME_COLOR)
+    paste_text(img, (40, 64), now, glyphs, TIME_COLOR)
+    display.display(img)
+    hold(1)
 
-# Load fonts
-try:
-    font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-    font_name = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 16)
-    font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 10)
-except:
-    font_title = ImageFont.load_default()
-    font_name = ImageFont.load_default()
-    font_small = ImageFont.load_default()
-
-# Header background
-draw.rectangle([0, 0, display.width, 35], fill=HEADER_BG)
-draw.text((10, 8), "Attendance", font=font_title, fill=TEXT_COLOR)
-draw.text((display.width - 60, 10), "10:00", font=font_small, fill=TIME_COLOR)
-draw.line([0, 35, display.width, 35], fill=BORDER_COLOR, width=2)
-
-# User card
-card_y = 40
-draw.rectangle([5, card_y, display.width - 5, card_y + 40], 
-              fill=(20, 60, 40), outline=(46, 204, 113))
-draw.text((10, card_y + 5), "Linh", font=font_name, fill=TEXT_COLOR)
-draw.rectangle([display.width - 80, card_y + 5, display.width - 10, card_y + 22], 
-              fill=STATUS_IN_COLOR)
-draw.text((display.width - 75, card_y + 7), "SUCCESS", font=font_small, fill=(255, 255, 255))
-draw.text((10, card_y + 24), "Time: 09:18:51", font=font_small, fill=TIME_COLOR)
-
-# Display it
-display.display(img)
 print("   ✓ Attendance layout displayed")
 print()
 print("   You should see:")
 print("   - Dark blue header with 'Attendance'")
 print("   - Green card with 'Linh' and 'SUCCESS' badge")
-print("   - Yellow time text")
+print("   - Yellow time text, ticking every second")
 print()
 
-time.sleep(10)
-
 # Test 3: Very simple high-contrast test
 print("4. Final test: High contrast")
 img = Image.new('RGB', (display.width, display.height), color=(255, 255, 255))
 draw = ImageDraw.Draw(img)
 
-try:
-    big_font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 40)
-except:
-    big_font = ImageFont.load_default()
+big_font = config.get_font(40)
 
 draw.text((30, 100), "WORKING", font=big_font, fill=(0, 0, 0))
 display.display(img)
 print("   → White screen with 'WORKING' text")
-time.sleep(5)
+hold(5)
 
 # Clear
 img = Image.new('RGB', (display.width, display.height), color=(0, 0, 0))
@@ -7,12 +7,15 @@ Tests the new features:
 - User sheet format with statistics
 """
 
+import io
 import os
 import sys
 from datetime import datetime, timedelta
 from attendance_tracker import AttendanceTracker
 from openpyxl import load_workbook
 
+HEADER_ROWS = 2  # Title and column rows above day 1 in a user's monthly sheet
+
 def print_section(title):
     """Print a formatted section header"""
     print("\n" + "=" * 70)
@@ -32,9 +35,10 @@ def test_enhanced_features():
     
     print_section("TEST 1: User ID Generation")
     print("\nGenerating unique IDs for users...")
-    for user in test_users:
-        user_id = tracker._get_or_create_user_id(user)
-        print(f"  {user:12} → {user_id}")
+    lines = []
+    for user, user_id in tracker._get_or_create_user_ids(test_users).items():
+        lines.append(f"  {user:12} → {user_id}\n")
+    sys.stdout.write(''.join(lines))
     
     print_section("TEST 2: Recording Multiple Check-ins")
     print("\nSimulating check-ins at different times...")
@@ -72,6 +76,8 @@ def test_enhanced_features():
     print(f"\n{'User':<12} {'Status':<8} {'In':<10} {'Out':<10} {'Total':<12} {'Late':<8} {'OT':<8}")
     print("-" * 70)
     
+    # Build the table, then write it in one call
+    lines = []
     for user, info in status.items():
         check_in = info.get('check_in_time') or 'N/A'
         check_out = info.get('check_out_time') or 'N/A'
@@ -79,65 +85,70 @@ def test_enhanced_features():
         time_late = info.get('time_late', '0m')
         time_ot = info.get('time_ot', '0m')
         
-        print(f"{user:<12} {info['status']:<8} {check_in:<10} "
-              f"{check_out:<10} {duration:<12} "
-              f"{time_late:<8} {time_ot:<8}")
+        lines.append(f"{user:<12} {info['status']:<8} {check_in:<10} "
+                     f"{check_out:<10} {duration:<12} "
+                     f"{time_late:<8} {time_ot:<8}\n")
+    sys.stdout.write(''.join(lines))
     
     print_section("TEST 5: Today's Attendance Records")
     
     records = tracker.get_today_attendance()
+    lines = []
     for record in records:
-        print(f"\n  {record['Name']} (Status: {record['Status']})")
-        print(f"    Date: {record['Date']}")
-        print(f"    In:   {record['Time In']}")
-        print(f"    Out:  {record['Time Out']}")
-        print(f"    Work: {record['Total']}")
-        print(f"    Late: {record['Time Late']}")
-        print(f"    OT:   {record['Time OT']}")
+        lines.append(f"\n  {record['Name']} (Status: {record['Status']})\n"
+                     f"    Date: {record['Date']}\n"
+                     f"    In:   {record['Time In']}\n"
+                     f"    Out:  {record['Time Out']}\n"
+                     f"    Work: {record['Total']}\n"
+                     f"    Late: {record['Time Late']}\n"
+                     f"    OT:   {record['Time OT']}\n")
+    sys.stdout.write(''.join(lines))
     
     print_section("TEST 6: Excel File Structure Analysis")
     
     test_file = tracker.attendance_file
+    tracker.export_to_xlsx()  # Flush background Excel writes
     
     if not os.path.exists(test_file):
         print("  ✗ Attendance file not found!")
         return
     
-    wb = load_workbook(test_file)
+    # Loaded once (streaming, values only) and reused by TEST 8; read from an in-memory
+    # copy because read-only sheets keep reading the file, which TEST 8 rewrites
+    with open(test_file, 'rb') as f:
+        wb = load_workbook(io.BytesIO(f.read()), read_only=True, data_only=True)
     
     print(f"\nFile: {test_file}")
     print(f"Total Sheets: {len(wb.sheetnames)}")
     
+    # Collect the report while scanning and print it once the scan is done
+    out = io.StringIO()
     for sheet_name in wb.sheetnames:
         if sheet_name == 'Template':
             continue
         
         ws = wb[sheet_name]
-        print(f"\n  📄 Sheet: {sheet_name}")
+        print(f"\n  📄 Sheet: {sheet_name}", file=out)
         
         # Print header (row 1)
-        header = ws['A1'].value
-        print(f"     Header: {header}")
+        header = next(ws.iter_rows(max_row=1, max_col=1, values_only=True), (None,))[0]
+        print(f"     Header: {header}", file=out)
         
-        # Count attendance records
-        today = datetime.now().strftime('%Y-%m-%d')
+        # Count attendance records; the sheet is a calendar, so today's row is at a fixed offset
+        now = datetime.now()
+        today = now.strftime('%Y-%m-%d')
+        today_row = HEADER_ROWS + now.day
         attendance_count = 0
         
-        for row in ws.iter_rows(min_row=3, max_row=ws.max_row):
-            if row[0].value == today and row[2].value:  # Has date and check-in
+        for row in ws.iter_rows(min_row=today_row, max_row=today_row, max_col=8, values_only=True):
+            date, day, time_in, time_out, total, status_val, late, ot = row  # max_col pads to 8
+            if date == today and time_in:  # Has date and check-in
                 attendance_count += 1
-                date = row[0].value
-                day = row[1].value
-                time_in = row[2].value
-                time_out = row[3].value
-                total = row[4].value
-                status_val = row[5].value
-                late = row[6].value
-                ot = row[7].value
                 
-                print(f"     Today: {date} ({day})")
-                print(f"       In: {time_in}, Out: {time_out}, Total: {total}")
-                print(f"       Status: {status_val}, Late: {late}, OT: {ot}")
+                print(f"     Today: {date} ({day})", file=out)
+                print(f"       In: {time_in}, Out: {time_out}, Total: {total}", file=out)
+                print(f"       Status: {status_val}, Late: {late}, OT: {ot}", file=out)
+    sys.stdout.write(out.getvalue())
     
     print_section("TEST 7: User IDs File Verification")
     
@@ -154,12 +165,12 @@ def test_enhanced_features():
     print_section("TEST 8: Monthly Summary (Simulated)")
     
     print("\nUpdating monthly summaries for all users...")
+    tracker.update_monthly_summaries(test_users)
     for user in test_users:
-        tracker.update_monthly_summary(user)
         print(f"  ✓ Updated summary for {user}")
     
-    # Reload and show summaries
-    wb = load_workbook(test_file)
+    # Show summaries from the workbook loaded in TEST 6 (record_event already keeps
+    # them current, so the update above writes the same values)
     for sheet_name in wb.sheetnames:
         if sheet_name == 'Template' or '_' not in sheet_name:
             continue
@@ -171,21 +182,23 @@ def test_enhanced_features():
         print(f"\n  📊 {user_name}'s Monthly Summary:")
         
         found_summary = False
-        for row_idx in range(1, ws.max_row + 1):
-            cell_value = ws.cell(row_idx, 1).value
-            if cell_value and 'MONTHLY SUMMARY' in str(cell_value):
-                summary_start = row_idx + 1
+        rows = ws.iter_rows(max_col=5, values_only=True)
+        for row in rows:
+            if row and row[0] and 'MONTHLY SUMMARY' in str(row[0]):
                 found_summary = True
                 
+                # The three summary rows follow the title
+                summary = [next(rows, ()) for _ in range(3)]
+                
                 # Read summary data (check if cells exist)
                 try:
-                    print(f"     Total Working Days:  {ws.cell(summary_start, 2).value or 0}")
-                    print(f"     Total Hours Worked:  {ws.cell(summary_start, 5).value or '0m'}")
-                    print(f"     Days Late:           {ws.cell(summary_start + 1, 2).value or 0}")
-                    print(f"     Total Late Time:     {ws.cell(summary_start + 1, 5).value or '0m'}")
-                    print(f"     Days with OT:        {ws.cell(summary_start + 2, 2).value or 0}")
-                    print(f"     Total OT:            {ws.cell(summary_start + 2, 5).value or '0m'}")
-                except:
+                    print(f"     Total Working Days:  {summary[0][1] or 0}")
+                    print(f"     Total Hours Worked:  {summary[0][4] or '0m'}")
+                    print(f"     Days Late:           {summary[1][1] or 0}")
+                    print(f"     Total Late Time:     {summary[1][4] or '0m'}")
+                    print(f"     Days with OT:        {summary[2][1] or 0}")
+                    print(f"     Total OT:            {summary[2][4] or '0m'}")
+                except IndexError:
                     print("     (Summary data not available)")
                 break
         
@@ -7,6 +7,8 @@ Demonstrates the new enrollment features
 from attendance_tracker import AttendanceTracker
 from openpyxl import load_workbook
 import os
+import sys
+import textwrap
 
 print("╔══════════════════════════════════════════════════════════════╗")
 print("║        USER ENROLLMENT WITH ID - FEATURE TEST                ║")
@@ -28,8 +30,11 @@ print("Current enrolled users:")
 print(f"\n{'#':<5} {'Name':<20} {'User ID':<15}")
 print("-" * 40)
 
-for idx, (name, user_id) in enumerate(sorted(tracker.user_ids.items()), 1):
-    print(f"{idx:<5} {name:<20} {user_id:<15}")
+# Build the table, then write it in one call
+items = sorted(tracker.user_ids.items())
+rows = [f"{idx:<5} {name:<20} {user_id:<15}" for idx, (name, user_id) in enumerate(items, 1)]
+if rows:
+    sys.stdout.write("\n".join(rows) + "\n")
 
 print()
 print("=" * 70)
@@ -60,15 +65,16 @@ if os.path.exists(excel_file):
         print("-" * 70)
         
         # Display data
+        lines = []
         for row_idx, row in enumerate(ws.iter_rows(min_row=2, values_only=True), 2):
             if row[0] and isinstance(row[0], str) and row[0] != 'Total Users:':
                 # Data row
-                print(f"  {row[0]:<5} {row[1]:<20} {row[2]:<15} {row[3]:<15} {row[4]}")
+                lines.append(f"  {row[0]:<5} {row[1]:<20} {row[2]:<15} {row[3]:<15} {row[4]}\n")
             elif row[0] == 'Total Users:':
                 # Summary row
-                print()
-                print(f"  {row[0]} {row[2]}")
+                lines.append(f"\n  {row[0]} {row[2]}\n")
                 break
+        sys.stdout.write(''.join(lines))
         
         print()
         print("✓ User Directory sheet successfully created/updated!")
@@ -93,9 +99,7 @@ if os.path.exists('data/user_ids.csv'):
     with open('data/user_ids.csv', 'r') as f:
         content = f.read()
         print("   Content:")
-        for line in content.split('\n'):
-            if line:
-                print(f"   {line}")
+        sys.stdout.write(textwrap.indent(content.strip('\n') + '\n', "   "))
 
 print()
 print("2. Excel File (data/attendance.xlsx - 'User Directory' sheet):")
@@ -7,6 +7,15 @@ This will test the LCD 5110 connection and display functionality
 import time
 import sys
 
+# --fast: shorten every pause to 0.1 s (automated runs; the pauses are only for watching)
+FAST = '--fast' in sys.argv
+
+
+def hold(seconds):
+    """Pause so the screen can be checked by eye"""
+    time.sleep(min(seconds, 0.1) if FAST else seconds)
+
+
 print("=" * 50)
 print("Nokia LCD 5110 Test Script")
 print("=" * 50)
@@ -18,6 +27,7 @@ try:
     import busio
     import digitalio
     from PIL import Image, ImageDraw, ImageFont
+    from pcd8544_fast import pil_to_pcd8544
     LIBRARY = "adafruit_pcd8544"
     print(f"✓ Using {LIBRARY} library")
 except ImportError:
@@ -70,7 +80,7 @@ try:
     print("\nTest 1: Filling screen...")
     display.fill(1)
     display.show()
-    time.sleep(2)
+    hold(2)
     
     print("✓ Screen filled")
     
@@ -78,14 +88,19 @@ try:
     print("\nTest 2: Clearing screen...")
     display.fill(0)
     display.show()
-    time.sleep(1)
+    hold(1)
     print("✓ Screen cleared")
     
-    # Test 3: Draw some shapes
-    print("\nTest 3: Drawing shapes...")
+    # One image and drawing context for every test; each test clears it first
     image = Image.new('1', (display.width, display.height))
     draw = ImageDraw.Draw(image)
     
+    def clear_image():
+        draw.rectangle((0, 0, display.width, display.height), fill=0)
+    
+    # Test 3: Draw some shapes
+    print("\nTest 3: Drawing shapes...")
+    
     # Rectangle
     draw.rectangle((0, 0, display.width-1, display.height-1), outline=1)
     draw.rectangle((2, 2, display.width-3, display.height-3), outline=1)
@@ -96,13 +111,12 @@ try:
     
     display.image(image)
     display.show()
-    time.sleep(2)
+    hold(2)
     print("✓ Shapes drawn")
     
     # Test 4: Display text
     print("\nTest 4: Displaying text...")
-    image = Image.new('1', (display.width, display.height))
-    draw = ImageDraw.Draw(image)
+    clear_image()
     
     # Try to use default font
     draw.text((0, 0), "Nokia 5110", fill=1)
@@ -112,37 +126,40 @@ try:
     
     display.image(image)
     display.show()
-    time.sleep(3)
+    hold(3)
     print("✓ Text displayed")
     
     # Test 5: Invert display
     print("\nTest 5: Testing invert...")
     display.invert = True
-    time.sleep(1)
+    hold(1)
     display.invert = False
-    time.sleep(1)
+    hold(1)
     print("✓ Invert test complete")
     
     # Test 6: Animation
     print("\nTest 6: Simple animation...")
+    
+    # Render and pack every frame up front so the loop only copies bytes and sends them
+    frames = []
     for i in range(10):
-        image = Image.new('1', (display.width, display.height))
-        draw = ImageDraw.Draw(image)
+        clear_image()
         
         # Moving circle
         x = int(i * 7.4)  # 74 / 10
         draw.ellipse((x, 14, x+20, 34), outline=1, fill=0)
-        
-        display.image(image)
+        frames.append(pil_to_pcd8544(image))
+    
+    for frame in frames:
+        display.buffer[:] = frame
         display.show()
-        time.sleep(0.1)
+        hold(0.1)
     
     print("✓ Animation complete")
     
     # Final success message
     print("\n" + "=" * 50)
-    image = Image.new('1', (display.width, display.height))
-    draw = ImageDraw.Draw(image)
+    clear_image()
     draw.rectangle((0, 0, display.width-1, display.height-1), outline=1)
     draw.text((10, 10), "SUCCESS!", fill=1)
     draw.text((15, 25), "LCD OK", fill=1)
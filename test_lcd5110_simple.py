@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Simple Nokia LCD 5110 Test using Raw SPI
-No external libraries required - uses built-in spidev and RPi.GPIO
+Uses spidev, RPi.GPIO and numpy directly (numba optional) - no display library required
 """
 
 import time
@@ -13,15 +13,24 @@ print("=" * 50)
 
 # Check for required libraries
 try:
+    import numpy as np
     import spidev
     import RPi.GPIO as GPIO
-    print("✓ Required libraries found (spidev, RPi.GPIO)")
+    from pcd8544_fast import FRAME_BYTES, pil_to_pcd8544
+    print("✓ Required libraries found (numpy, spidev, RPi.GPIO)")
 except ImportError as e:
     print(f"\n❌ Missing library: {e}")
     print("\nInstall with:")
-    print("  sudo apt-get install python3-spidev python3-rpi.gpio")
+    print("  sudo apt-get install python3-numpy python3-spidev python3-rpi.gpio")
     sys.exit(1)
 
+# Optional: numba compiles the pattern loops (plain Python otherwise)
+try:
+    from numba import njit
+except ImportError:
+    def njit(**kwargs):
+        return lambda f: f
+
 # Pin Configuration
 PIN_DC = 23    # Data/Command
 PIN_RST = 24   # Reset
@@ -31,6 +40,49 @@ PIN_CS = 8     # Chip Select (CE0)
 LCD_CMD = 0
 LCD_DATA = 1
 
+# Basic 5x7 font for numbers and letters (simplified)
+FONT = {
+    'H': [0x7F, 0x08, 0x08, 0x08, 0x7F],
+    'E': [0x7F, 0x49, 0x49, 0x49, 0x41],
+    'L': [0x7F, 0x40, 0x40, 0x40, 0x40],
+    'O': [0x3E, 0x41, 0x41, 0x41, 0x3E],
+    '!': [0x00, 0x00, 0x5F, 0x00, 0x00],
+    ' ': [0x00, 0x00, 0x00, 0x00, 0x00],
+    'K': [0x7F, 0x08, 0x14, 0x22, 0x41],
+}
+
+# ASCII code -> 5 glyph columns + 1 spacer column; characters without a glyph are skipped
+FONT_TABLE = np.zeros((128, 6), dtype=np.uint8)
+FONT_KNOWN = np.zeros(128, dtype=bool)
+for _char, _columns in FONT.items():
+    FONT_TABLE[ord(_char), :5] = _columns
+    FONT_KNOWN[ord(_char)] = True
+
+
+@njit(cache=True)
+def _fill_pattern(buf, pattern_num):
+    """
+    Compute a test pattern into a frame buffer (compiled when numba is installed)
+    
+    Args:
+        buf: uint8 array of FRAME_BYTES
+        pattern_num: 1 = checkerboard, 2 = horizontal lines, 3 = vertical lines
+        
+    Returns:
+        False if the pattern number is unknown
+    """
+    if pattern_num < 1 or pattern_num > 3:
+        return False
+    for i in range(buf.shape[0]):
+        if pattern_num == 1:
+            buf[i] = 0xAA if i % 2 == 0 else 0x55
+        elif pattern_num == 2:
+            buf[i] = 0xFF if (i // 84) % 2 == 0 else 0x00
+        else:
+            buf[i] = 0xAA
+    return True
+
+
 print("\nPin Configuration:")
 print(f"  DC  (Data/Command) -> GPIO {PIN_DC}")
 print(f"  RST (Reset)        -> GPIO {PIN_RST}")
@@ -42,7 +94,8 @@ print("  GND                -> GND")
 print("  LED (Backlight)    -> 3.3V")
 
 class LCD5110:
-    def __init__(self, dc_pin=PIN_DC, rst_pin=PIN_RST, spi_bus=0, spi_device=0):
+    def __init__(self, dc_pin=PIN_DC, rst_pin=PIN_RST, spi_bus=0, spi_device=0,
+                 spi_hz=8000000):
         self.dc_pin = dc_pin
         self.rst_pin = rst_pin
         self.width = 84
@@ -57,8 +110,22 @@ class LCD5110:
         # Setup SPI
         self.spi = spidev.SpiDev()
         self.spi.open(spi_bus, spi_device)
-        self.spi.max_speed_hz = 4000000
-        self.spi.mode = 0
+        # The datasheet rates 4 MHz but most modules run fine at 8 MHz; use bench_speed() to check
+        self.spi.max_speed_hz = spi_hz
+        self.spi.mode = 0b00
+        # Leave no_cs False: CE0 must stay asserted for the whole bulk frame transfer
+        
+        # writebytes2 (spidev >= 3.5) reads any buffer (bytes, bytearray, memoryview) without
+        # converting each byte; older spidev only has xfer2, which needs a list
+        if hasattr(self.spi, 'writebytes2'):
+            self._spi_write = self.spi.writebytes2
+        else:
+            self._spi_write = lambda buf: self.spi.xfer2(list(buf))
+        
+        # Python-side frame; draw into it, then flush() sends it in one transfer
+        self._framebuf = bytearray(FRAME_BYTES)
+        self._framebuf_view = memoryview(self._framebuf)  # Passed to SPI without a copy
+        self._framebuf_np = np.frombuffer(self._framebuf, dtype=np.uint8)  # Writable view
         
         # Initialize display
         self._reset()
@@ -70,84 +137,110 @@ class LCD5110:
         time.sleep(0.1)
         GPIO.output(self.rst_pin, GPIO.HIGH)
     
-    def _write(self, data, is_data=False):
-        """Write command or data"""
+    def _bulk(self, buf, is_data):
+        """Send a block of bytes with one DC change and one SPI transfer"""
         GPIO.output(self.dc_pin, GPIO.HIGH if is_data else GPIO.LOW)
-        if isinstance(data, int):
-            data = [data]
-        self.spi.xfer2(data)
+        self._spi_write(buf)
+    
+    def _data_bulk(self, buf):
+        """Send a block of display data"""
+        self._bulk(buf, True)
+    
+    def _cmd_bulk(self, cmd_bytes):
+        """Send a sequence of commands"""
+        self._bulk(cmd_bytes, False)
+    
+    def _write_frame(self, buf):
+        """Send a full frame starting at the top-left corner"""
+        self._cmd_bulk(bytes([0x80, 0x40]))  # Set X and Y address to 0
+        self._data_bulk(buf)
+    
+    def flush(self):
+        """Send the frame buffer to the display"""
+        self._write_frame(self._framebuf_view)
+    
+    def display_image(self, image):
+        """Show an 84x48 PIL image"""
+        self._framebuf[:] = pil_to_pcd8544(image)
+        self.flush()
     
     def _init(self):
         """Initialize LCD with proper settings"""
-        self._write(0x21)  # Extended commands
-        self._write(0xB8)  # Set Vop (contrast) - try values 0xB0 to 0xBF
-        self._write(0x04)  # Set temperature coefficient
-        self._write(0x14)  # Set bias mode
-        self._write(0x20)  # Basic commands
-        self._write(0x0C)  # Display normal mode
+        self._cmd_bulk(bytes([
+            0x21,  # Extended commands
+            0xB8,  # Set Vop (contrast) - try values 0xB0 to 0xBF
+            0x04,  # Set temperature coefficient
+            0x14,  # Set bias mode
+            0x20,  # Basic commands
+            0x0C,  # Display normal mode
+        ]))
     
     def clear(self):
         """Clear the display"""
-        self._write(0x80)  # Set X address to 0
-        self._write(0x40)  # Set Y address to 0
-        # Send 504 bytes (84*48/8) of zeros
-        for i in range(504):
-            self._write(0x00, is_data=True)
+        self._framebuf_np.fill(0x00)
+        self.flush()
     
     def fill(self):
         """Fill the display"""
-        self._write(0x80)  # Set X address to 0
-        self._write(0x40)  # Set Y address to 0
-        # Send 504 bytes of 0xFF
-        for i in range(504):
-            self._write(0xFF, is_data=True)
+        self._framebuf_np.fill(0xFF)
+        self.flush()
+    
+    def set_pixel(self, x, y, on=True):
+        """Set one pixel in the frame buffer (call flush() to show it)"""
+        index = (y // 8) * self.width + x
+        bit = 1 << (y % 8)
+        if on:
+            self._framebuf[index] |= bit
+        else:
+            self._framebuf[index] &= ~bit & 0xFF
+    
+    def bench_speed(self, speeds=(4000000, 8000000, 16000000), frames=100):
+        """
+        Time full-frame transfers at each SPI speed
+        
+        Args:
+            speeds: SPI clock rates to try (Hz)
+            frames: Frames sent per speed
+            
+        Returns:
+            Dict of speed -> milliseconds per frame
+        """
+        original = self.spi.max_speed_hz
+        blank = bytes(FRAME_BYTES)
+        results = {}
+        try:
+            for speed in speeds:
+                self.spi.max_speed_hz = speed
+                start = time.perf_counter()
+                for _ in range(frames):
+                    self._write_frame(blank)
+                results[speed] = (time.perf_counter() - start) * 1000 / frames
+                print(f"  {speed / 1e6:.0f} MHz: {results[speed]:.2f} ms/frame")
+        finally:
+            self.spi.max_speed_hz = original
+        return results
     
     def set_contrast(self, contrast):
         """Set contrast (0-127, typically 60-80)"""
-        self._write(0x21)  # Extended commands
-        self._write(0x80 | contrast)  # Set Vop
-        self._write(0x20)  # Basic commands
+        # Extended commands, set Vop, back to basic commands
+        self._cmd_bulk(bytes([0x21, 0x80 | contrast, 0x20]))
     
     def display_pattern(self, pattern_num=1):
         """Display test patterns"""
-        self._write(0x80)  # Set X address to 0
-        self._write(0x40)  # Set Y address to 0
-        
-        if pattern_num == 1:
-            # Checkerboard
-            for i in range(504):
-                self._write(0xAA if (i % 2 == 0) else 0x55, is_data=True)
-        elif pattern_num == 2:
-            # Horizontal lines
-            for i in range(504):
-                self._write(0xFF if ((i // 84) % 2 == 0) else 0x00, is_data=True)
-        elif pattern_num == 3:
-            # Vertical lines
-            for i in range(504):
-                self._write(0xAA, is_data=True)
+        if _fill_pattern(self._framebuf_np, pattern_num):
+            self.flush()
     
     def write_text(self, text, x=0, y=0):
         """Simple text display using basic font"""
-        # Basic 5x7 font for numbers and letters (simplified)
-        font = {
-            'H': [0x7F, 0x08, 0x08, 0x08, 0x7F],
-            'E': [0x7F, 0x49, 0x49, 0x49, 0x41],
-            'L': [0x7F, 0x40, 0x40, 0x40, 0x40],
-            'O': [0x3E, 0x41, 0x41, 0x41, 0x3E],
-            '!': [0x00, 0x00, 0x5F, 0x00, 0x00],
-            ' ': [0x00, 0x00, 0x00, 0x00, 0x00],
-            'K': [0x7F, 0x08, 0x14, 0x22, 0x41],
-        }
+        # One glyph table lookup for the whole string, sent in one transfer
+        codes = np.frombuffer(text.upper().encode('ascii', 'replace'), dtype=np.uint8)
+        codes = codes[FONT_KNOWN[codes]]  # Non-ASCII became '?', which has no glyph
         
-        # Set position
-        self._write(0x80 | x)  # X
-        self._write(0x40 | y)  # Y
+        # Set position (X, Y)
+        self._cmd_bulk(bytes([0x80 | x, 0x40 | y]))
         
-        for char in text.upper():
-            if char in font:
-                for byte in font[char]:
-                    self._write(byte, is_data=True)
-                self._write(0x00, is_data=True)  # Space between chars
+        if len(codes):
+            self._data_bulk(FONT_TABLE[codes].tobytes())
     
     def cleanup(self):
         """Cleanup GPIO"""
@@ -26,8 +26,9 @@ def test_new_format():
     print("TEST 1: Recording CHECK-INs for multiple users")
     print("=" * 60)
     
-    for user in test_users:
-        result = tracker.record_event(user, 'CHECK_IN')
+    # One database transaction (and one coalesced workbook save) for the whole batch
+    results = tracker.record_events_batch([(user, 'CHECK_IN', 1.0) for user in test_users])
+    for user, result in zip(test_users, results):
         print(f"✓ {user} checked in: {result}")
     
     print("\n" + "=" * 60)
@@ -42,8 +43,9 @@ def test_new_format():
     print("TEST 3: Recording CHECK-OUTs for users")
     print("=" * 60)
     
-    for user in test_users[:2]:  # Only check out first 2 users
-        result = tracker.record_event(user, 'CHECK_OUT')
+    checkout_users = test_users[:2]  # Only check out first 2 users
+    results = tracker.record_events_batch([(user, 'CHECK_OUT', 1.0) for user in checkout_users])
+    for user, result in zip(checkout_users, results):
         print(f"✓ {user} checked out: {result}")
     
     print("\n" + "=" * 60)
@@ -68,6 +70,7 @@ def test_new_format():
     
     from openpyxl import load_workbook
     test_file = tracker.attendance_file
+    tracker.export_to_xlsx()  # Flush background Excel writes
     wb = load_workbook(test_file)
     
     print(f"Total sheets: {len(wb.sheetnames)}")
@@ -83,15 +86,16 @@ def test_new_format():
         print(f"  Title: {ws['A1'].value}")
         
         # Print column headers
-        headers = [cell.value for cell in ws[2]]
+        headers = list(next(ws.iter_rows(min_row=2, max_row=2, values_only=True)))
         print(f"  Headers: {headers}")
         
         # Count filled rows (today's attendance)
         filled_rows = 0
-        for row in ws.iter_rows(min_row=3, max_row=ws.max_row):
-            if row[2].value or row[3].value:  # Has check-in or check-out
+        for row_idx, row in enumerate(ws.iter_rows(min_row=3, max_col=8, values_only=True), start=3):
+            date, _, time_in, time_out, total = row[:5]  # max_col pads short rows with None
+            if time_in or time_out:  # Has check-in or check-out
                 filled_rows += 1
-                print(f"  Row {row[0].row}: Date={row[0].value}, In={row[2].value}, Out={row[3].value}, Total={row[4].value}")
+                print(f"  Row {row_idx}: Date={date}, In={time_in}, Out={time_out}, Total={total}")
         
         if filled_rows == 0:
             print("  (No attendance recorded today)")
@@ -4,10 +4,12 @@ SPI Pin Tester for Multimeter
 Continuously sends data to SPI to create measurable signals
 """
 
+import sys
 import time
 import spidev
 from PIL import Image
 import st7789
+import st7789_fast
 
 print("="*70)
 print("SPI PIN TESTER - FOR MULTIMETER MEASUREMENT")
@@ -56,38 +58,57 @@ colors = [
     (0, 255, 255),  # Cyan
 ]
 
+# Printed every 10 iterations; built once so each reminder is a single write
+PIN_TABLE = (
+    "  MEASURE THESE PINS NOW:\n"
+    "  ┌─────────────────────────────────────────────┐\n"
+    "  │ Pin │ GPIO │ Signal │ Expected Reading     │\n"
+    "  ├─────────────────────────────────────────────┤\n"
+    "  │ 23  │  11  │  SCL   │ Fluctuating 0-3.3V  │\n"
+    "  │ 19  │  10  │  SDA   │ Fluctuating 0-3.3V  │\n"
+    "  │ 24  │   8  │  CS    │ Toggles 0V/3.3V     │\n"
+    "  │ 22  │  25  │  DC    │ Toggles 0V/3.3V     │\n"
+    "  │ 18  │  24  │  RST   │ Steady ~3.3V        │\n"
+    "  │ 12  │  18  │  BL    │ Steady ~3.3V        │\n"
+    "  └─────────────────────────────────────────────┘\n"
+)
+FRAME_INTERVAL = 0.5  # Seconds between frames
+
+# The colors never change, so render each frame once up front: packed RGB565 bytes
+# when frames can go straight to spidev, otherwise PIL images for display()
+direct_write = st7789_fast.supports_direct_write(display)
+palette = []
+for color in colors:
+    img = Image.new('RGB', (240, 240), color=color)
+    palette.append(st7789_fast.image_to_rgb565(img, display._rotation) if direct_write else img)
+
 color_idx = 0
 
 try:
     iteration = 0
+    next_frame = time.monotonic()
     while True:
         iteration += 1
         
         # Cycle through colors
         color = colors[color_idx % len(colors)]
+        frame = palette[color_idx % len(colors)]
         color_idx += 1
         
         # Create and display image (this sends SPI data)
-        img = Image.new('RGB', (240, 240), color=color)
-        display.display(img)
+        if direct_write:
+            st7789_fast.write_frame(display, frame)
+        else:
+            display.display(frame)
         
         if iteration % 10 == 1:
-            print(f"\n[Iteration {iteration}] Sending data...")
-            print(f"  Color: RGB{color}")
-            print()
-            print("  MEASURE THESE PINS NOW:")
-            print("  ┌─────────────────────────────────────────────┐")
-            print("  │ Pin │ GPIO │ Signal │ Expected Reading     │")
-            print("  ├─────────────────────────────────────────────┤")
-            print("  │ 23  │  11  │  SCL   │ Fluctuating 0-3.3V  │")
-            print("  │ 19  │  10  │  SDA   │ Fluctuating 0-3.3V  │")
-            print("  │ 24  │   8  │  CS    │ Toggles 0V/3.3V     │")
-            print("  │ 22  │  25  │  DC    │ Toggles 0V/3.3V     │")
-            print("  │ 18  │  24  │  RST   │ Steady ~3.3V        │")
-            print("  │ 12  │  18  │  BL    │ Steady ~3.3V        │")
-            print("  └─────────────────────────────────────────────┘")
+            sys.stdout.write(f"\n[Iteration {iteration}] Sending data...\n"
+                             f"  Color: RGB{color}\n\n{PIN_TABLE}")
+            sys.stdout.flush()
         
-        time.sleep(0.5)  # Half second delay
+        # Fixed frame rate: the time spent drawing and printing comes out of the wait
+        next_frame += FRAME_INTERVAL
+        time.sleep(max(0.0, next_frame - time.monotonic()))
 
 except KeyboardInterrupt:
     print("\n\n" + "="*70)
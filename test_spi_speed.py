@@ -3,8 +3,10 @@
 Try lower SPI speed - some displays can't handle 80MHz
 """
 import st7789
-from PIL import Image, ImageDraw, ImageFont
+import st7789_fast
+from PIL import Image, ImageDraw
 import time
+import config
 
 speeds = [
     (10 * 1000000, "10 MHz - Very Slow"),
@@ -36,15 +38,12 @@ for speed, desc in speeds:
         img = Image.new('RGB', (240, 240), color=(0, 255, 0))  # Green
         draw = ImageDraw.Draw(img)
         
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 30)
-        except:
-            font = ImageFont.load_default()
+        font = config.get_font(30)  # Loaded once, reused for every speed
         
         draw.text((60, 100), desc.split('-')[0].strip(), 
                  font=font, fill=(255, 255, 255))
         
-        display.display(img)
+        st7789_fast.display_image(display, img)
         
         print(f"  → Image sent")
         print(f"  → Check display for GREEN screen")
@@ -5,8 +5,11 @@ Tests basic functionality, colors, and text display
 """
 
 import time
+import numpy as np
 import st7789
-from PIL import Image, ImageDraw, ImageFont
+from PIL import Image, ImageDraw
+import config
+import st7789_fast
 
 # Display configuration
 # Common ST7789 configurations:
@@ -25,15 +28,7 @@ def test_display():
     # - port, cs, dc, backlight, rst: SPI and GPIO pins
     
     try:
-        display = st7789.ST7789(
-            rotation=90,  # Adjust rotation (0, 90, 180, 270)
-            port=0,       # SPI port (SPI0)
-            cs=0,         # Chip select CE0 (GPIO 8, Pin 24)
-            dc=25,        # Data/Command pin (GPIO 25, Pin 22)
-            backlight=18, # Backlight pin (GPIO 18, Pin 12)
-            rst=24,       # Reset pin (GPIO 24, Pin 18)
-            spi_speed_hz=80 * 1000000  # 80 MHz SPI speed
-        )
+        display = st7789.ST7789(**config.ST7789_DISPLAY)
         
         print("✓ Display initialized successfully!")
         print(f"  Resolution: {display.width}x{display.height}")
@@ -70,21 +65,21 @@ def test_display():
     for name, color in colors:
         print(f"  Displaying {name}...")
         img = Image.new('RGB', (WIDTH, HEIGHT), color=color)
-        display.display(img)
+        st7789_fast.display_image(display, img)
         time.sleep(0.5)
     
     print("✓ Color test complete")
     
     # Test 2: Gradient
     print("\n[Test 2/6] Testing gradient...")
-    img = Image.new('RGB', (WIDTH, HEIGHT))
-    draw = ImageDraw.Draw(img)
-    
-    for x in range(WIDTH):
-        color = int((x / WIDTH) * 255)
-        draw.line([(x, 0), (x, HEIGHT)], fill=(color, 0, 255 - color))
-    
-    display.display(img)
+    # Red rises and blue falls left to right; every row is the same
+    red = (np.arange(WIDTH) * 255 // WIDTH).astype(np.uint8)
+    arr = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    arr[:, :, 0] = red
+    arr[:, :, 2] = 255 - red
+    img = Image.fromarray(arr, 'RGB')
+    
+    st7789_fast.display_image(display, img)
     time.sleep(2)
     print("✓ Gradient test complete")
     
@@ -102,7 +97,7 @@ def test_display():
     # Line
     draw.line([(120, 120), (230, 220)], fill=(255, 255, 0), width=5)
     
-    display.display(img)
+    st7789_fast.display_image(display, img)
     time.sleep(2)
     print("✓ Shapes test complete")
     
@@ -111,13 +106,9 @@ def test_display():
     img = Image.new('RGB', (WIDTH, HEIGHT), color=(0, 50, 100))
     draw = ImageDraw.Draw(img)
     
-    # Try to load a font, fallback to default if not available
-    try:
-        font_large = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28)
-        font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-    except:
-        font_large = ImageFont.load_default()
-        font_small = ImageFont.load_default()
+    # Cached in config; falls back to the default font if DejaVu is missing
+    font_large = config.get_font(28)
+    font_small = config.get_font(16, bold=False)
     
     draw.text((10, 10), "ST7789 Display", font=font_large, fill=(255, 255, 255))
     draw.text((10, 50), "Test Successful!", font=font_small, fill=(0, 255, 0))
@@ -125,22 +116,22 @@ def test_display():
     draw.text((10, 110), "Raspberry Pi 3", font=font_small, fill=(255, 100, 255))
     draw.text((10, HEIGHT - 30), "SPI Display Working!", font=font_small, fill=(0, 255, 255))
     
-    display.display(img)
+    st7789_fast.display_image(display, img)
     time.sleep(3)
     print("✓ Text test complete")
     
     # Test 5: Pattern
     print("\n[Test 5/6] Testing checkerboard pattern...")
-    img = Image.new('RGB', (WIDTH, HEIGHT), color=(0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    
     square_size = 20
-    for y in range(0, HEIGHT, square_size):
-        for x in range(0, WIDTH, square_size):
-            if (x // square_size + y // square_size) % 2 == 0:
-                draw.rectangle([x, y, x + square_size, y + square_size], fill=(255, 255, 255))
-    
-    display.display(img)
+    # Broadcast a column of row bands against a row of column bands (no full-size index grids)
+    rows = np.arange(HEIGHT)[:, None] // square_size
+    cols = np.arange(WIDTH)[None, :] // square_size
+    white = ((rows ^ cols) & 1) == 0
+    arr = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    arr[white] = 255
+    img = Image.fromarray(arr, 'RGB')
+    
+    st7789_fast.display_image(display, img)
     time.sleep(2)
     print("✓ Pattern test complete")
     
@@ -150,9 +141,22 @@ def test_display():
     ball_dx, ball_dy = 5, 3
     ball_radius = 15
     
+    # One frame buffer; each frame only erases the ball's previous position
+    img = Image.new('RGB', (WIDTH, HEIGHT), color=(0, 0, 50))
+    draw = ImageDraw.Draw(img)
+    prev_x, prev_y = ball_x, ball_y
+    st7789_fast.display_image(display, img)  # Full background once; then only the ball's area is sent
+    
     for _ in range(50):  # 50 frames
-        img = Image.new('RGB', (WIDTH, HEIGHT), color=(0, 0, 50))
-        draw = ImageDraw.Draw(img)
+        draw.rectangle([prev_x - ball_radius - 1, prev_y - ball_radius - 1,
+                        prev_x + ball_radius + 1, prev_y + ball_radius + 1], fill=(0, 0, 50))
+        
+        # Dirty area: the erased old ball plus the new one, clipped to the screen
+        dirty = (max(0, min(prev_x, ball_x) - ball_radius - 1),
+                 max(0, min(prev_y, ball_y) - ball_radius - 1),
+                 min(WIDTH, max(prev_x, ball_x) + ball_radius + 2),
+                 min(HEIGHT, max(prev_y, ball_y) + ball_radius + 2))
+        prev_x, prev_y = ball_x, ball_y
         
         # Draw ball
         draw.ellipse([ball_x - ball_radius, ball_y - ball_radius,
@@ -169,7 +173,7 @@ def test_display():
         if ball_y <= ball_radius or ball_y >= HEIGHT - ball_radius:
             ball_dy = -ball_dy
         
-        display.display(img)
+        st7789_fast.write_region(display, img, dirty)
         time.sleep(0.02)
     
     print("✓ Animation test complete")
@@ -183,7 +187,7 @@ def test_display():
     draw = ImageDraw.Draw(img)
     draw.text((WIDTH//2 - 80, HEIGHT//2 - 20), "ALL TESTS", font=font_large, fill=(255, 255, 255))
     draw.text((WIDTH//2 - 60, HEIGHT//2 + 20), "PASSED!", font=font_large, fill=(0, 255, 0))
-    display.display(img)
+    st7789_fast.display_image(display, img)
     
     return True
 
@@ -193,26 +197,15 @@ def quick_test():
     print("Running quick test...")
     
     try:
-        display = st7789.ST7789(
-            rotation=90,
-            port=0,
-            cs=0,         # CE0 (GPIO 8, Pin 24)
-            dc=25,        # GPIO 25, Pin 22
-            backlight=18, # GPIO 18, Pin 12
-            rst=24,       # GPIO 24, Pin 18
-            spi_speed_hz=80 * 1000000
-        )
+        display = st7789.ST7789(**config.ST7789_DISPLAY)
         
         img = Image.new('RGB', (display.width, display.height), color=(0, 0, 255))
         draw = ImageDraw.Draw(img)
         
-        try:
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 32)
-        except:
-            font = ImageFont.load_default()
+        font = config.get_font(32)
         
         draw.text((20, display.height//2 - 20), "DISPLAY OK!", font=font, fill=(255, 255, 255))
-        display.display(img)
+        st7789_fast.display_image(display, img)
         
         print("✓ Quick test successful!")
         return True
@@ -2,13 +2,150 @@
 """
 View attendance Excel file structure and data
 Displays all sheets and their contents
+
+Reads the Parquet mirror (data/attendance.parquet) when pyarrow is installed;
+pass --legacy to read the Excel workbook with openpyxl instead, or --fast to
+stream the workbook's sheet XML directly (for multi-MB workbooks)
 """
 
 import os
+import re
+import zipfile
+import argparse
 from openpyxl import load_workbook
 from datetime import datetime
 
-def view_excel_file(file_path='data/attendance.xlsx'):
+try:
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# lxml parses several times faster than the stdlib parser; both provide iterparse
+try:
+    from lxml.etree import iterparse
+except ImportError:
+    from xml.etree.ElementTree import iterparse
+
+PARQUET_COLUMNS = ['date', 'day', 'first_in', 'last_out', 'total', 'status', 'late', 'ot', 'user']
+
+# SpreadsheetML namespaces used by the --fast reader
+XLSX_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+XLSX_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+# User monthly sheets are named <user>_<Month>_<year>, e.g. Linh_December_2024
+MONTH_SHEET_RE = re.compile(r'_(January|February|March|April|May|June|July|August|'
+                            r'September|October|November|December)_\d{4}$')
+
+def _column_index(cell_ref):
+    """0-based column of a cell reference such as 'C12'"""
+    index = 0
+    for ch in cell_ref:
+        if ch.isdigit():
+            break
+        index = index * 26 + ord(ch) - 64
+    return index - 1
+
+class XlsxStream:
+    """
+    Minimal streaming .xlsx reader for --fast: iterparses each sheet's XML straight
+    from the zip, clearing rows as it goes, with no openpyxl Cell objects.
+    Offers the small part of the Workbook API the viewers use.
+    """
+    
+    def __init__(self, file_path):
+        self._zip = zipfile.ZipFile(file_path)
+        self._shared = self._read_shared_strings()
+        self._paths = self._read_sheet_paths()
+        self.sheetnames = list(self._paths)
+    
+    def _read_shared_strings(self):
+        if 'xl/sharedStrings.xml' not in self._zip.namelist():
+            return []
+        strings = []
+        with self._zip.open('xl/sharedStrings.xml') as f:
+            for _, el in iterparse(f):
+                if el.tag == XLSX_NS + 'si':
+                    # Rich text splits one string over several <t> runs
+                    strings.append(''.join(t.text or '' for t in el.iter(XLSX_NS + 't')))
+                    el.clear()
+        return strings
+    
+    def _read_sheet_paths(self):
+        with self._zip.open('xl/_rels/workbook.xml.rels') as f:
+            targets = {el.get('Id'): el.get('Target') for _, el in iterparse(f)
+                       if el.tag == PKG_REL_NS + 'Relationship'}
+        paths = {}
+        with self._zip.open('xl/workbook.xml') as f:
+            for _, el in iterparse(f):
+                if el.tag == XLSX_NS + 'sheet':
+                    target = targets[el.get(XLSX_REL_NS + 'id')]
+                    paths[el.get('name')] = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+        return paths
+    
+    def __getitem__(self, sheet_name):
+        return _XmlSheet(self, self._paths[sheet_name])
+    
+    def _cell_value(self, cell):
+        cell_type = cell.get('t')
+        if cell_type == 'inlineStr':
+            return ''.join(t.text or '' for t in cell.iter(XLSX_NS + 't'))
+        text = cell.findtext(XLSX_NS + 'v')
+        if text is None:
+            return None
+        if cell_type == 's':
+            return self._shared[int(text)]
+        if cell_type in ('str', 'e'):
+            return text
+        if cell_type == 'b':
+            return text == '1'
+        number = float(text)
+        return int(number) if number.is_integer() else number
+    
+    def iter_rows(self, path, max_col=None):
+        """Yield each row as a tuple of values, padded like openpyxl's values_only rows"""
+        next_row = 1
+        with self._zip.open(path) as f:
+            for _, el in iterparse(f):
+                if el.tag != XLSX_NS + 'row':
+                    continue
+                
+                # Empty rows are left out of the XML; yield them as blanks
+                row_num = int(el.get('r', next_row))
+                while next_row < row_num:
+                    yield (None,) * (max_col or 0)
+                    next_row += 1
+                
+                values = []
+                for cell in el.iter(XLSX_NS + 'c'):
+                    col = _column_index(cell.get('r')) if cell.get('r') else len(values)
+                    if max_col is not None and col >= max_col:
+                        break
+                    values.extend([None] * (col - len(values)))
+                    values.append(self._cell_value(cell))
+                if max_col is not None:
+                    values.extend([None] * (max_col - len(values)))
+                
+                el.clear()
+                next_row += 1
+                yield tuple(values)
+    
+    def close(self):
+        self._zip.close()
+
+class _XmlSheet:
+    """One sheet of an XlsxStream (iter_rows only)"""
+    
+    def __init__(self, stream, path):
+        self._stream = stream
+        self._path = path
+    
+    def iter_rows(self, max_col=None, values_only=True):
+        return self._stream.iter_rows(self._path, max_col)
+
+def view_excel_file(file_path='data/attendance.xlsx', fast=False):
     """Display Excel file structure and contents"""
     
     if not os.path.exists(file_path):
@@ -19,7 +156,11 @@ def view_excel_file(file_path='data/attendance.xlsx'):
     print(f"ATTENDANCE FILE VIEWER: {file_path}")
     print("=" * 80)
     
-    wb = load_workbook(file_path)
+    if fast:
+        wb = XlsxStream(file_path)
+    else:
+        # Read-only streams each sheet's XML instead of building every Cell object
+        wb = load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
     
     print(f"\n📊 Total Sheets: {len(wb.sheetnames)}\n")
     
@@ -36,9 +177,7 @@ def view_excel_file(file_path='data/attendance.xlsx'):
             continue
         
         # Determine sheet type based on name
-        if '_' in sheet_name and any(month in sheet_name for month in 
-            ['January', 'February', 'March', 'April', 'May', 'June', 
-             'July', 'August', 'September', 'October', 'November', 'December']):
+        if MONTH_SHEET_RE.search(sheet_name):
             # New format - user monthly sheet
             view_monthly_sheet(ws, sheet_name)
         else:
@@ -50,6 +189,51 @@ def view_excel_file(file_path='data/attendance.xlsx'):
     wb.close()
     print("=" * 80)
 
+def view_parquet_file(file_path='data/attendance.parquet'):
+    """Display attendance from the Parquet mirror, grouped like the monthly sheets"""
+    
+    table = pq.ParquetFile(file_path).read(columns=PARQUET_COLUMNS)
+    table = table.filter(pc.field('first_in').is_valid() | pc.field('last_out').is_valid())
+    
+    print("=" * 80)
+    print(f"ATTENDANCE FILE VIEWER: {file_path}")
+    print("=" * 80)
+    
+    # Rows are written sorted by user then date, so each user-month is one run
+    today = datetime.now().strftime('%Y-%m-%d')
+    current = None
+    record_count = 0
+    
+    for row in table.to_pylist():
+        month = datetime.strptime(row['date'], '%Y-%m-%d').strftime('%B_%Y')
+        if (row['user'], month) != current:
+            if current is not None:
+                print()
+                print(f"   📈 Total days with attendance: {record_count}")
+                print()
+            current = (row['user'], month)
+            record_count = 0
+            print("=" * 80)
+            print(f"📄 {row['user']}_{month}")
+            print("=" * 80)
+            print(f"   User: {row['user']}")
+            print()
+        
+        record_count += 1
+        marker = " 👈 TODAY" if row['date'] == today else ""
+        print(f"   {row['date']} ({row['day']:3s}) | In: {row['first_in'] or '---':8s} | "
+              f"Out: {row['last_out'] or '---':8s} | Total: {row['total'] or '---':7s} | "
+              f"{row['status'] or '---':8s} | Late: {row['late'] or '---':4s} | "
+              f"OT: {row['ot'] or '---':4s}{marker}")
+    
+    if current is None:
+        print("   (No attendance recorded)")
+    else:
+        print()
+        print(f"   📈 Total days with attendance: {record_count}")
+    
+    print("=" * 80)
+
 def view_monthly_sheet(ws, sheet_name):
     """View a monthly per-user sheet (new format)"""
     
@@ -57,41 +241,38 @@ def view_monthly_sheet(ws, sheet_name):
     parts = sheet_name.split('_')
     user = parts[0] if parts else "Unknown"
     
+    # One pass over the sheet: title row, header row, then the day rows
+    # (max_col=8 pads every row to columns A-H)
+    rows = ws.iter_rows(max_col=8, values_only=True)
+    title = next(rows, (None,))[0]
+    headers = next(rows, ())
+    
     # Show header
-    title = ws['A1'].value
     print(f"   User: {user}")
     print(f"   Title: {title}")
     print()
     
     # Show column headers
-    headers = [cell.value for cell in ws[2]]
-    print("   Columns:", " | ".join(headers))
+    print("   Columns:", " | ".join(str(h) for h in headers if h))
     print("   " + "-" * 75)
     
     # Show attendance records (only rows with data)
-    today = datetime.now().strftime('%Y-%m-%d')
+    # The tracker writes dates as 'YYYY-MM-DD' text, but a sheet edited in Excel
+    # may hold real dates, which openpyxl returns as datetime objects
+    today = datetime.now().date()
+    today_str = today.isoformat()
     record_count = 0
     
-    for row in ws.iter_rows(min_row=3, values_only=True):
-        date_val = row[0]
-        first_in = row[2] if len(row) > 2 else None
-        last_out = row[3] if len(row) > 3 else None
-        
+    for date_val, day, first_in, last_out, total, status, late, ot in rows:
         # Only show rows with attendance data
         if first_in or last_out:
             record_count += 1
             
-            # Format row
-            day = row[1] if len(row) > 1 else ''
-            total = row[4] if len(row) > 4 else ''
-            status = row[5] if len(row) > 5 else ''
-            late = row[6] if len(row) > 6 else ''
-            ot = row[7] if len(row) > 7 else ''
-            
             # Highlight today
-            marker = " 👈 TODAY" if date_val == today else ""
+            day_key = date_val.date() if isinstance(date_val, datetime) else date_val
+            marker = " 👈 TODAY" if day_key == today_str or day_key == today else ""
             
-            print(f"   {date_val} ({day:3s}) | In: {first_in or '---':8s} | Out: {last_out or '---':8s} | "
+            print(f"   {day_key} ({day:3s}) | In: {first_in or '---':8s} | Out: {last_out or '---':8s} | "
                   f"Total: {total or '---':7s} | {status or '---':8s} | Late: {late or '---':4s} | "
                   f"OT: {ot or '---':4s}{marker}")
     
@@ -104,27 +285,50 @@ def view_monthly_sheet(ws, sheet_name):
 def view_generic_sheet(ws):
     """View a generic sheet (old format or summary)"""
     
-    print(f"   Total rows: {ws.max_row}")
-    print(f"   Total columns: {ws.max_column}")
+    # Stream the sheet once, keeping the first 10 data rows and counting the rest
+    rows = ws.iter_rows(values_only=True)
+    headers = next(rows, ())
+    total_rows = 1 if headers else 0
+    total_columns = len(headers)
+    sample = []
+    for row in rows:
+        total_rows += 1
+        total_columns = max(total_columns, len(row))
+        if total_rows <= 11:
+            sample.append((total_rows, row))
+    
+    print(f"   Total rows: {total_rows}")
+    print(f"   Total columns: {total_columns}")
     print()
     
     # Show first row (usually headers)
     print("   Headers:")
-    headers = [cell.value for cell in ws[1]]
     print("   ", " | ".join(str(h) for h in headers if h))
     print()
     
     # Show a few data rows
     print("   Sample data (first 10 rows):")
-    for idx, row in enumerate(ws.iter_rows(min_row=2, max_row=11, values_only=True), start=2):
-        if any(row):  # Only show non-empty rows
-            row_str = " | ".join(str(cell) if cell else "---" for cell in row)
-            print(f"   Row {idx}: {row_str}")
+    for idx, row in sample:
+        if all(cell is None for cell in row):  # Only show non-empty rows
+            continue
+        row_str = " | ".join("---" if cell is None else str(cell) for cell in row)
+        print(f"   Row {idx}: {row_str}")
     
-    if ws.max_row > 11:
-        print(f"   ... ({ws.max_row - 11} more rows)")
+    if total_rows > 11:
+        print(f"   ... ({total_rows - 11} more rows)")
 
 if __name__ == '__main__':
-    import sys
-    file_path = sys.argv[1] if len(sys.argv) > 1 else 'data/attendance.xlsx'
-    view_excel_file(file_path)
+    parser = argparse.ArgumentParser(description='View attendance data')
+    parser.add_argument('file_path', nargs='?', default='data/attendance.xlsx',
+                        help='Attendance workbook (default: data/attendance.xlsx)')
+    parser.add_argument('--legacy', action='store_true',
+                        help='Read the Excel workbook with openpyxl instead of the Parquet mirror')
+    parser.add_argument('--fast', action='store_true',
+                        help='Read the Excel workbook by streaming its sheet XML (large workbooks)')
+    args = parser.parse_args()
+    
+    parquet_path = os.path.splitext(args.file_path)[0] + '.parquet'
+    if not (args.legacy or args.fast) and PARQUET_AVAILABLE and os.path.exists(parquet_path):
+        view_parquet_file(parquet_path)
+    else:
+        view_excel_file(args.file_path, fast=args.fast)
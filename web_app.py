@@ -5,11 +5,15 @@ Works via browser - perfect for headless or remote Raspberry Pi
 
 from flask import Flask, render_template, Response, request, jsonify
 import cv2
+import numpy as np
+import queue
 import threading
+from collections import deque
 import time
 from datetime import datetime
 import os
 import json
+import zlib
 
 from face_detector import FaceDetector
 from face_recognizer import FaceRecognizer
@@ -20,6 +24,7 @@ import config
 # Try to import ST7789 for LCD display
 try:
     import st7789
+    from st7789_fast import display_changes, display_image
     from PIL import Image, ImageDraw, ImageFont
     LCD_AVAILABLE = True
     print("[INFO] ST7789 LCD display library loaded")
@@ -27,6 +32,13 @@ except Exception as e:
     LCD_AVAILABLE = False
     print(f"[INFO] ST7789 not available - LCD display disabled ({e})")
 
+# Production WSGI server for the video stream (falls back to Flask's development server)
+try:
+    from waitress import serve
+    WAITRESS_AVAILABLE = True
+except ImportError:
+    WAITRESS_AVAILABLE = False
+
 app = Flask(__name__)
 
 # Global state
@@ -38,7 +50,9 @@ class SystemState:
         self.camera = None
         self.running = False
         self.current_mode = None
-        self.logs = []
+        self.logs = deque(maxlen=100)  # (sequence number, line); old entries fall off the left
+        self.log_count = 0  # Logs ever added, the next sequence number
+        self._log_lock = threading.Lock()  # add_log runs on camera, enrollment and request threads
         self.last_recognition = {}
         self.last_attendance_name = None
         self.last_attendance_at = 0.0
@@ -46,7 +60,7 @@ class SystemState:
         # Enrollment state
         self.enrolling = False
         self.enroll_name = ""
-        self.enroll_images = []
+        self.enroll_images = []  # JPEG bytes of the captured frames
         self.enroll_progress = 0
         self.enrollment_success = False
         self.success_message = ""
@@ -59,70 +73,103 @@ class SystemState:
         self.lcd_running = False
         self.lcd_success_message = None
         self.lcd_success_until = 0
+        self._lcd_previous = None  # Last frame sent, so updates only push changed rows
+        # lcd_loop and camera_loop both draw; row diffs and SPI windows must not interleave
+        self._lcd_lock = threading.Lock()
         
         if LCD_AVAILABLE:
             try:
-                self.lcd_display = st7789.ST7789(
-                    rotation=90,
-                    port=0,
-                    cs=0,         # CE0 (GPIO 8, Pin 24)
-                    dc=25,        # GPIO 25, Pin 22
-                    backlight=18, # GPIO 18, Pin 12
-                    rst=24,       # GPIO 24, Pin 18
-                    spi_speed_hz=80 * 1000000
-                )
+                self.lcd_display = st7789.ST7789(**config.ST7789_DISPLAY)
                 # Load fonts - even bigger
-                try:
-                    self.lcd_font_title = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 28)
-                    self.lcd_font_name = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 24)
-                    self.lcd_font_time = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 20)
-                    self.lcd_font_small = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", 16)
-                    self.lcd_font_success = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", 36)
-                except:
-                    self.lcd_font_title = ImageFont.load_default()
-                    self.lcd_font_name = ImageFont.load_default()
-                    self.lcd_font_time = ImageFont.load_default()
-                    self.lcd_font_small = ImageFont.load_default()
+                self.lcd_font_title = config.get_font(28)
+                self.lcd_font_name = config.get_font(24)
+                self.lcd_font_time = config.get_font(20)
+                self.lcd_font_small = config.get_font(16, bold=False)
+                self.lcd_font_success = config.get_font(36)
+                self._build_lcd_templates()
                 
                 print("[INFO] LCD display initialized")
             except Exception as e:
                 print(f"[WARNING] LCD display initialization failed: {e}")
                 self.lcd_display = None
     
+    def _build_lcd_templates(self):
+        """Pre-render the static LCD screens and artwork once; updates copy them"""
+        # Background, header bar, title and divider (shared by every attendance screen)
+        self._lcd_header = Image.new('RGB', (240, 240), color=(0, 30, 60))
+        draw = ImageDraw.Draw(self._lcd_header)
+        draw.rectangle([0, 0, 240, 38], fill=(0, 50, 100))
+        draw.text((8, 8), "Attendance", font=self.lcd_font_time, fill=(255, 255, 255))
+        draw.line([0, 38, 240, 38], fill=(100, 150, 200), width=2)
+        
+        # Header plus the empty user card
+        self._lcd_card = self._lcd_header.copy()
+        ImageDraw.Draw(self._lcd_card).rectangle([3, 42, 237, 42 + 195],
+                                                 fill=(20, 60, 40), outline=(46, 204, 113), width=3)
+        
+        # SUCCESS popup without the name
+        self._lcd_success = Image.new('RGB', (240, 240), color=(0, 100, 0))
+        ImageDraw.Draw(self._lcd_success).text((30, 70), "SUCCESS!", font=self.lcd_font_success,
+                                               fill=(255, 255, 255))
+        
+        # Standby screen is entirely static
+        self._lcd_standby = Image.new('RGB', (240, 240), color=(0, 0, 0))
+        ImageDraw.Draw(self._lcd_standby).text((60, 110), "Standby Mode", font=self.lcd_font_title,
+                                               fill=(100, 100, 100))
+        
+        # Rendered text tiles (text, font, colour) -> RGBA image, pasted by _lcd_text
+        self._lcd_labels = {}
+    
+    def _lcd_text(self, img, xy, text, font, fill):
+        """
+        Draw text like ImageDraw.text, rasterizing each distinct string only once
+        
+        Labels, times and names repeat from one update to the next, so most calls are
+        a paste of an already rendered tile
+        """
+        key = (text, id(font), fill)
+        tile = self._lcd_labels.get(key)
+        if tile is None:
+            if len(self._lcd_labels) >= 128:
+                self._lcd_labels.clear()  # Old clock/total strings; rebuilt on demand
+            left, top, right, bottom = font.getbbox(text)
+            tile = Image.new('RGBA', (max(right, 1), max(bottom, 1)), (0, 0, 0, 0))
+            ImageDraw.Draw(tile).text((0, 0), text, font=font, fill=fill)
+            self._lcd_labels[key] = tile
+        img.paste(tile, xy, tile)
+    
     def update_lcd(self):
         """Update LCD display with attendance info"""
         if not self.lcd_display or not self.running or self.current_mode != 'attendance':
             return
         
+        with self._lcd_lock:
+            self._draw_lcd()
+    
+    def _draw_lcd(self):
+        """Render and send the attendance screen; the caller holds _lcd_lock"""
         try:
-            # Create image
-            img = Image.new('RGB', (240, 240), color=(0, 30, 60))
-            draw = ImageDraw.Draw(img)
-            
             # Check if showing success popup
             current_time = time.time()
             if self.lcd_success_message and current_time < self.lcd_success_until:
                 # Show SUCCESS popup
-                draw.rectangle([0, 0, 240, 240], fill=(0, 100, 0))
-                draw.text((30, 70), "SUCCESS!", font=self.lcd_font_success, fill=(255, 255, 255))
-                draw.text((20, 120), self.lcd_success_message, font=self.lcd_font_name, fill=(255, 255, 100))
-                self.lcd_display.display(img)
+                img = self._lcd_success.copy()
+                self._lcd_text(img, (20, 120), self.lcd_success_message, font=self.lcd_font_name, fill=(255, 255, 100))
+                self._lcd_previous = display_changes(self.lcd_display, img, self._lcd_previous)
                 return
             else:
                 self.lcd_success_message = None
             
-            # Header
-            draw.rectangle([0, 0, 240, 38], fill=(0, 50, 100))
-            draw.text((8, 8), "Attendance", font=self.lcd_font_time, fill=(255, 255, 255))
-            current_time_str = datetime.now().strftime("%H:%M")
-            draw.text((155, 10), current_time_str, font=self.lcd_font_time, fill=(255, 255, 100))
-            draw.line([0, 38, 240, 38], fill=(100, 150, 200), width=2)
-            
             # Get user status
             user_status = self.tracker.get_user_status()
             
+            # Start from the pre-rendered header (and card) and draw only the changing text
+            img = (self._lcd_card if user_status else self._lcd_header).copy()
+            current_time_str = datetime.now().strftime("%H:%M")
+            self._lcd_text(img, (155, 10), current_time_str, font=self.lcd_font_time, fill=(255, 255, 100))
+            
             if not user_status:
-                draw.text((40, 120), "No users", font=self.lcd_font_name, fill=(150, 150, 150))
+                self._lcd_text(img, (40, 120), "No users", font=self.lcd_font_name, fill=(150, 150, 150))
             else:
                 # Display only 1 user to fit all info.
                 # Prefer the last recognized person so the LCD matches the camera event.
@@ -142,12 +189,10 @@ class SystemState:
                     selected = sorted_users[0]
 
                 name, status_info = selected
-                # Card background (fit within 240px screen)
-                draw.rectangle([3, y_pos, 237, y_pos + 195],
-                             fill=(20, 60, 40), outline=(46, 204, 113), width=3)
+                # Card background is part of the template (fits within the 240px screen)
                 
                 # Name (very large)
-                draw.text((10, y_pos + 5), name[:8], font=self.lcd_font_name, fill=(255, 255, 255))
+                self._lcd_text(img, (10, y_pos + 5), name[:8], font=self.lcd_font_name, fill=(255, 255, 255))
                 
                 # Check IN/OUT status (large text)
                 status = status_info.get('status', 'OUT')
@@ -158,69 +203,50 @@ class SystemState:
                     in_time_str = status_info.get('check_in_time', 'N/A')
                     status_text = f"IN: {in_time_str}"
                     status_color = (0, 255, 0)
-                    draw.text((10, y_pos + 40), status_text, font=self.lcd_font_time, fill=status_color)
+                    self._lcd_text(img, (10, y_pos + 40), status_text, font=self.lcd_font_time, fill=status_color)
                     
-                    # Calculate time since check-in
-                    if in_time_str != 'N/A':
-                        try:
-                            in_time = datetime.strptime(in_time_str, "%H:%M:%S")
-                            now = datetime.now()
-                            in_time = in_time.replace(year=now.year, month=now.month, day=now.day)
-                            duration = now - in_time
-                            hours = duration.seconds // 3600
-                            minutes = (duration.seconds % 3600) // 60
-                            total_text = f"TOTAL: {hours}h {minutes}m"
-                            draw.text((10, y_pos + 70), total_text, font=self.lcd_font_time, fill=(255, 255, 150))
-                        except:
-                            pass
+                    # Time since check-in, from the epoch the tracker already computed
+                    in_epoch = status_info.get('check_in_epoch')
+                    if in_epoch is not None:
+                        hours, rem = divmod(max(int(current_time) - in_epoch, 0), 3600)
+                        total_text = f"TOTAL: {hours}h {rem // 60}m"
+                        self._lcd_text(img, (10, y_pos + 70), total_text, font=self.lcd_font_time, fill=(255, 255, 150))
                 else:
                     # Status is OUT - show both IN and OUT times if available
                     # IN time
-                    draw.text((10, y_pos + 40), f"IN: {in_time}", font=self.lcd_font_time, fill=(100, 200, 255))
+                    self._lcd_text(img, (10, y_pos + 40), f"IN: {in_time}", font=self.lcd_font_time, fill=(100, 200, 255))
                     # OUT time
                     if out_time != 'N/A':
-                        draw.text((10, y_pos + 67), f"OUT: {out_time}", font=self.lcd_font_time, fill=(255, 150, 150))
+                        self._lcd_text(img, (10, y_pos + 67), f"OUT: {out_time}", font=self.lcd_font_time, fill=(255, 150, 150))
                         
                         # Calculate total time
-                        if in_time != 'N/A':
-                            try:
-                                in_dt = datetime.strptime(in_time, "%H:%M:%S")
-                                out_dt = datetime.strptime(out_time, "%H:%M:%S")
-                                now = datetime.now()
-                                in_dt = in_dt.replace(year=now.year, month=now.month, day=now.day)
-                                out_dt = out_dt.replace(year=now.year, month=now.month, day=now.day)
-                                duration = out_dt - in_dt
-                                hours = duration.seconds // 3600
-                                minutes = (duration.seconds % 3600) // 60
-                                total_text = f"TOTAL: {hours}h {minutes}m"
-                                draw.text((10, y_pos + 94), total_text, font=self.lcd_font_time, fill=(255, 255, 150))
-                            except:
-                                pass
+                        in_epoch = status_info.get('check_in_epoch')
+                        out_epoch = status_info.get('check_out_epoch')
+                        if in_epoch is not None and out_epoch is not None:
+                            hours, rem = divmod(max(out_epoch - in_epoch, 0), 3600)
+                            total_text = f"TOTAL: {hours}h {rem // 60}m"
+                            self._lcd_text(img, (10, y_pos + 94), total_text, font=self.lcd_font_time, fill=(255, 255, 150))
                     
                     # LATE/ON TIME indicator below Total (if has first check-in)
                     first_checkin = status_info.get('first_check_in')
-                    if first_checkin:
-                        try:
-                            checkin_time = datetime.strptime(first_checkin, "%H:%M:%S")
-                            cutoff_time = datetime.strptime("08:00:00", "%H:%M:%S")
-                            if checkin_time.time() > cutoff_time.time():
-                                draw.text((10, y_pos + 121), "STATUS: LATE", font=self.lcd_font_time, fill=(255, 100, 100))
-                            else:
-                                draw.text((10, y_pos + 121), "STATUS: ON TIME", font=self.lcd_font_time, fill=(100, 255, 100))
-                        except:
-                            pass
+                    if status_info.get('first_check_in_epoch') is not None:
+                        # Zero-padded HH:MM:SS strings order like the times themselves
+                        if first_checkin > "08:00:00":
+                            self._lcd_text(img, (10, y_pos + 121), "STATUS: LATE", font=self.lcd_font_time, fill=(255, 100, 100))
+                        else:
+                            self._lcd_text(img, (10, y_pos + 121), "STATUS: ON TIME", font=self.lcd_font_time, fill=(100, 255, 100))
                     
                     # OT indicator
                     is_ot = status_info.get('is_overtime', False)
                     ot_text = "OT: Yes" if is_ot else "OT: No"
                     ot_color = (100, 255, 100)  # Green like STATUS
-                    draw.text((10, y_pos + 148), ot_text, font=self.lcd_font_time, fill=ot_color)
+                    self._lcd_text(img, (10, y_pos + 148), ot_text, font=self.lcd_font_time, fill=ot_color)
                     
 
                     y_pos += 205
             
-            # Update display
-            self.lcd_display.display(img)
+            # Update display (usually just the clock or the card text)
+            self._lcd_previous = display_changes(self.lcd_display, img, self._lcd_previous)
             
         except Exception as e:
             print(f"[ERROR] LCD update failed: {e}")
@@ -240,10 +266,9 @@ class SystemState:
             # Clear display when stopped
             if self.lcd_display:
                 try:
-                    img = Image.new('RGB', (240, 240), color=(0, 0, 0))
-                    draw = ImageDraw.Draw(img)
-                    draw.text((60, 110), "Standby Mode", font=self.lcd_font_title, fill=(100, 100, 100))
-                    self.lcd_display.display(img)
+                    with self._lcd_lock:
+                        display_image(self.lcd_display, self._lcd_standby)
+                        self._lcd_previous = None
                 except:
                     pass
             self.lcd_running = False
@@ -254,55 +279,217 @@ class SystemState:
         
     def add_log(self, message):
         timestamp = datetime.now().strftime("%H:%M:%S")
-        self.logs.append(f"[{timestamp}] {message}")
-        if len(self.logs) > 100:
-            self.logs.pop(0)
+        line = f"[{timestamp}] {message}"
+        # Number and append together, so sequence numbers are unique and in deque order
+        with self._log_lock:
+            self.logs.append((self.log_count, line))
+            self.log_count += 1
+
+class FrameBroadcaster:
+    """Latest JPEG frame, shared by every stream client; clients wake once per new frame"""
+    
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._part = None  # Latest frame as a complete multipart chunk
+        self._seq = 0
+        self.clients = 0
+    
+    def add_client(self, delta: int):
+        """Count a stream client joining (+1) or leaving (-1)"""
+        with self._cond:
+            self.clients += delta
+    
+    def publish(self, jpeg: bytes):
+        """Store a new frame and wake all waiting clients"""
+        # Framed once here, outside the lock; every client then writes the same bytes
+        part = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+        with self._cond:
+            self._part = part
+            self._seq += 1
+            self._cond.notify_all()
+    
+    def wait(self, last_seq: int, timeout: float = 1.0) -> tuple:
+        """
+        Block until a frame newer than last_seq is published
+        
+        Returns:
+            (seq, part) tuple, part being the multipart chunk for the frame;
+            seq == last_seq if the wait timed out
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != last_seq, timeout)
+            return self._seq, self._part
+
 
 state = SystemState()
-output_frame = None
-lock = threading.Lock()
+frames = FrameBroadcaster()
 
 
 def generate_frames():
     """Generate video frames for streaming"""
-    global output_frame
+    seq = 0
+    frames.add_client(1)
+    try:
+        while True:
+            new_seq, part = frames.wait(seq)
+            if new_seq == seq or part is None:
+                continue  # No new frame yet; never resend a duplicate
+            seq = new_seq
+            
+            yield part  # Shared bytes; yielded outside the broadcaster's lock
+    finally:
+        frames.add_client(-1)
+
+
+LABEL_FONT = cv2.FONT_HERSHEY_SIMPLEX
+_label_cache = {}  # (text, color) -> (tile, mask, baseline_y)
+
+
+def _label_tile(text, color):
+    """Render a face label once; later frames paste the cached pixels"""
+    key = (text, color)
+    if key not in _label_cache:
+        (w, h), baseline = cv2.getTextSize(text, LABEL_FONT, 0.7, 2)
+        tile = np.zeros((h + baseline + 4, w + 4, 3), dtype=np.uint8)
+        cv2.putText(tile, text, (2, h + 2), LABEL_FONT, 0.7, color, 2)
+        _label_cache[key] = (tile, tile.any(axis=2, keepdims=True), h + 2)
+    return _label_cache[key]
+
+
+def draw_faces(img, boxes, names):
+    """Draw face boxes (one polylines call per colour) and cached name labels"""
+    for known in (True, False):
+        rects = [np.array([[x, y], [x + w, y], [x + w, y + h], [x, y + h]], dtype=np.int32)
+                 for (x, y, w, h), name in zip(boxes, names) if (name != "Unknown") == known]
+        if rects:
+            cv2.polylines(img, rects, True, (0, 255, 0) if known else (0, 0, 255), 3)
     
+    img_h, img_w = img.shape[:2]
+    for (x, y, w, h), name in zip(boxes, names):
+        tile, mask, baseline_y = _label_tile(name, (0, 255, 0) if name != "Unknown" else (0, 0, 255))
+        # Same placement as putText at (x, y - 10), clipped to the frame
+        top, left = y - 10 - baseline_y, x - 2
+        y0, x0 = max(top, 0), max(left, 0)
+        y1, x1 = min(top + tile.shape[0], img_h), min(left + tile.shape[1], img_w)
+        if y0 < y1 and x0 < x1:
+            ty, tx = y0 - top, x0 - left
+            np.copyto(img[y0:y1, x0:x1], tile[ty:ty + y1 - y0, tx:tx + x1 - x0],
+                      where=mask[ty:ty + y1 - y0, tx:tx + x1 - x0])
+
+
+def _offer(q, item):
+    """Put item in a single-slot queue, replacing any item not yet taken"""
+    try:
+        q.get_nowait()
+    except queue.Empty:
+        pass
+    q.put_nowait(item)
+
+
+def capture_loop(raw_frames, stop):
+    """
+    Read camera frames into raw_frames; a slow consumer only ever sees the newest
+    
+    read() blocks until the camera delivers the next frame, so the loop is paced by the
+    sensor rather than by polling
+    """
+    while not stop.is_set():
+        ret, frame = state.camera.read()
+        if not ret or frame is None:
+            stop.wait(0.1)  # Back off after a failed read, but return at once on shutdown
+            continue
+        _offer(raw_frames, frame)
+
+
+def encode_loop(display_frames):
+    """JPEG-encode annotated frames for the stream clients until None arrives"""
     while True:
-        with lock:
-            if output_frame is None:
-                time.sleep(0.1)
-                continue
-            
-            # Encode frame as JPEG
-            ret, buffer = cv2.imencode('.jpg', output_frame)
-            if not ret:
-                continue
-            frame = buffer.tobytes()
-        
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
-        
-        time.sleep(0.03)
+        display_frame = display_frames.get()
+        if display_frame is None:
+            break
+        ret, buffer = cv2.imencode('.jpg', display_frame,
+                                   [cv2.IMWRITE_JPEG_QUALITY, config.STREAM_JPEG_QUALITY])
+        if ret:
+            frames.publish(buffer.tobytes())
+
+
+def save_enroll_images(name, images):
+    """
+    Write a user's enrollment images to their images directory
+    
+    Args:
+        name: User name
+        images: JPEG bytes captured during enrollment (written as-is, no re-encode)
+    """
+    user_dir = os.path.join(config.IMAGES_DIR, name)
+    os.makedirs(user_dir, exist_ok=True)
+    
+    for idx, jpeg in enumerate(images):
+        with open(os.path.join(user_dir, f"{name}_{idx+1}.jpg"), 'wb') as f:
+            f.write(jpeg)
+
+
+def _finalize_enroll(name, images):
+    """Save and train for an auto-captured enrollment, off the camera thread"""
+    try:
+        save_enroll_images(name, images)
+        state.recognizer.train()
+        state.add_log(f"✓ {name} enrolled successfully")
+        # Set success notification
+        state.success_message = f"✓ {name} enrolled successfully!"
+        state.enrollment_success = True
+        # Clear notification after 5 seconds
+        threading.Timer(5.0, lambda: setattr(state, 'enrollment_success', False)).start()
+    except Exception as e:
+        state.add_log(f"✗ Enrollment failed: {str(e)}")
 
 
 def camera_loop():
-    """Main camera processing loop"""
-    global output_frame
+    """
+    Main camera processing loop
+    
+    Capture, detection/recognition and JPEG encoding run on separate threads joined by
+    single-slot queues, so each stage only waits for the newest output of the one before
+    """
+    # While boxes/labels are on screen, stream our annotated frames instead of the
+    # hardware JPEGs (which carry no overlay)
+    overlay_until = 0.0
+    
+    def publish_hardware_jpeg(jpeg):
+        if time.monotonic() >= overlay_until:
+            frames.publish(jpeg)
+    
+    raw_frames = queue.Queue(maxsize=1)
+    display_frames = queue.Queue(maxsize=1)
+    stop = threading.Event()
+    threads = []
     
     try:
         state.camera = Camera()
         state.add_log("Camera initialized")
         
+        # Pi camera: the ISP encodes the stream, so plain frames need no CPU JPEG work
+        hardware_jpeg = state.camera.start_jpeg_stream(publish_hardware_jpeg)
+        
+        threads = [threading.Thread(target=capture_loop, args=(raw_frames, stop), daemon=True),
+                   threading.Thread(target=encode_loop, args=(display_frames,), daemon=True)]
+        for thread in threads:
+            thread.start()
+        
         frame_count = 0
+        # Boxes and names from the last recognition pass, redrawn on the frames in between
+        last_faces = None
         
         while state.running or state.enrolling:
-            ret, frame = state.camera.read()
-            if not ret or frame is None:
-                time.sleep(0.1)
+            try:
+                frame = raw_frames.get(timeout=0.5)
+            except queue.Empty:
                 continue
             
             frame_count += 1
-            display_frame = frame.copy()
+            # Copied only when something is drawn; plain frames are encoded as read
+            display_frame = frame
+            overlay = False
             
             # Enrollment mode
             if state.enrolling:
@@ -311,6 +498,8 @@ def camera_loop():
                     
                     if len(face_locations) > 0 and len(state.enroll_images) < 3:
                         # Draw rectangle
+                        if not overlay:
+                            display_frame, overlay = frame.copy(), True
                         for (x, y, w, h) in face_locations:
                             cv2.rectangle(display_frame, (x, y), (x+w, y+h), (0, 255, 0), 3)
                             cv2.putText(display_frame, f"Capturing {len(state.enroll_images)+1}/3", 
@@ -318,51 +507,45 @@ def camera_loop():
                         
                         # Capture every few frames (faster)
                         if frame_count % 5 == 0:
-                            state.enroll_images.append(frame.copy())
+                            # Keep the clean frame as JPEG (~50 KB instead of a raw BGR array);
+                            # the streamed JPEG carries the capture overlay, so it cannot be reused
+                            ret, buffer = cv2.imencode('.jpg', frame)
+                            if ret:
+                                state.enroll_images.append(buffer.tobytes())
                             state.enroll_progress = len(state.enroll_images)
                             
                             if len(state.enroll_images) >= 3:
                                 state.add_log(f"✓ Captured 3 images for {state.enroll_name}")
-                                # Auto-save and train immediately
-                                try:
-                                    user_dir = os.path.join(config.IMAGES_DIR, state.enroll_name)
-                                    os.makedirs(user_dir, exist_ok=True)
-                                    for idx, img in enumerate(state.enroll_images):
-                                        filename = f"{state.enroll_name}_{idx+1}.jpg"
-                                        filepath = os.path.join(user_dir, filename)
-                                        cv2.imwrite(filepath, img)
-                                    state.recognizer.train()
-                                    state.add_log(f"✓ {state.enroll_name} enrolled successfully")
-                                    # Set success notification
-                                    state.enrollment_success = True
-                                    state.success_message = f"✓ {state.enroll_name} enrolled successfully!"
-                                    state.enrolling = False
-                                    enrolled_name = state.enroll_name
-                                    state.enroll_name = ""
-                                    state.enroll_images = []
-                                    state.enroll_progress = 0
-                                    # Clear notification after 5 seconds
-                                    threading.Timer(5.0, lambda: setattr(state, 'enrollment_success', False)).start()
-                                except Exception as e:
-                                    state.add_log(f"✗ Enrollment failed: {str(e)}")
+                                # Auto-save and train in the background so frames keep flowing
+                                threading.Thread(target=_finalize_enroll,
+                                                 args=(state.enroll_name, state.enroll_images),
+                                                 daemon=True).start()
+                                state.enrolling = False
+                                state.enroll_name = ""
+                                state.enroll_images = []
+                                state.enroll_progress = 0
                     
                     elif len(face_locations) == 0:
+                        if not overlay:
+                            display_frame, overlay = frame.copy(), True
                         cv2.putText(display_frame, "No face detected - look at camera", 
                                   (50, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 165, 255), 2)
             
             # Recognition mode
             elif state.running and frame_count % config.PROCESS_EVERY_N_FRAMES == 0:
-                face_locations = state.detector.detect_faces(frame)
+                # Convert once; detection and recognition share the grayscale frame
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                face_locations = state.detector.detect_faces_gray(gray)
                 
                 if len(face_locations) > 0:
-                    face_names = state.recognizer.recognize_faces(frame, face_locations)
+                    face_names = state.recognizer.recognize_faces_gray(gray, face_locations)
                     
                     for (x, y, w, h), name in zip(face_locations, face_names):
                         if name != "Unknown":
                             current_time = time.time()
                             
-                            if name not in state.last_recognition or \
-                               current_time - state.last_recognition[name] > 3.0:
+                            # Single get/set on the dict: atomic under the GIL, no lock needed
+                            if current_time - state.last_recognition.get(name, 0.0) > 3.0:
                                 
                                 state.last_recognition[name] = current_time
                                 
@@ -400,22 +583,35 @@ def camera_loop():
                                     state.update_lcd()
                                 else:
                                     state.add_log(f"✓ Access GRANTED: {name}")
-                        
-                        # Draw rectangle
-                        color = (0, 255, 0) if name != "Unknown" else (0, 0, 255)
-                        cv2.rectangle(display_frame, (x, y), (x+w, y+h), color, 3)
-                        cv2.putText(display_frame, name, (x, y - 10),
-                                  cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2)
+                    
+                    # Draw rectangles and names for all faces at once
+                    display_frame, overlay = frame.copy(), True
+                    draw_faces(display_frame, face_locations, face_names)
+                    last_faces = (face_locations, face_names)
+                else:
+                    last_faces = None
             
-            # Update output frame
-            with lock:
-                output_frame = display_frame.copy()
+            # Between recognition passes, keep the last overlay on screen at full frame rate
+            elif state.running and last_faces is not None:
+                display_frame, overlay = frame.copy(), True
+                draw_faces(display_frame, *last_faces)
             
-            time.sleep(0.01)
+            if hardware_jpeg and overlay:
+                # Hold the annotated frame until the next detection pass replaces it
+                overlay_until = time.monotonic() + 0.5
+            
+            # Encode once per frame for all stream clients (skipped when nobody is watching,
+            # and for plain frames whose hardware JPEG is already streamed)
+            if frames.clients > 0 and (overlay or not hardware_jpeg):
+                _offer(display_frames, display_frame)
             
     except Exception as e:
         state.add_log(f"ERROR: {str(e)}")
     finally:
+        stop.set()
+        _offer(display_frames, None)
+        for thread in threads:
+            thread.join(timeout=2.0)
         if state.camera:
             state.camera.release()
 
@@ -429,13 +625,20 @@ def index():
 @app.route('/video_feed')
 def video_feed():
     """Video streaming route"""
+    # Frames are already complete multipart chunks; hand them to the server untouched
     return Response(generate_frames(),
-                    mimetype='multipart/x-mixed-replace; boundary=frame')
+                    mimetype='multipart/x-mixed-replace; boundary=frame',
+                    direct_passthrough=True)
 
 
 @app.route('/api/status')
 def api_status():
-    """Get system status"""
+    """
+    Get system status
+    
+    ?since=N returns only the logs added after the first N (see log_count). The
+    ETag is a hash of the body, so an unchanged poll is answered with 304
+    """
     # Get enrolled users from both recognizer and images directory
     enrolled_names = []
     if hasattr(state.recognizer, 'known_names') and state.recognizer.known_names:
@@ -451,18 +654,31 @@ def api_status():
     enrolled = len(enrolled_names)
     user_status = state.tracker.get_user_status()
     
-    return jsonify({
+    # One snapshot of the deque; sequence numbers keep log_count consistent with it
+    entries = list(state.logs)
+    log_count = entries[-1][0] + 1 if entries else 0
+    since = request.args.get('since', default=0, type=int)
+    logs = [line for seq, line in entries[-20:] if seq >= since]
+    
+    body = json.dumps({
         'running': state.running,
         'enrolling': state.enrolling,
         'mode': state.current_mode,
         'enrolled_users': enrolled,
-        'logs': state.logs[-20:],
+        'logs': logs,
+        'log_count': log_count,
         'enroll_progress': state.enroll_progress if state.enrolling else 0,
         'enrollment_success': state.enrollment_success,
         'success_message': state.success_message,
         'user_status': user_status,
         'registered_users': enrolled_names
-    })
+    }, sort_keys=True)
+    
+    etag = f'W/"{zlib.crc32(body.encode()):08x}"'
+    headers = {'ETag': etag, 'Cache-Control': 'no-cache'}  # Browser revalidates every poll
+    if request.headers.get('If-None-Match') == etag:
+        return Response(status=304, headers=headers)
+    return Response(body, mimetype='application/json', headers=headers)
 
 
 @app.route('/api/start/<mode>')
@@ -531,15 +747,8 @@ def api_enroll_save():
         return jsonify({'success': False, 'message': f'Need at least 3 images, got {len(state.enroll_images)}'})
     
     try:
-        # Create user directory
-        user_dir = os.path.join(config.IMAGES_DIR, state.enroll_name)
-        os.makedirs(user_dir, exist_ok=True)
-        
         # Save images
-        for idx, img in enumerate(state.enroll_images):
-            filename = f"{state.enroll_name}_{idx+1}.jpg"
-            filepath = os.path.join(user_dir, filename)
-            cv2.imwrite(filepath, img)
+        save_enroll_images(state.enroll_name, state.enroll_images)
         
         # Retrain
         state.recognizer.train()
@@ -581,8 +790,10 @@ def api_delete_user(name):
             shutil.rmtree(user_dir)
             state.add_log(f"Deleted user directory: {name}")
         
-        # Retrain recognizer
-        state.recognizer.train()
+        # Drop just this user's samples from the model (its cache is re-saved against
+        # the remaining images); retrain only if the model never had them
+        if not state.recognizer.remove_face(name):
+            state.recognizer.train()
         state.add_log(f"✓ Removed user: {name}")
         
         return jsonify({'success': True, 'message': f'User {name} deleted successfully'})
@@ -605,4 +816,12 @@ if __name__ == '__main__':
     print("  → http://0.0.0.0:5000")
     print("\nPress Ctrl+C to stop\n")
     
-    app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+    try:
+        if WAITRESS_AVAILABLE:
+            serve(app, host='0.0.0.0', port=5000, threads=config.WEB_SERVER_THREADS)
+        else:
+            print("[INFO] waitress not installed (pip install waitress); using Flask's server")
+            app.run(host='0.0.0.0', port=5000, debug=False, threaded=True)
+    finally:
+        # Write queued spreadsheet rows and any pending monthly report
+        state.tracker.close()